@@ -1,37 +1,103 @@
 import tkinter as tk
-import threading
+import os
 import queue
+import logging
 from concurrent.futures import ThreadPoolExecutor
 from components import UISetup, EventHandlers, MessageProcessor
 from core import ModelManager, AudioManager, RecordingManager
+from core.model_registry import ModelRegistry, ModelPool
+from core.ring_buffer import AudioRingBuffer
+from core.multi_device import MultiDeviceRecorder
+from core.async_pipeline import AsyncLoopThread
+from core.recognizer_pool import RecognizerPool
+from core.watchdog import RecognitionWatchdog
+from core.startup_profile import profiler
+from core.logging_pipeline import LogPipeline, CallbackHandler, RateLimitFilter, TextFormatter, LOG_DIR, LEVELS
 class SpeechToTextApp:
     def __init__(self, root):
         self.root = root
         self.root.title("Распознавание речи в реальном времени")
         self.root.geometry("850x750")
         self.root.resizable(True, True)
-        self.executor = ThreadPoolExecutor(max_workers=4)
-        self.audio_queue = queue.Queue(maxsize=10)
+        self.input_devices = []
+        self.multi_recorder = None
+        self._executor = None
         self.ui_queue = queue.Queue()
-        self.model_manager = ModelManager()
+        self.log_level = logging.INFO
+        self.log_to_console = False
+        self.log_file = os.path.join(LOG_DIR, "app.log")
+        self.log_pipeline = LogPipeline(self.log_level, self.log_file, console=self.log_to_console).start()
+        self.ui_log_handler = self.log_pipeline.add_handler(self._create_ui_log_handler())
+        self.preload_last_model = True
+        self.model_pool = ModelPool(max_models=2, memory_budget=8 * 1024 ** 3)
+        self.model_manager = ModelManager(registry=ModelRegistry(), pool=self.model_pool)
         self.audio_manager = AudioManager()
+        self.audio_manager.callback_mode = True
+        self.audio_manager.native_format = True
+        self.recognizer_pool = RecognizerPool(max_idle=2)
+        self.audio_manager.recognizer_pool = self.recognizer_pool
+        self.audio_manager.keep_stream_open = True
+        self.audio_queue = AudioRingBuffer(slots=10, slot_size=self.audio_manager.chunk_bytes,
+                                           policy=AudioRingBuffer.POLICY_DROP_OLDEST)
         self.recording_manager = RecordingManager(self.audio_manager, self.model_manager)
+        self.recording_manager.watchdog = RecognitionWatchdog()
+        self.grammar = None
+        self.journal_enabled = True
+        self.journal_partials = False
+        self.journal = None
+        self.audio_manager.word_timings = self.journal_enabled
+        self.metrics_export_path = None
         self.ui_setup = UISetup()
         self.event_handlers = EventHandlers(self)
         self.message_processor = MessageProcessor(self)
         self.is_recording = False
-        self.recording_thread = None
-        self.processing_thread = None
-        self.stop_flags = {
-            'recording': threading.Event(),
-            'processing': threading.Event()
-        }
+        self.is_stopping = False
+        self._async_loop = None
+        self.pipeline = None
+        self.recording_task = None
         self.ui_elements = {}
         self.setup_ui()
         self.setup_bindings()
         self.start_message_processing()
+        profiler.mark('ui_built')
+        self.root.after_idle(self._finish_startup)
+    def _finish_startup(self):
+        self.root.update_idletasks()
+        first_paint = profiler.mark('first_paint')
+        if self.preload_last_model:
+            self.event_handlers.start_model_preload()
+        ready = profiler.mark('ready')
+        self.queue_ui_message("log", "", f"Окно отрисовано за {first_paint:.0f} мс, готово к работе за {ready:.0f} мс")
+    @property
+    def executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._executor_workers())
+        return self._executor
+    @property
+    def async_loop(self):
+        if self._async_loop is None:
+            self._async_loop = AsyncLoopThread().start()
+        return self._async_loop
+    def _create_ui_log_handler(self):
+        handler = CallbackHandler(lambda text: self.queue_ui_message("log", "", text), self.log_level)
+        handler.addFilter(RateLimitFilter(rate=5.0, burst=20, rates={'stt.results': (10.0, 30)},
+                                          attribute='ui_suppressed'))
+        handler.setFormatter(TextFormatter('ui_suppressed', timestamps=False))
+        return handler
+    def set_log_level(self, name):
+        self.log_level = LEVELS[name]
+        self.log_pipeline.set_level(self.log_level)
+        self.ui_log_handler.setLevel(self.log_level)
+    def _executor_workers(self):
+        return MultiDeviceRecorder.worker_count(len(self.input_devices)) + 2
+    def set_input_devices(self, devices):
+        self.input_devices = list(devices)
+        old_executor, self._executor = self._executor, None
+        if old_executor is not None:
+            old_executor.shutdown(wait=False)
     def setup_ui(self):
         self.ui_elements = self.ui_setup.create_interface(self.root, self)
+        self.ui_elements['stats_panel'].export_path = self.metrics_export_path
     def setup_bindings(self):
         self.event_handlers.setup_bindings()
     def start_message_processing(self):
@@ -46,14 +112,36 @@ class SpeechToTextApp:
         return self.event_handlers.handle_clear_text()
     def clear_logs(self):
         return self.event_handlers.handle_clear_logs()
+    def open_session(self):
+        return self.event_handlers.handle_open_session()
+    def select_devices(self):
+        return self.event_handlers.handle_device_selection()
+    def load_grammar(self):
+        return self.event_handlers.handle_load_grammar()
+    def use_open_vocabulary(self):
+        return self.event_handlers.handle_open_vocabulary()
+    def export_metrics(self):
+        return self.event_handlers.handle_export_metrics()
+    def toggle_decode_profiler(self, enabled):
+        return self.event_handlers.handle_toggle_profiler(enabled)
     def update_text(self, text):
         return self.message_processor.update_text_display(text)
     def queue_ui_message(self, msg_type, title="", message="", **kwargs):
         return self.message_processor.queue_message(msg_type, title, message, **kwargs)
     def cleanup(self):
         self.stop_recording()
-        self.executor.shutdown(wait=False)
-        self.audio_manager.cleanup()
+        if self.recording_task is not None:
+            try:
+                self.recording_task.result(timeout=2)
+            except Exception as e:
+                print(f"Ошибка завершения записи: {e}")
+        if self._async_loop is not None:
+            self._async_loop.stop()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self.audio_manager.cleanup(full=True)
+        self.recognizer_pool.clear()
+        self.log_pipeline.stop()
     def __del__(self):
         self.cleanup()
     def copy_selected_text_universal(self):
@@ -83,13 +171,17 @@ class SpeechToTextApp:
                 self.root.clipboard_clear()
                 self.root.clipboard_append(selected_text)
             else:
-                widget.config(state=tk.NORMAL)
-                all_text = widget.get(1.0, tk.END)
-                widget.config(state=tk.DISABLED)
+                all_text = self._get_full_text(widget)
                 self.root.clipboard_clear()
                 self.root.clipboard_append(all_text.strip())
         except tk.TclError:
             pass
+    def _get_full_text(self, widget):
+        for view_name in ('text_view', 'log_view'):
+            view = self.ui_elements.get(view_name)
+            if view is not None and view.widget is widget:
+                return view.store.get_text()
+        return widget.get(1.0, tk.END)
     def select_all_from_widget(self, widget):
         try:
             widget.config(state=tk.NORMAL)
@@ -0,0 +1,44 @@
+import argparse
+import sys
+from core.batch_transcriber import BatchTranscriber
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Пакетное распознавание WAV/PCM файлов")
+    parser.add_argument('inputs', nargs='+', help="Файлы или папки с аудио (16-бит моно PCM)")
+    parser.add_argument('-m', '--model', required=True, help="Путь к папке с моделью Vosk")
+    parser.add_argument('-o', '--output', help="Файл JSONL для результатов (по умолчанию stdout)")
+    parser.add_argument('-j', '--workers', type=int, default=None, help="Количество процессов")
+    parser.add_argument('--rate', type=int, default=16000, help="Частота дискретизации")
+    parser.add_argument('--chunk', type=int, default=8192, help="Размер чанка в фреймах")
+    parser.add_argument('--segment', type=float, metavar='SECONDS',
+                        help="Делить длинные файлы по паузам на части ~SECONDS сек и распознавать их параллельно")
+    parser.add_argument('--compare', action='store_true',
+                        help="С --segment: также распознать файл последовательно и вывести ускорение")
+    return parser.parse_args(argv)
+def main(argv=None):
+    args = parse_args(argv)
+    transcriber = BatchTranscriber(args.model, workers=args.workers,
+                                   sample_rate=args.rate, chunk=args.chunk,
+                                   segment_seconds=args.segment, compare=args.compare)
+    is_valid, message = transcriber.validate_model()
+    if not is_valid:
+        print(f"Некорректная модель: {message}", file=sys.stderr)
+        return 1
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        summary = transcriber.run_to_jsonl(args.inputs, output)
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        return 1
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    print(f"Файлов: {summary['files']}, ошибок: {summary['errors']}, "
+          f"аудио: {summary['audio_seconds']:.1f} сек, время: {summary['wall_seconds']:.1f} сек, "
+          f"RTF: {summary.get('rtf', 0):.3f}", file=sys.stderr)
+    if summary.get('speedups'):
+        speedups = summary['speedups']
+        print(f"Ускорение относительно последовательного распознавания: "
+              f"{sum(speedups) / len(speedups):.2f}x", file=sys.stderr)
+    return 0 if summary['errors'] == 0 else 2
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+import argparse
+import json
+import sys
+from contextlib import redirect_stdout
+from core.model_manager import ModelManager
+from core.pipeline_benchmark import PipelineBenchmark
+from core.resampler import AudioResampler, benchmark_resampler
+from core.grammar import PhraseGrammar
+from core.startup_profile import profile_entry_import
+ENTRY_MODULES = ('batch', 'server', 'benchmark', 'replay', 'app')
+def int_list(value):
+    return [int(item) for item in value.split(',') if item]
+def format_list(value):
+    formats = []
+    for item in value.split(','):
+        rate, _, channels = item.partition('x')
+        formats.append((int(rate), int(channels or 1)))
+    return formats
+def quality_list(value):
+    qualities = [item for item in value.split(',') if item]
+    for quality in qualities:
+        if quality not in AudioResampler.QUALITIES:
+            raise argparse.ArgumentTypeError(f"неизвестное качество: {quality}")
+    return qualities
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Замеры задержки и пропускной способности распознавания")
+    parser.add_argument('-m', '--model', help="Путь к папке с моделью Vosk")
+    parser.add_argument('-a', '--audio', default='synthetic:30',
+                        help="Источник аудио: путь к WAV/PCM, '-' или synthetic:<сек>")
+    parser.add_argument('--chunks', type=int_list, default=[8192], help="Размеры чанков через запятую")
+    parser.add_argument('--queue-sizes', type=int_list, default=[10],
+                        help="Размеры audio_queue через запятую")
+    parser.add_argument('--policy', default='drop_oldest',
+                        choices=['queue', 'block', 'drop_oldest', 'drop_newest'],
+                        help="Буфер аудио: queue.Queue или кольцевой буфер с политикой переполнения")
+    parser.add_argument('--paced', action='store_true', help="Выдавать аудио в реальном времени")
+    parser.add_argument('--adaptive', action='store_true', help="Адаптивный размер чанка")
+    parser.add_argument('--vad', action='store_true', help="Пропускать тишину детектором речи")
+    parser.add_argument('--words', action='store_true', help="Включить тайминги слов (SetWords)")
+    parser.add_argument('--partial-interval', type=float, default=0.2,
+                        help="Минимальный интервал между частичными результатами, сек")
+    parser.add_argument('--no-partials', action='store_true', help="Не запрашивать частичные результаты")
+    parser.add_argument('--ui-interval', type=float, default=0.1, help="Период опроса очереди UI")
+    parser.add_argument('--grammar', help="Файл со списком фраз: сравнить со свободной речью на том же аудио")
+    parser.add_argument('--reference', help="Файл с эталонным текстом для расчёта WER")
+    parser.add_argument('--resample', type=format_list,
+                        help="Замерить только передискретизацию для форматов <частота>x<каналы> через запятую")
+    parser.add_argument('--resample-quality', type=quality_list, default=list(AudioResampler.QUALITIES),
+                        help="Качество передискретизации через запятую: fast, linear, high")
+    parser.add_argument('--startup', action='store_true',
+                        help="Замерить импорт точек входа в отдельных процессах и проверить, "
+                             "что CLI не загружают vosk, pyaudio и tkinter")
+    parser.add_argument('-o', '--output', help="Файл JSONL для результатов (по умолчанию stdout)")
+    args = parser.parse_args(argv)
+    if not args.model and not args.resample and not args.startup:
+        parser.error("требуется -m/--model, --resample или --startup")
+    return args
+def resample_reports(args):
+    for rate, channels in args.resample:
+        for quality in args.resample_quality:
+            yield benchmark_resampler(rate, channels, quality=quality)
+def main(argv=None):
+    args = parse_args(argv)
+    if args.startup:
+        reports = [profile_entry_import(module) for module in ENTRY_MODULES]
+        write_reports(reports, args.output)
+        return 1 if any(report.get('forbidden') or report.get('error') for report in reports) else 0
+    if args.resample:
+        if not AudioResampler.is_available():
+            print("Для передискретизации требуется numpy", file=sys.stderr)
+            return 1
+        write_reports(resample_reports(args), args.output)
+        return 0
+    with redirect_stdout(sys.stderr):
+        model_manager = ModelManager()
+        model_manager.model_path = args.model
+        loaded = model_manager.load_model()
+    if not loaded:
+        print("Модель не создана", file=sys.stderr)
+        return 1
+    reference = None
+    if args.reference:
+        with open(args.reference, 'r', encoding='utf-8') as f:
+            reference = f.read()
+    grammars = [None]
+    if args.grammar:
+        grammars.append(PhraseGrammar.from_file(args.grammar))
+    benchmarks = [PipelineBenchmark(model_manager, args.audio, paced=args.paced,
+                                    ui_interval=args.ui_interval, adaptive=args.adaptive,
+                                    vad=args.vad, policy=args.policy,
+                                    words=args.words, partial_interval=args.partial_interval,
+                                    partials=not args.no_partials, grammar=grammar, reference=reference)
+                  for grammar in grammars]
+    write_reports((report for benchmark in benchmarks
+                   for report in benchmark.sweep(args.chunks, args.queue_sizes)), args.output)
+    return 0
+def write_reports(reports, path):
+    output = open(path, 'w', encoding='utf-8') if path else sys.stdout
+    try:
+        for report in reports:
+            output.write(json.dumps(report, ensure_ascii=False) + "\n")
+            output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+if __name__ == "__main__":
+    sys.exit(main())
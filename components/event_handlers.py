@@ -1,9 +1,21 @@
 import tkinter as tk
 from tkinter import filedialog
 from tkinter import ttk as ttk
+import datetime
+import time
+from utils.helpers import Utils
+from core.transcript_journal import TranscriptJournal, JournalReader, JOURNAL_DIR
+from core.audio_manager import AudioManager
+from core.multi_device import MultiDeviceRecorder
+from core.async_pipeline import AsyncRecognitionPipeline
+from core.grammar import PhraseGrammar
+from core.startup_profile import profiler
+from core.metrics import registry
+from core.logging_pipeline import get_logger
 class EventHandlers:
     def __init__(self, app):
         self.app = app
+        self.log = get_logger('ui')
     def setup_bindings(self):
         root = self.app.root
         root.bind('<F7>', lambda e: self.handle_start_recording())
@@ -28,14 +40,14 @@ class EventHandlers:
             return
         path = filedialog.askdirectory(title="Выберите папку с моделью Vosk")
         if path:
-            self.app.queue_ui_message("log", "", f"Выбран путь к модели: {path}")
+            self.log.info("Выбран путь к модели: %s", path)
             is_valid, message = model_manager.validate_model_path(path)
             if is_valid:
                 model_manager.model_path = path
                 self._show_loading_and_load_model()
             else:
                 error_msg = f"Некорректная модель: {message}"
-                self.app.queue_ui_message("log", "", f"❌ {error_msg}")
+                self.log.error("❌ %s", error_msg)
                 self.app.queue_ui_message("error", "Ошибка", error_msg)
                 self.app.queue_ui_message("status", "", "❌ Некорректная модель", fg="red")
     def _show_loading_and_load_model(self):
@@ -59,7 +71,7 @@ class EventHandlers:
     
     def _load_model_worker(self, loading_window):
         try:
-            self.app.queue_ui_message("log", "", "Начало загрузки модели...")
+            self.log.info("Начало загрузки модели...")
             success = self.app.model_manager.load_model()
             if not success:
                 raise Exception("Модель не создана")
@@ -71,73 +83,249 @@ class EventHandlers:
     def _on_model_loaded(self, loading_window):
         try:
             loading_window.destroy()
-            model_name = self.app.model_manager.get_model_name()
-            
-            self.app.queue_ui_message("status", "", "✅ Модель загружена", fg="green")
-            self.app.queue_ui_message("model_info", "", f"Модель: {model_name}")
-            self.app.queue_ui_message("log", "", "✅ Модель успешно загружена")
+            self._report_model_loaded()
             self.app.queue_ui_message("info", "Успех", 
                                     f"Модель загружена!\nПуть: {self.app.model_manager.model_path}")
         except Exception as e:
-            self.app.queue_ui_message("log", "", f"❌ Ошибка при завершении загрузки: {e}")
+            self.log.error("❌ Ошибка при завершении загрузки: %s", e)
+    def _report_model_loaded(self):
+        profiler.mark('model_ready')
+        model_manager = self.app.model_manager
+        if model_manager.last_load_cached:
+            source = "из пула загруженных моделей"
+        else:
+            source = f"за {Utils.format_time_delta(model_manager.last_load_seconds or 0)}"
+        self.app.queue_ui_message("status", "", "✅ Модель загружена", fg="green")
+        self.app.queue_ui_message("model_info", "", f"Модель: {model_manager.get_model_name()}")
+        self.log.info("✅ Модель успешно загружена %s", source)
+        self.app.executor.submit(self._warm_recognizers)
+    def _warm_recognizers(self):
+        started = time.perf_counter()
+        if self.app.audio_manager.warm_recognizers(self.app.model_manager.model):
+            self.log.info("Распознаватель подготовлен заранее за %s",
+                          Utils.format_time_delta(time.perf_counter() - started))
+    def start_model_preload(self):
+        self.app.executor.submit(self._preload_model_worker)
+    def _preload_model_worker(self):
+        model_manager = self.app.model_manager
+        path = model_manager.get_preload_path()
+        if not path or not model_manager.is_vosk_available():
+            return
+        model_manager.model_path = path
+        self.app.queue_ui_message("status", "", "⏳ Фоновая загрузка последней модели...", fg="blue")
+        self.log.info("Фоновая загрузка последней модели: %s", path)
+        if model_manager.load_model():
+            self.app.root.after(0, self._report_model_loaded)
+        else:
+            self.log.error("❌ Не удалось загрузить последнюю модель")
+            self.app.queue_ui_message("status", "", "Готов к работе", fg="black")
     def _on_model_load_error(self, loading_window, error_msg):
         try:
             loading_window.destroy()
-            self.app.queue_ui_message("log", "", f"❌ Ошибка загрузки модели: {error_msg}")
+            self.log.error("❌ Ошибка загрузки модели: %s", error_msg)
             self.app.queue_ui_message("error", "Ошибка", f"Ошибка загрузки модели:\n{error_msg}")
             self.app.queue_ui_message("status", "", "❌ Ошибка загрузки модели", fg="red")
             self.app.model_manager.model = None
         except Exception as e:
-            self.app.queue_ui_message("log", "", f"❌ Ошибка обработки ошибки: {e}")
+            self.log.error("❌ Ошибка обработки ошибки: %s", e)
     def handle_start_recording(self):
         if not self.app.model_manager.is_model_loaded():
             self.app.queue_ui_message("error", "Ошибка", 
                                     "Модель не загружена!\nСначала выберите модель")
             return
+        if self.app.is_stopping:
+            self.app.queue_ui_message("status", "", "⏳ Дождитесь окончания распознавания предыдущей записи",
+                                      fg="blue")
+            return
         if not self.app.is_recording:
             self.app.is_recording = True
-            self.app.recording_manager.reset_state()
-            self.app.stop_flags['recording'].clear()
-            self.app.stop_flags['processing'].clear()
+            if self.app.input_devices:
+                self.app.multi_recorder = MultiDeviceRecorder(
+                    self.app.input_devices, self.app.model_manager, self.app.queue_ui_message,
+                    audio_settings=self._device_audio_settings(),
+                    watchdog=self.app.recording_manager.watchdog is not None)
+            else:
+                self.app.multi_recorder = None
+                self.app.pipeline = AsyncRecognitionPipeline(
+                    self.app.recording_manager, self.app.audio_queue, self.app.executor,
+                    partials=self.app.journal_partials, message_queue_func=self.app.queue_ui_message)
+            self._open_journal()
             self.app.queue_ui_message("status", "", 
                                     "🎤 Запись активна... Говорите! (F9 для остановки)", fg="red")
-            self.app.queue_ui_message("log", "", "=== Начало записи (F9 для остановки) ===")
+            self.log.info("=== Начало записи (F9 для остановки) ===")
             self.app.queue_ui_message("enable_buttons", "", "", 
                                     start=tk.DISABLED, stop=tk.NORMAL)
-            self.app.recording_thread = self.app.executor.submit(self._record_audio_worker)
-            self.app.processing_thread = self.app.executor.submit(self._process_audio_worker)
+            if self.app.multi_recorder:
+                self.log.info("Устройств записи: %d", len(self.app.multi_recorder.sessions))
+                self.app.multi_recorder.start(self.app.executor, on_finished=self._finish_multi_device)
+                return
+            self.app.recording_task = self.app.async_loop.submit(self._consume_results(self.app.pipeline))
+            self.app.recording_task.add_done_callback(lambda _: self.app.root.after(0, self._finish_recording))
     def handle_stop_recording(self):
         if self.app.is_recording:
             self.app.is_recording = False
-            self.app.stop_flags['recording'].set()
-            self.app.stop_flags['processing'].set()
-            self.app.queue_ui_message("status", "", "⏹ Запись остановлена", fg="black")
-            self.app.queue_ui_message("log", "", "=== Запись остановлена ===")
-            self.app.queue_ui_message("enable_buttons", "", "", 
-                                    start=tk.NORMAL, stop=tk.DISABLED)
+            self.app.is_stopping = True
+            if self.app.multi_recorder:
+                self.app.multi_recorder.stop()
+            else:
+                self.app.pipeline.stop()
+            self.app.queue_ui_message("status", "", "⏳ Остановка: распознаётся остаток записи...", fg="blue")
+            self.app.queue_ui_message("enable_buttons", "", "",
+                                      start=tk.DISABLED, stop=tk.DISABLED)
+    def _finish_recording(self):
+        self.app.is_recording = False
+        self.app.is_stopping = False
+        self.app.queue_ui_message("status", "", "⏹ Запись остановлена", fg="black")
+        self.log.info("=== Запись остановлена ===")
+        ui_metrics = self.app.message_processor.get_metrics()
+        render = ui_metrics['render_seconds']
+        if render['count']:
+            self.log.info("UI: тактов %d, сообщений %d, отрисовка p95 %.1f мс, макс. очередь %d",
+                          ui_metrics['ticks'], ui_metrics['messages'], render['p95'] * 1000,
+                          ui_metrics['max_backlog'])
+        self.app.queue_ui_message("enable_buttons", "", "", 
+                                start=tk.NORMAL, stop=tk.DISABLED)
     def handle_clear_text(self):
-            text_area = self.app.ui_elements['text_area']
-            text_area.config(state=tk.NORMAL)
-            text_area.delete(1.0, tk.END)
-            text_area.config(state=tk.DISABLED)
+            self.app.ui_elements['text_view'].clear()
             self.app.queue_ui_message("status", "", "Текст очищен")
 
     def handle_clear_logs(self):
-        log_area = self.app.ui_elements['log_area']
-        log_area.config(state=tk.NORMAL)
-        log_area.delete(1.0, tk.END)
-        log_area.config(state=tk.DISABLED)
+        self.app.ui_elements['log_view'].clear()
         self.app.queue_ui_message("status", "", "Логи очищены")
 
-    def _record_audio_worker(self):
-        return self.app.recording_manager.record_audio(
-            self.app.audio_queue,
-            self.app.stop_flags['recording'],
-            self.app.queue_ui_message
-        )
-    def _process_audio_worker(self):
-        return self.app.recording_manager.process_audio(
-            self.app.audio_queue,
-            self.app.stop_flags['processing'],
-            self.app.queue_ui_message
-        )
\ No newline at end of file
+    def handle_export_metrics(self):
+        path = filedialog.asksaveasfilename(title="Экспорт метрик", defaultextension=".prom",
+                                            filetypes=[("Prometheus", "*.prom"), ("JSON", "*.json")])
+        if not path:
+            return
+        try:
+            registry.export(path)
+            self.log.info("Метрики сохранены: %s", path)
+        except OSError as e:
+            self.app.queue_ui_message("error", "Ошибка", f"Не удалось сохранить метрики:\n{e}")
+    def handle_toggle_profiler(self, enabled):
+        self.app.recording_manager.profile_decode = enabled
+        state = "включено" if enabled else "выключено"
+        self.log.info("Профилирование потока распознавания %s (применится со следующей записи)", state)
+    async def _consume_results(self, pipeline):
+        try:
+            async for result in pipeline.results():
+                journal = self.app.journal
+                if journal is not None:
+                    journal.write(result.kind, result.text, result)
+        finally:
+            self._close_journal()
+    def _device_audio_settings(self):
+        audio_manager = self.app.audio_manager
+        return {name: getattr(audio_manager, name) for name in
+                ('callback_mode', 'native_format', 'resample_quality', 'chunk', 'word_timings',
+                 'grammar', 'recognizer_pool')}
+    def _finish_multi_device(self):
+        try:
+            for label, metrics in self.app.multi_recorder.get_metrics().items():
+                ring = metrics['ring_buffer']
+                self.log.info("%s итог: слов %d, отброшено чанков %d, переполнений буфера %d", label,
+                              metrics['words'], metrics['dropped_chunks'], ring['overruns'])
+        finally:
+            self._close_journal()
+            self.app.root.after(0, self._finish_recording)
+    def _open_journal(self):
+        if not self.app.journal_enabled:
+            return
+        try:
+            self.app.journal = TranscriptJournal(include_partials=self.app.journal_partials).open()
+            if self.app.multi_recorder:
+                self.app.multi_recorder.add_result_listener(self.app.journal.on_result,
+                                                            partials=self.app.journal_partials)
+            self.log.info("Журнал сессии: %s", self.app.journal.session_id)
+        except OSError as e:
+            self.app.journal = None
+            self.log.error("❌ Не удалось открыть журнал: %s", e)
+    def _close_journal(self):
+        journal = self.app.journal
+        if journal is None:
+            return
+        self.app.journal = None
+        if self.app.multi_recorder:
+            self.app.multi_recorder.remove_result_listener(journal.on_result)
+        journal.close()
+        self.log.info("Журнал сохранён: %d записей", journal.records)
+    def handle_device_selection(self):
+        if self.app.is_recording or self.app.is_stopping:
+            self.app.queue_ui_message("error", "Ошибка", "Остановите запись перед выбором микрофонов")
+            return
+        probe = AudioManager()
+        devices = probe.get_audio_devices_info()
+        probe.cleanup()
+        if not devices:
+            self.app.queue_ui_message("error", "Ошибка", "Устройства записи не найдены")
+            return
+        window = tk.Toplevel(self.app.root)
+        window.title("Микрофоны")
+        window.transient(self.app.root)
+        tk.Label(window, text="Выберите одно или несколько устройств.\n"
+                 "Без выбора используется устройство по умолчанию.",
+                 font=("Arial", 10)).pack(padx=10, pady=5)
+        listbox = tk.Listbox(window, selectmode=tk.MULTIPLE, width=60, height=min(len(devices), 12),
+                             exportselection=False)
+        selected = {device['index'] for device in self.app.input_devices}
+        for position, device in enumerate(devices):
+            listbox.insert(tk.END, f"{device['index']}: {device['name']} "
+                           f"({device['channels']} кан., {int(device['rate'])} Гц)")
+            if device['index'] in selected:
+                listbox.selection_set(position)
+        listbox.pack(padx=10, pady=5, fill=tk.BOTH, expand=True)
+        def apply_selection():
+            chosen = [devices[position] for position in listbox.curselection()]
+            self.app.set_input_devices(chosen)
+            window.destroy()
+            if chosen:
+                names = ", ".join(device['name'] for device in chosen)
+                self.log.info("Выбраны микрофоны (%d): %s", len(chosen), names)
+            else:
+                self.log.info("Используется микрофон по умолчанию")
+        tk.Button(window, text="Применить", command=apply_selection,
+                  font=("Arial", 10, "bold"), cursor='hand2').pack(pady=10)
+    def handle_load_grammar(self):
+        path = filedialog.askopenfilename(title="Выберите список фраз",
+                                          filetypes=[("Список фраз", "*.txt *.json"), ("Все файлы", "*.*")])
+        if not path:
+            return
+        try:
+            grammar = PhraseGrammar.from_file(path)
+        except (OSError, ValueError) as e:
+            self.app.queue_ui_message("error", "Ошибка", f"Не удалось загрузить список фраз:\n{e}")
+            return
+        self._apply_grammar(grammar)
+        self.log.info("Режим команд: %s, фраз: %d", grammar.name, len(grammar))
+        if self.app.model_manager.is_model_loaded():
+            self.app.executor.submit(self._warm_recognizers)
+    def handle_open_vocabulary(self):
+        self._apply_grammar(None)
+        self.log.info("Режим свободной речи")
+    def _apply_grammar(self, grammar):
+        self.app.grammar = grammar
+        self.app.audio_manager.set_grammar(grammar)
+        if self.app.multi_recorder:
+            self.app.multi_recorder.set_grammar(grammar)
+        label = f"Словарь: {grammar.name}" if grammar else "Словарь: свободная речь"
+        self.app.ui_elements['btn_vocabulary'].config(text=f"🔤 {label}")
+    def handle_open_session(self):
+        path = filedialog.askopenfilename(title="Выберите журнал сессии", initialdir=JOURNAL_DIR,
+                                          filetypes=[("Журнал сессии", "*.jsonl")])
+        if not path:
+            return
+        try:
+            reader = JournalReader.from_path(path)
+            entries = []
+            for record in reader.read():
+                if record.get('type') == 'final':
+                    timestamp = datetime.datetime.fromtimestamp(record['t']).strftime("%H:%M:%S")
+                    source = f"{record['source']} " if record.get('source') else ""
+                    entries.append(f"[{timestamp}] {source}{record['text']}\n")
+            text_view = self.app.ui_elements['text_view']
+            text_view.clear()
+            text_view.append(entries)
+            self.log.info("Загружена сессия %s: %d фраз", reader.session_id, len(entries))
+        except Exception as e:
+            self.app.queue_ui_message("error", "Ошибка", f"Не удалось загрузить сессию:\n{e}")
\ No newline at end of file
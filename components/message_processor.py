@@ -1,20 +1,112 @@
 import tkinter as tk
 from tkinter import messagebox as mb
 import datetime
+import queue
+import time
+from collections import deque
+from utils.helpers import Utils
+from core.metrics import registry
 class MessageProcessor:
     def __init__(self, app):
         self.app = app
+        self.base_interval = 100
+        self.min_interval = 10
+        self.max_messages_per_tick = 200
+        self.tick_budget = 0.02
+        self.interval = self.base_interval
+        self.render_times = deque(maxlen=1000)
+        self.ticks = 0
+        self.messages_handled = 0
+        self.max_backlog = 0
+        self.partial_texts = {}
+        self.next_tick_due = None
+        self.tick_histogram = registry.histogram('stt_ui_tick_seconds', "Время обработки такта очереди UI")
+        self.lag_histogram = registry.histogram('stt_ui_lag_seconds', "Опоздание такта очереди UI")
+        self.ui_queue_gauge = registry.gauge('stt_ui_queue_depth', "Сообщений в очереди UI после такта")
+        self.messages_counter = registry.counter('stt_ui_messages_total', "Сообщений обработано очередью UI")
     def start_processing(self):
         self._process_queue()
     def _process_queue(self):
+        started = time.perf_counter()
+        if self.next_tick_due is not None:
+            self.lag_histogram.observe(max(0.0, started - self.next_tick_due))
+        handled = self.messages_handled
+        batch = {'log': [], 'text': [], 'status': None, 'partial': {}}
         try:
-            while True:
+            for _ in range(self.max_messages_per_tick):
+                if time.perf_counter() - started > self.tick_budget:
+                    break
                 msg_type, title, message, kwargs = self.app.ui_queue.get_nowait()
-                self._handle_message(msg_type, title, message, **kwargs)
-        except:
+                self.messages_handled += 1
+                if msg_type == "log":
+                    batch['log'].append(self._format_entry(message))
+                elif msg_type == "text":
+                    self._flush_partial(batch)
+                    self.partial_texts.pop(kwargs.get('source'), None)
+                    batch['text'].append(self._format_entry(message))
+                    batch['status'] = (self._result_status(message), {'fg': "green"})
+                elif msg_type == "partial":
+                    batch['partial'][kwargs.get('source')] = self._update_partial(message, **kwargs)
+                elif msg_type == "status":
+                    batch['status'] = (message, kwargs)
+                else:
+                    if msg_type in ("error", "info"):
+                        self._flush_batch(batch)
+                    self._handle_message(msg_type, title, message, **kwargs)
+        except queue.Empty:
             pass
+        except Exception as e:
+            print(f"Ошибка обработки сообщений UI: {e}")
         finally:
-            self.app.root.after(100, self._process_queue)
+            self._flush_batch(batch)
+            elapsed = time.perf_counter() - started
+            self.render_times.append(elapsed)
+            self.tick_histogram.observe(elapsed)
+            self.messages_counter.inc(self.messages_handled - handled)
+            self.ticks += 1
+            backlog = self.app.ui_queue.qsize()
+            self.ui_queue_gauge.set(backlog)
+            self.max_backlog = max(self.max_backlog, backlog)
+            self.interval = self.min_interval if backlog else self.base_interval
+            self.next_tick_due = time.perf_counter() + self.interval / 1000
+            self.app.root.after(self.interval, self._process_queue)
+    def _flush_partial(self, batch):
+        for source, text in batch['partial'].items():
+            batch['log'].append(self._format_entry(self._partial_entry(source, text)))
+        batch['partial'].clear()
+    def _update_partial(self, message, prefix=0, source=None):
+        text = self.partial_texts.get(source, "")[:prefix] + message
+        self.partial_texts[source] = text
+        return text
+    def _partial_entry(self, source, text):
+        label = f"{source} " if source else ""
+        return f"{label}ЧАСТИЧНО: '{text}'"
+    def _flush_batch(self, batch):
+        ui_elements = self.app.ui_elements
+        self._flush_partial(batch)
+        if batch['log']:
+            ui_elements['log_view'].append(batch['log'])
+            batch['log'] = []
+        if batch['text']:
+            ui_elements['text_view'].append(batch['text'])
+            batch['text'] = []
+        if batch['status']:
+            message, kwargs = batch['status']
+            ui_elements['status_label'].config(text=message, **kwargs)
+            batch['status'] = None
+    def _format_entry(self, message):
+        timestamp = datetime.datetime.now().strftime("%H:%M:%S")
+        return f"[{timestamp}] {message}\n"
+    def _result_status(self, text):
+        return f"✅ Распознано: {text[:30]}..."
+    def get_metrics(self):
+        return {
+            'ticks': self.ticks,
+            'messages': self.messages_handled,
+            'interval_ms': self.interval,
+            'max_backlog': self.max_backlog,
+            'render_seconds': Utils.summarize(list(self.render_times)),
+        }
     def _handle_message(self, msg_type, title, message, **kwargs):
         ui_elements = self.app.ui_elements
         if msg_type == "log":
@@ -22,7 +114,11 @@ class MessageProcessor:
         elif msg_type == "status":
             ui_elements['status_label'].config(text=message, **kwargs)
         elif msg_type == "text":
+            self.partial_texts.pop(kwargs.get('source'), None)
             self.update_text_display(message)
+        elif msg_type == "partial":
+            text = self._update_partial(message, **kwargs)
+            self._add_log_message(self._partial_entry(kwargs.get('source'), text))
         elif msg_type == "model_info":
             ui_elements['model_info_label'].config(text=message)
         elif msg_type == "error":
@@ -33,23 +129,9 @@ class MessageProcessor:
             ui_elements['btn_start'].config(state=kwargs.get('start', tk.NORMAL))
             ui_elements['btn_stop'].config(state=kwargs.get('stop', tk.NORMAL))
     def _add_log_message(self, message):
-        log_area = self.app.ui_elements['log_area']
-        timestamp = datetime.datetime.now().strftime("%H:%M:%S")
-        log_entry = f"[{timestamp}] {message}\n"
-        log_area.config(state=tk.NORMAL)
-        log_area.insert(tk.END, log_entry)
-        log_area.config(state=tk.DISABLED)
-        log_area.see(tk.END)
-        log_area.update_idletasks()
-        print(log_entry.strip())
+        self.app.ui_elements['log_view'].append([self._format_entry(message)])
     def update_text_display(self, text):
-        text_area = self.app.ui_elements['text_area']
-        timestamp = datetime.datetime.now().strftime("%H:%M:%S")
-        formatted_text = f"[{timestamp}] {text}\n"
-        text_area.config(state=tk.NORMAL)
-        text_area.insert(tk.END, formatted_text)
-        text_area.config(state=tk.DISABLED)
-        text_area.see(tk.END)
-        self.app.queue_ui_message("status", "", f"✅ Распознано: {text[:30]}...", fg="green")
+        self.app.ui_elements['text_view'].append([self._format_entry(text)])
+        self.app.ui_elements['status_label'].config(text=self._result_status(text), fg="green")
     def queue_message(self, msg_type, title="", message="", **kwargs):
         self.app.ui_queue.put((msg_type, title, message, kwargs))
\ No newline at end of file
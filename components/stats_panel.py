@@ -0,0 +1,41 @@
+class StatsPanel:
+    def __init__(self, label, registry, interval_ms=1000):
+        self.label = label
+        self.registry = registry
+        self.interval_ms = interval_ms
+        self.export_path = None
+        self.last_decoded = 0.0
+        self.last_busy = 0.0
+    def start(self):
+        self.refresh()
+    def refresh(self):
+        try:
+            self.label.config(text=self.format_stats())
+            if self.export_path:
+                self.registry.export(self.export_path)
+        except Exception as e:
+            print(f"Ошибка обновления статистики: {e}")
+        finally:
+            self.label.after(self.interval_ms, self.refresh)
+    def format_stats(self):
+        registry = self.registry
+        decoded = registry.total('stt_decoded_audio_seconds_total')
+        busy = registry.total('stt_decode_busy_seconds_total')
+        load = (busy - self.last_busy) / (decoded - self.last_decoded) if decoded > self.last_decoded else 0.0
+        self.last_decoded, self.last_busy = decoded, busy
+        dropped = registry.total('stt_dropped_chunks_total') + registry.total('stt_ring_buffer_dropped_chunks')
+        return (f"Очередь аудио: {registry.total('stt_audio_queue_depth'):.0f}  |  "
+                f"отброшено чанков: {dropped:.0f}  |  "
+                f"декодирование p50 {self._ms('stt_decode_seconds', 0.5)}, "
+                f"p95 {self._ms('stt_decode_seconds', 0.95)}  |  "
+                f"нагрузка распознавателя: {load:.2f}×\n"
+                f"UI: очередь {registry.total('stt_ui_queue_depth'):.0f}, "
+                f"опоздание p95 {self._ms('stt_ui_lag_seconds', 0.95)}, "
+                f"такт p95 {self._ms('stt_ui_tick_seconds', 0.95)}")
+    def _ms(self, name, q):
+        value = self.registry.quantile(name, q)
+        if value is None:
+            return "–"
+        if value == float('inf'):
+            return "∞"
+        return f"≤{value * 1000:g} мс"
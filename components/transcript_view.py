@@ -0,0 +1,72 @@
+import tkinter as tk
+class PagedTextView:
+    def __init__(self, widget, store, window_entries=1000, page_entries=500, position_label=None):
+        self.widget = widget
+        self.store = store
+        self.window_entries = window_entries
+        self.page_entries = page_entries
+        self.position_label = position_label
+        self.following = True
+        self.window_start = 0
+        self.visible_entries = 0
+    def append(self, entries):
+        self.store.extend(entries)
+        if not self.following:
+            self._update_position()
+            return
+        self.widget.config(state=tk.NORMAL)
+        self.widget.insert(tk.END, "".join(entries))
+        self.visible_entries += len(entries)
+        excess = self.visible_entries - self.window_entries
+        if excess >= self.page_entries // 5:
+            self._drop_first_entries(excess)
+        self.widget.config(state=tk.DISABLED)
+        self.widget.see(tk.END)
+    def _drop_first_entries(self, count):
+        lines = sum(entry.count("\n") or 1 for entry in self.store.get_entries(self.window_start,
+                                                                            self.window_start + count))
+        self.widget.delete("1.0", f"{lines + 1}.0")
+        self.window_start += count
+        self.visible_entries -= count
+        self._update_position()
+    def page_up(self):
+        if self.window_start == 0:
+            return
+        self.following = False
+        self._render(max(0, self.window_start - self.page_entries))
+    def page_down(self):
+        start = self.window_start + self.page_entries
+        if start + self.window_entries >= len(self.store):
+            self.follow_tail()
+        else:
+            self._render(start)
+    def follow_tail(self):
+        self.following = True
+        self._render(max(0, len(self.store) - self.window_entries))
+        self.widget.see(tk.END)
+    def clear(self):
+        self.store.clear()
+        self.following = True
+        self._render(0)
+    def _render(self, start):
+        entries = self.store.get_entries(start, start + self.window_entries)
+        self.window_start = start
+        self.visible_entries = len(entries)
+        self.widget.config(state=tk.NORMAL)
+        self.widget.delete("1.0", tk.END)
+        self.widget.insert(tk.END, "".join(entries))
+        self.widget.config(state=tk.DISABLED)
+        if not self.following:
+            self.widget.see("1.0")
+        self._update_position()
+    def _update_position(self):
+        if self.position_label is None:
+            return
+        total = len(self.store)
+        if self.following and self.window_start == 0:
+            text = ""
+        else:
+            text = f"строки {self.window_start + 1}-{self.window_start + self.visible_entries} из {total}"
+            if not self.following:
+                text += " (просмотр истории)"
+        self.position_label.config(text=text)
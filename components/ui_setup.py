@@ -1,11 +1,16 @@
 import tkinter as tk
 from tkinter import scrolledtext as st
+from core.transcript_store import TranscriptStore
+from .transcript_view import PagedTextView
+from .stats_panel import StatsPanel
+from core.metrics import registry
 class UISetup:
     def create_interface(self, root, app):
         ui_elements = {}
         ui_elements.update(self._create_top_panel(root, app))
         ui_elements.update(self._create_text_area(root, app))
         ui_elements.update(self._create_log_area(root, app))
+        ui_elements.update(self._create_stats_panel(root, app))
         ui_elements.update(self._create_status_bar(root, app))
         return ui_elements
     def _create_top_panel(self, root, app):
@@ -38,12 +43,32 @@ class UISetup:
                                        bg="#609eea", fg="white", width=18,
                                        font=("Arial", 10, "bold"), relief=tk.RAISED, bd=2, cursor='hand2')
         buttons['btn_model'].pack(side=tk.LEFT, padx=5)
+        buttons['btn_session'] = tk.Button(frame_top, text="📜 Открыть сессию", 
+                                         command=app.open_session, 
+                                         bg="#9b7fd4", fg="white", width=16,
+                                         font=("Arial", 10, "bold"), relief=tk.RAISED, bd=2, cursor='hand2')
+        buttons['btn_session'].pack(side=tk.LEFT, padx=5)
+        buttons['btn_devices'] = tk.Button(frame_top, text="🎙 Микрофоны", 
+                                         command=app.select_devices, 
+                                         bg="#4fb3a9", fg="white", width=14,
+                                         font=("Arial", 10, "bold"), relief=tk.RAISED, bd=2, cursor='hand2')
+        buttons['btn_devices'].pack(side=tk.LEFT, padx=5)
+        buttons['btn_vocabulary'] = tk.Menubutton(frame_top, text="🔤 Словарь: свободная речь", 
+                                                bg="#d48f4f", fg="white", width=24,
+                                                font=("Arial", 10, "bold"), relief=tk.RAISED, bd=2, cursor='hand2')
+        vocabulary_menu = tk.Menu(buttons['btn_vocabulary'], tearoff=0)
+        vocabulary_menu.add_command(label="Свободная речь", command=app.use_open_vocabulary)
+        vocabulary_menu.add_command(label="Загрузить список фраз...", command=app.load_grammar)
+        buttons['btn_vocabulary'].config(menu=vocabulary_menu)
+        buttons['btn_vocabulary'].pack(side=tk.LEFT, padx=5)
         return buttons
     def _create_text_area(self, root, app):
         text_frame = tk.Frame(root)
         text_frame.pack(padx=10, pady=5, fill=tk.BOTH, expand=True)
-        tk.Label(text_frame, text="Распознанный текст:", 
-                font=("Arial", 9, "bold")).pack(anchor=tk.W)
+        header = tk.Frame(text_frame)
+        header.pack(fill=tk.X)
+        tk.Label(header, text="Распознанный текст:", 
+                font=("Arial", 9, "bold")).pack(side=tk.LEFT)
         text_area = st.ScrolledText(text_frame, 
                                             wrap=tk.WORD, 
                                             width=95, 
@@ -52,12 +77,15 @@ class UISetup:
                                             state=tk.DISABLED)
         text_area.pack(fill=tk.BOTH, expand=True)
         self._setup_context_menu(text_area, app)
-        return {'text_area': text_area}
+        text_view = self._create_paging_controls(header, text_area, window_entries=1000)
+        return {'text_area': text_area, 'text_view': text_view}
     def _create_log_area(self, root, app):
         log_frame = tk.Frame(root)
         log_frame.pack(padx=10, pady=5, fill=tk.BOTH, expand=True)
-        tk.Label(log_frame, text="Логи:", 
-                font=("Arial", 9, "bold")).pack(anchor=tk.W)
+        header = tk.Frame(log_frame)
+        header.pack(fill=tk.X)
+        tk.Label(header, text="Логи:", 
+                font=("Arial", 9, "bold")).pack(side=tk.LEFT)
         log_area = st.ScrolledText(log_frame, 
                                            wrap=tk.WORD, 
                                            width=95, 
@@ -66,7 +94,36 @@ class UISetup:
                                            state=tk.DISABLED)
         log_area.pack(fill=tk.BOTH, expand=True)
         self._setup_context_menu(log_area, app)
-        return {'log_area': log_area}
+        log_level = tk.StringVar(value="INFO")
+        tk.OptionMenu(header, log_level, "DEBUG", "INFO", "WARNING", "ERROR",
+                      command=app.set_log_level).pack(side=tk.LEFT, padx=5)
+        log_view = self._create_paging_controls(header, log_area, window_entries=500)
+        return {'log_area': log_area, 'log_view': log_view}
+    def _create_stats_panel(self, root, app):
+        stats_frame = tk.LabelFrame(root, text="Статистика", font=("Arial", 9, "bold"))
+        stats_frame.pack(padx=10, pady=5, fill=tk.X)
+        stats_label = tk.Label(stats_frame, text="", anchor=tk.W, justify=tk.LEFT,
+                               font=("Consolas", 8))
+        stats_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        profile_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(stats_frame, text="Профилировать распознавание", variable=profile_var,
+                       command=lambda: app.toggle_decode_profiler(profile_var.get()),
+                       font=("Arial", 8)).pack(side=tk.RIGHT)
+        tk.Button(stats_frame, text="💾 Экспорт метрик", command=app.export_metrics,
+                  font=("Arial", 8), relief=tk.FLAT, cursor='hand2').pack(side=tk.RIGHT, padx=5)
+        stats_panel = StatsPanel(stats_label, registry)
+        stats_panel.start()
+        return {'stats_label': stats_label, 'stats_panel': stats_panel}
+    def _create_paging_controls(self, header, text_widget, window_entries):
+        position_label = tk.Label(header, text="", font=("Arial", 8), fg="gray")
+        view = PagedTextView(text_widget, TranscriptStore(), window_entries=window_entries,
+                             page_entries=window_entries // 2, position_label=position_label)
+        for text, command in (("⤓ В конец", view.follow_tail), ("⬇ Позже", view.page_down),
+                              ("⬆ Ранее", view.page_up)):
+            tk.Button(header, text=text, command=command, font=("Arial", 8),
+                      relief=tk.FLAT, cursor='hand2').pack(side=tk.RIGHT)
+        position_label.pack(side=tk.RIGHT, padx=5)
+        return view
     def _setup_context_menu(self, text_widget, app):
         context_menu = tk.Menu(text_widget, tearoff=0)
         context_menu.add_command(label="Копировать", 
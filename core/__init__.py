@@ -2,8 +2,18 @@
 Ядро приложения - основные функциональные компоненты
 """
 
-from .audio_manager import AudioManager
-from .model_manager import ModelManager
-from .recording_manager import RecordingManager
+import importlib
+
+_EXPORTS = {
+    'AudioManager': '.audio_manager',
+    'ModelManager': '.model_manager',
+    'RecordingManager': '.recording_manager',
+}
 
 __all__ = ['AudioManager', 'ModelManager', 'RecordingManager']
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,39 @@
+from collections import deque
+from utils.helpers import Utils
+class AdaptiveChunkController:
+    def __init__(self, sample_rate, min_chunk=1024, max_chunk=8192,
+                 high_watermark=0.5, low_watermark=0.2, silence_hangover=4, history=2000):
+        self.sample_rate = sample_rate
+        self.min_chunk = min_chunk
+        self.max_chunk = max_chunk
+        self.high_watermark = high_watermark
+        self.low_watermark = low_watermark
+        self.silence_hangover = silence_hangover
+        self.current = max_chunk
+        self.speech_active = False
+        self.silent_polls = 0
+        self.size_counts = {}
+        self.latencies = deque(maxlen=history)
+    def next_chunk_size(self, queued, maxsize):
+        fill = queued / maxsize if maxsize else 0.0
+        if fill >= self.high_watermark or not self.speech_active:
+            self.current = min(self.current * 2, self.max_chunk)
+        elif fill <= self.low_watermark:
+            self.current = max(self.current // 2, self.min_chunk)
+        self.size_counts[self.current] = self.size_counts.get(self.current, 0) + 1
+        self.latencies.append((queued + 1) * self.current / self.sample_rate)
+        return self.current
+    def update_speech(self, is_speech):
+        if is_speech:
+            self.speech_active = True
+            self.silent_polls = 0
+        elif self.speech_active:
+            self.silent_polls += 1
+            if self.silent_polls > self.silence_hangover:
+                self.speech_active = False
+    def get_metrics(self):
+        return {
+            'current_chunk': self.current,
+            'chunk_sizes': dict(sorted(self.size_counts.items())),
+            'estimated_latency': Utils.summarize(list(self.latencies)),
+        }
@@ -0,0 +1,65 @@
+import asyncio
+import threading
+from .ring_buffer import AudioRingBuffer
+class AsyncRecognitionPipeline:
+    def __init__(self, recording_manager, audio_queue=None, executor=None, partials=True,
+                 message_queue_func=None):
+        self.recording_manager = recording_manager
+        self.audio_queue = audio_queue or AudioRingBuffer(
+            slots=10, slot_size=recording_manager.audio_manager.chunk_bytes)
+        self.executor = executor
+        self.partials = partials
+        self.message_queue_func = message_queue_func or self._discard_message
+        self.stop_flags = {
+            'recording': threading.Event(),
+            'processing': threading.Event()
+        }
+    @staticmethod
+    def _discard_message(msg_type, title="", message="", **kwargs):
+        pass
+    def stop(self, drain=True):
+        self.stop_flags['recording'].set()
+        if not drain:
+            self.stop_flags['processing'].set()
+    async def results(self, audio_source=None):
+        loop = asyncio.get_running_loop()
+        results = asyncio.Queue()
+        def on_result(kind, text, result):
+            loop.call_soon_threadsafe(results.put_nowait, result)
+        recording_manager = self.recording_manager
+        recording_manager.begin_session()
+        self.audio_queue.clear()
+        for flag in self.stop_flags.values():
+            flag.clear()
+        recording_manager.add_result_listener(on_result, partials=self.partials)
+        recording = loop.run_in_executor(self.executor, recording_manager.record_audio, self.audio_queue,
+                                         self.stop_flags['recording'], self.message_queue_func, audio_source)
+        processing = loop.run_in_executor(self.executor, recording_manager.process_audio, self.audio_queue,
+                                          self.stop_flags['processing'], self.message_queue_func)
+        processing.add_done_callback(lambda _: results.put_nowait(None))
+        try:
+            while True:
+                result = await results.get()
+                if result is None:
+                    break
+                yield result
+        finally:
+            self.stop(drain=False)
+            await asyncio.gather(recording, processing, return_exceptions=True)
+            recording_manager.remove_result_listener(on_result)
+class AsyncLoopThread:
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = None
+    def start(self):
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        return self
+    def submit(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+    def stop(self):
+        if self.thread is None:
+            return
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.thread = None
@@ -1,44 +1,160 @@
-import pyaudio
+from .resampler import AudioResampler
+from .recognizer_pool import RecognizerPool
+from .startup_profile import lazy_import
 class AudioManager:
-    def __init__(self):
-        self.format = pyaudio.paInt16
+    RESAMPLE_SLACK_FRAMES = 2
+    def __init__(self, input_device_index=None):
+        self.input_device_index = input_device_index
+        self.format = None
         self.channels = 1
         self.rate = 16000
         self.chunk = 8192
+        self.adaptive_chunk = False
+        self.min_chunk = 1024
+        self.word_timings = False
+        self.partial_word_timings = False
+        self.grammar = None
+        self.recognizer_grammar = None
+        self.recognizer_rate = None
+        self.callback_mode = False
+        self.native_format = False
+        self.resample_quality = AudioResampler.QUALITY_LINEAR
+        self.max_capture_channels = 2
+        self.capture_rate = self.rate
+        self.capture_channels = self.channels
+        self.resampler = None
+        self.on_audio = None
+        self.callback_stats = {'callbacks': 0, 'input_overflow': 0, 'input_underflow': 0}
+        self.keep_stream_open = False
+        self.stream_key = None
+        self.last_stream_resumed = False
+        self.recognizer_pool = None
+        self.recognizer_key = None
+        self.last_recognizer_reused = False
         self.audio_stream = None
         self.pyaudio_instance = None
         self.recognizer = None
-    def create_recognizer(self, model):
+    def create_recognizer(self, model, rate=None):
         try:
             if model is None:
                 return False
-            from vosk import KaldiRecognizer
-            self.recognizer = KaldiRecognizer(model, self.rate)
+            self.release_recognizer()
+            rate = rate or self.rate
+            self.recognizer_grammar = self.grammar
+            self.recognizer_rate = rate
+            if self.recognizer_pool is None:
+                self.recognizer = self._new_recognizer(model, rate)
+                self.last_recognizer_reused = False
+            else:
+                self.recognizer_key = self._recognizer_key(model, rate)
+                self.recognizer, self.last_recognizer_reused = self.recognizer_pool.acquire(
+                    self.recognizer_key, lambda: self._new_recognizer(model, rate))
             return self.recognizer is not None
         except Exception as e:
             print(f"Ошибка создания распознавателя: {e}")
             self.recognizer = None
             return False
-    def open_audio_stream(self):
+    def _new_recognizer(self, model, rate):
+        KaldiRecognizer = lazy_import('vosk').KaldiRecognizer
+        if self.grammar:
+            recognizer = KaldiRecognizer(model, rate, self.grammar)
+        else:
+            recognizer = KaldiRecognizer(model, rate)
+        if self.word_timings:
+            recognizer.SetWords(True)
+        if self.partial_word_timings and hasattr(recognizer, 'SetPartialWords'):
+            recognizer.SetPartialWords(True)
+        return recognizer
+    def _recognizer_key(self, model, rate):
+        return RecognizerPool.make_key(model, rate, self.word_timings, self.partial_word_timings, self.grammar)
+    def warm_recognizers(self, model, rate=None, count=1):
+        if self.recognizer_pool is None or model is None:
+            return 0
+        rate = rate or self.rate
+        return self.recognizer_pool.warm(self._recognizer_key(model, rate),
+                                         lambda: self._new_recognizer(model, rate), count)
+    def set_grammar(self, grammar):
+        self.grammar = grammar.to_json() if grammar is not None else None
+    @property
+    def grammar_changed(self):
+        return self.recognizer is not None and self.recognizer_grammar != self.grammar
+    def release_recognizer(self):
+        recognizer, self.recognizer = self.recognizer, None
+        if recognizer is not None and self.recognizer_pool is not None:
+            self.recognizer_pool.release(self.recognizer_key, recognizer)
+    def open_audio_stream(self, on_audio=None):
         try:
-            self.pyaudio_instance = pyaudio.PyAudio()
-            self.audio_stream = self.pyaudio_instance.open(
-                format=self.format,
-                channels=self.channels,
-                rate=self.rate,
-                input=True,
-                frames_per_buffer=self.chunk
-            )
+            self.on_audio = on_audio
+            self.callback_stats = {'callbacks': 0, 'input_overflow': 0, 'input_underflow': 0}
+            pyaudio = lazy_import('pyaudio')
+            if self.pyaudio_instance is None:
+                self.pyaudio_instance = pyaudio.PyAudio()
+            self._configure_capture()
+            frames = self.min_chunk if self.adaptive_chunk and on_audio is None else self.chunk
+            stream_key = (self.input_device_index, self.capture_rate, self.capture_channels,
+                          self._capture_frames(frames), on_audio is not None)
+            self.last_stream_resumed = self.audio_stream is not None and stream_key == self.stream_key
+            if not self.last_stream_resumed:
+                self._close_stream()
+                self.audio_stream = self.pyaudio_instance.open(
+                    format=self.format or pyaudio.paInt16,
+                    channels=self.capture_channels,
+                    rate=self.capture_rate,
+                    input=True,
+                    input_device_index=self.input_device_index,
+                    frames_per_buffer=stream_key[3],
+                    stream_callback=self._stream_callback if on_audio else None
+                )
+                self.stream_key = stream_key
             self.audio_stream.start_stream()
             return True
         except Exception as e:
             print(f"Ошибка открытия аудиопотока: {e}")
             self.cleanup()
             return False
-    def read_audio_chunk(self):
+    def _configure_capture(self):
+        self.capture_rate = self.rate
+        self.capture_channels = self.channels
+        self.resampler = None
+        if not self.native_format:
+            return
+        if not AudioResampler.is_available():
+            print("Захват в формате устройства недоступен: не установлен numpy")
+            return
+        if self.input_device_index is None:
+            info = self.pyaudio_instance.get_default_input_device_info()
+        else:
+            info = self.pyaudio_instance.get_device_info_by_index(self.input_device_index)
+        self.capture_rate = int(info.get('defaultSampleRate') or self.rate)
+        self.capture_channels = max(1, min(int(info.get('maxInputChannels') or 1), self.max_capture_channels))
+        resampler = AudioResampler(self.capture_rate, self.rate, self.capture_channels, self.resample_quality)
+        if not resampler.is_passthrough:
+            self.resampler = resampler
+    def _capture_frames(self, frames):
+        return self.resampler.input_frames(frames) if self.resampler else frames
+    def describe_capture(self):
+        if self.resampler is None:
+            return None
+        return (f"Захват {self.capture_rate} Гц × {self.capture_channels} кан. → {self.rate} Гц моно "
+                f"(передискретизация: {self.resample_quality})")
+    def _stream_callback(self, in_data, frame_count, time_info, status):
+        pyaudio = lazy_import('pyaudio')
+        self.callback_stats['callbacks'] += 1
+        if status & pyaudio.paInputOverflow:
+            self.callback_stats['input_overflow'] += 1
+        if status & pyaudio.paInputUnderflow:
+            self.callback_stats['input_underflow'] += 1
+        if self.resampler:
+            in_data = self.resampler.process(in_data)
+        if self.on_audio(in_data):
+            return None, pyaudio.paContinue
+        return None, pyaudio.paComplete
+    def read_audio_chunk(self, frames=None):
         try:
             if self.audio_stream and self.audio_stream.is_active():
-                return self.audio_stream.read(self.chunk, exception_on_overflow=False)
+                data = self.audio_stream.read(self._capture_frames(frames or self.chunk),
+                                              exception_on_overflow=False)
+                return self.resampler.process(data) if self.resampler else data
             return None
         except Exception as e:
             print(f"Ошибка чтения аудио: {e}")
@@ -48,7 +164,7 @@ class AudioManager:
     def get_audio_devices_info(self):
         try:
             if self.pyaudio_instance is None:
-                self.pyaudio_instance = pyaudio.PyAudio()
+                self.pyaudio_instance = lazy_import('pyaudio').PyAudio()
             info = self.pyaudio_instance.get_host_api_info_by_index(0)
             numdevices = info.get('deviceCount')
             devices = []
@@ -56,7 +172,7 @@ class AudioManager:
                 device_info = self.pyaudio_instance.get_device_info_by_host_api_device_index(0, i)
                 if device_info.get('maxInputChannels') > 0:
                     devices.append({
-                        'index': i,
+                        'index': device_info.get('index', i),
                         'name': device_info.get('name', 'Неизвестное устройство'),
                         'channels': device_info.get('maxInputChannels'),
                         'rate': device_info.get('defaultSampleRate')
@@ -65,16 +181,18 @@ class AudioManager:
         except Exception as e:
             print(f"Ошибка получения информации об устройствах: {e}")
             return []
-    def cleanup(self):
-        if self.audio_stream:
+    def cleanup(self, full=False):
+        if self.audio_stream and self.keep_stream_open and not full:
             try:
-                if self.audio_stream.is_active():
+                if not self.audio_stream.is_stopped():
                     self.audio_stream.stop_stream()
-                self.audio_stream.close()
             except Exception as e:
-                print(f"Ошибка закрытия аудио потока: {e}")
-            finally:
-                self.audio_stream = None
+                print(f"Ошибка приостановки аудио потока: {e}")
+                self._close_stream()
+            self.on_audio = None
+            return
+        self._close_stream()
+        self.on_audio = None
         if self.pyaudio_instance:
             try:
                 self.pyaudio_instance.terminate()
@@ -82,9 +200,21 @@ class AudioManager:
                 print(f"Ошибка завершения PyAudio: {e}")
             finally:
                 self.pyaudio_instance = None
-        self.recognizer = None
+        if full:
+            self.release_recognizer()
+    def _close_stream(self):
+        self.stream_key = None
+        if self.audio_stream:
+            try:
+                if self.audio_stream.is_active():
+                    self.audio_stream.stop_stream()
+                self.audio_stream.close()
+            except Exception as e:
+                print(f"Ошибка закрытия аудио потока: {e}")
+            finally:
+                self.audio_stream = None
     def __del__(self):
-        self.cleanup()
+        self.cleanup(full=True)
     @property
     def sample_rate(self):
         return self.rate
@@ -92,5 +222,8 @@ class AudioManager:
     def chunk_size(self):
         return self.chunk
     @property
+    def chunk_bytes(self):
+        return (self.chunk + self.RESAMPLE_SLACK_FRAMES if self.native_format else self.chunk) * 2
+    @property
     def is_ready(self):
         return self.pyaudio_instance is not None and self.audio_stream is not None
\ No newline at end of file
@@ -0,0 +1,180 @@
+import sys
+import math
+import time
+import wave
+from array import array
+class AudioSource:
+    def __init__(self, sample_rate=16000, chunk=8192, paced=False):
+        self.rate = sample_rate
+        self.chunk = chunk
+        self.paced = paced
+        self.frames_read = 0
+        self.started_at = None
+        self.active = False
+    def open(self):
+        self.frames_read = 0
+        self.started_at = time.perf_counter()
+        self.active = True
+        return True
+    def read_chunk(self, frames=None):
+        if not self.active:
+            return None
+        data = self._read_frames(frames or self.chunk)
+        if not data:
+            self.active = False
+            return None
+        self.frames_read += len(data) // 2
+        if self.paced:
+            self._pace()
+        return data
+    def _read_frames(self, frames):
+        raise NotImplementedError
+    def seek(self, frame):
+        raise NotImplementedError(f"{type(self).__name__} не поддерживает перемотку")
+    def _pace(self):
+        delay = self.started_at + self.frames_read / self.rate - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+    def close(self):
+        self.active = False
+    def is_active(self):
+        return self.active
+    @property
+    def is_live(self):
+        return self.paced
+    @property
+    def sample_rate(self):
+        return self.rate
+    @property
+    def chunk_size(self):
+        return self.chunk
+    @property
+    def duration(self):
+        return self.frames_read / self.rate
+class MicrophoneSource(AudioSource):
+    def __init__(self, audio_manager):
+        super().__init__(audio_manager.rate, audio_manager.chunk)
+        self.audio_manager = audio_manager
+    @property
+    def is_live(self):
+        return True
+    def open(self):
+        super().open()
+        self.active = self.audio_manager.open_audio_stream()
+        return self.active
+    def read_chunk(self, frames=None):
+        data = self.audio_manager.read_audio_chunk(frames)
+        if data:
+            self.frames_read += len(data) // 2
+        return data
+    def is_active(self):
+        return self.audio_manager.is_stream_active()
+    def close(self):
+        super().close()
+        self.audio_manager.cleanup()
+class WavFileSource(AudioSource):
+    def __init__(self, path, chunk=8192, paced=False):
+        self.path = path
+        self.wav = None
+        with wave.open(path, 'rb') as wav:
+            if wav.getsampwidth() != 2 or wav.getnchannels() != 1:
+                raise ValueError("Ожидается 16-бит моно WAV")
+            rate = wav.getframerate()
+            self.total_frames = wav.getnframes()
+        super().__init__(rate, chunk, paced)
+    def open(self):
+        self.wav = wave.open(self.path, 'rb')
+        return super().open()
+    def _read_frames(self, frames):
+        return self.wav.readframes(frames)
+    def seek(self, frame):
+        self.wav.setpos(min(frame, self.total_frames))
+    def close(self):
+        super().close()
+        if self.wav:
+            self.wav.close()
+            self.wav = None
+class PcmStreamSource(AudioSource):
+    def __init__(self, stream, sample_rate=16000, chunk=8192, paced=False):
+        super().__init__(sample_rate, chunk, paced)
+        self.stream = stream
+        self.pending = b""
+    def _read_frames(self, frames):
+        size = frames * 2
+        data = self.pending
+        while len(data) < size:
+            block = self.stream.read(size - len(data))
+            if not block:
+                break
+            data += block
+        if len(data) % 2:
+            data, self.pending = data[:-1], data[-1:]
+        else:
+            self.pending = b""
+        return data
+class RawFileSource(PcmStreamSource):
+    def __init__(self, path, sample_rate=16000, chunk=8192, paced=False):
+        super().__init__(None, sample_rate, chunk, paced)
+        self.path = path
+    def open(self):
+        self.stream = open(self.path, 'rb')
+        return super().open()
+    def seek(self, frame):
+        self.stream.seek(frame * 2)
+        self.pending = b""
+    def close(self):
+        super().close()
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+class StdinSource(PcmStreamSource):
+    def __init__(self, sample_rate=16000, chunk=8192, paced=False):
+        super().__init__(sys.stdin.buffer, sample_rate, chunk, paced)
+class ReplaySource(AudioSource):
+    def __init__(self, data, sample_rate=16000, chunk=8192, paced=False, loops=1):
+        super().__init__(sample_rate, chunk, paced)
+        self.data = memoryview(data)[:len(data) - len(data) % 2]
+        self.loops = loops
+        self.position = 0
+        self.loop_index = 0
+    def open(self):
+        self.position = 0
+        self.loop_index = 0
+        return super().open()
+    def seek(self, frame):
+        self.position = min(frame * 2, len(self.data))
+    def _read_frames(self, frames):
+        if self.position >= len(self.data):
+            self.loop_index += 1
+            if self.loop_index >= self.loops or not self.data:
+                return b""
+            self.position = 0
+        end = min(self.position + frames * 2, len(self.data))
+        data = bytes(self.data[self.position:end])
+        self.position = end
+        return data
+class SyntheticSource(ReplaySource):
+    def __init__(self, duration=10.0, sample_rate=16000, chunk=8192, paced=False,
+                 speech_seconds=2.0, silence_seconds=1.0, frequency=440.0, amplitude=0.3):
+        period = speech_seconds + silence_seconds
+        level = int(32767 * amplitude)
+        step = 2 * math.pi * frequency / sample_rate
+        samples = array('h', bytes(int(duration * sample_rate) * 2))
+        for i in range(len(samples)):
+            if (i / sample_rate) % period < speech_seconds:
+                samples[i] = int(level * math.sin(step * i))
+        super().__init__(samples.tobytes(), sample_rate, chunk, paced)
+def create_audio_source(spec, chunk=8192, sample_rate=16000, paced=False, audio_manager=None):
+    if spec in (None, 'mic'):
+        if audio_manager is None:
+            from .audio_manager import AudioManager
+            audio_manager = AudioManager()
+        return MicrophoneSource(audio_manager)
+    if spec == '-':
+        return StdinSource(sample_rate, chunk, paced)
+    if spec.startswith('synthetic'):
+        _, _, duration = spec.partition(':')
+        return SyntheticSource(float(duration or 10), sample_rate, chunk, paced)
+    if spec.lower().endswith('.wav'):
+        return WavFileSource(spec, chunk, paced)
+    return RawFileSource(spec, sample_rate, chunk, paced)
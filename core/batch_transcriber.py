@@ -0,0 +1,130 @@
+import os
+import sys
+import json
+import time
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from .model_manager import ModelManager
+from .audio_sources import create_audio_source
+from .segmented_transcriber import SegmentedTranscriber
+AUDIO_EXTENSIONS = ('.wav', '.pcm', '.raw')
+_worker_model_manager = None
+def _init_worker(model_path):
+    global _worker_model_manager
+    with redirect_stdout(sys.stderr):
+        model_manager = ModelManager()
+        model_manager.model_path = model_path
+        loaded = model_manager.load_model()
+    if not loaded:
+        raise RuntimeError(f"Не удалось загрузить модель: {model_path}")
+    _worker_model_manager = model_manager
+def _transcribe_file(path, sample_rate, chunk):
+    record = {'file': path, 'text': '', 'duration': 0.0, 'elapsed': 0.0,
+              'rtf': None, 'worker': os.getpid(), 'error': None}
+    started = time.perf_counter()
+    source = None
+    try:
+        source = create_audio_source(path, chunk, sample_rate)
+        if source.sample_rate != sample_rate:
+            raise ValueError(f"Частота {source.sample_rate}Hz, ожидается {sample_rate}Hz")
+        recognizer = _worker_model_manager.KaldiRecognizer(_worker_model_manager.model, sample_rate)
+        phrases = []
+        source.open()
+        while True:
+            data = source.read_chunk()
+            if data is None:
+                break
+            if recognizer.AcceptWaveform(data):
+                text = json.loads(recognizer.Result()).get("text", "").strip()
+                if text:
+                    phrases.append(text)
+        text = json.loads(recognizer.FinalResult()).get("text", "").strip()
+        if text:
+            phrases.append(text)
+        record['text'] = " ".join(phrases)
+        record['duration'] = source.duration
+    except Exception as e:
+        record['error'] = str(e)
+    finally:
+        if source:
+            source.close()
+    record['elapsed'] = time.perf_counter() - started
+    if record['duration'] > 0:
+        record['rtf'] = record['elapsed'] / record['duration']
+    return record
+class BatchTranscriber:
+    def __init__(self, model_path, workers=None, sample_rate=16000, chunk=8192, segment_seconds=None,
+                 compare=False):
+        self.model_path = model_path
+        self.workers = workers or os.cpu_count() or 1
+        self.sample_rate = sample_rate
+        self.chunk = chunk
+        self.segment_seconds = segment_seconds
+        self.compare = compare
+    def validate_model(self):
+        with redirect_stdout(sys.stderr):
+            return ModelManager().validate_model_path(self.model_path)
+    def collect_files(self, inputs):
+        files = []
+        for item in inputs:
+            if os.path.isdir(item):
+                for root, _, names in os.walk(item):
+                    files.extend(os.path.join(root, name) for name in sorted(names)
+                                 if name.lower().endswith(AUDIO_EXTENSIONS))
+            elif os.path.isfile(item):
+                files.append(item)
+            else:
+                print(f"Файл не найден: {item}", file=sys.stderr)
+        return files
+    def run(self, inputs):
+        files = self.collect_files(inputs)
+        if not files:
+            return
+        if self.segment_seconds:
+            yield from self._run_segmented(files)
+            return
+        workers = min(self.workers, len(files))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self.model_path,)) as executor:
+            futures = [executor.submit(_transcribe_file, path, self.sample_rate, self.chunk)
+                       for path in files]
+            try:
+                for future in as_completed(futures):
+                    yield future.result()
+            except BrokenProcessPool:
+                raise RuntimeError(f"Не удалось загрузить модель: {self.model_path}") from None
+    def _run_segmented(self, files):
+        if not SegmentedTranscriber.is_available():
+            raise RuntimeError("Для деления файлов по паузам требуется numpy")
+        with redirect_stdout(sys.stderr):
+            model_manager = ModelManager()
+            model_manager.model_path = self.model_path
+            loaded = model_manager.load_model()
+        if not loaded:
+            raise RuntimeError(f"Не удалось загрузить модель: {self.model_path}")
+        transcriber = SegmentedTranscriber(model_manager, self.workers, self.sample_rate, self.chunk,
+                                           self.segment_seconds)
+        for path in files:
+            try:
+                record = transcriber.compare(path) if self.compare else transcriber.transcribe(path)
+                record['error'] = None
+            except Exception as e:
+                record = {'file': path, 'text': '', 'duration': 0.0, 'error': str(e)}
+            yield record
+    def run_to_jsonl(self, inputs, output):
+        summary = {'files': 0, 'errors': 0, 'audio_seconds': 0.0, 'wall_seconds': 0.0}
+        started = time.perf_counter()
+        for record in self.run(inputs):
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            output.flush()
+            summary['files'] += 1
+            summary['audio_seconds'] += record['duration']
+            if record['error']:
+                summary['errors'] += 1
+            if record.get('speedup'):
+                summary.setdefault('speedups', []).append(record['speedup'])
+        summary['wall_seconds'] = time.perf_counter() - started
+        if summary['audio_seconds'] > 0:
+            summary['rtf'] = summary['wall_seconds'] / summary['audio_seconds']
+        return summary
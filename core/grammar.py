@@ -0,0 +1,32 @@
+import os
+import json
+class PhraseGrammar:
+    UNKNOWN = "[unk]"
+    def __init__(self, phrases, name=None, allow_unknown=True):
+        seen = set()
+        self.phrases = []
+        for phrase in phrases:
+            phrase = " ".join(phrase.lower().split())
+            if phrase and phrase not in seen and phrase != self.UNKNOWN:
+                seen.add(phrase)
+                self.phrases.append(phrase)
+        if not self.phrases:
+            raise ValueError("Список фраз пуст")
+        self.name = name or f"{len(self.phrases)} фраз"
+        self.allow_unknown = allow_unknown
+    @classmethod
+    def from_file(cls, path, allow_unknown=True):
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        if path.lower().endswith(".json"):
+            phrases = json.loads(content)
+            if not isinstance(phrases, list):
+                raise ValueError("Ожидается JSON-массив фраз")
+        else:
+            phrases = [line for line in content.splitlines() if not line.lstrip().startswith("#")]
+        return cls(phrases, name=os.path.basename(path), allow_unknown=allow_unknown)
+    def to_json(self):
+        phrases = self.phrases + [self.UNKNOWN] if self.allow_unknown else self.phrases
+        return json.dumps(phrases, ensure_ascii=False)
+    def __len__(self):
+        return len(self.phrases)
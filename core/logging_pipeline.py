@@ -0,0 +1,142 @@
+import os
+import sys
+import json
+import time
+import queue
+import logging
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+ROOT_LOGGER = "stt"
+LOG_DIR = os.path.join(os.path.expanduser("~"), ".speech_to_text_app", "logs")
+LEVELS = {'DEBUG': logging.DEBUG, 'INFO': logging.INFO, 'WARNING': logging.WARNING, 'ERROR': logging.ERROR}
+def get_logger(category, source=None):
+    return logging.LoggerAdapter(logging.getLogger(f"{ROOT_LOGGER}.{category}"),
+                                 {'source': f"{source} " if source else ""})
+class RateLimitFilter(logging.Filter):
+    def __init__(self, rate=20.0, burst=40, rates=None, bypass_level=logging.ERROR, attribute='suppressed'):
+        super().__init__()
+        self.default = (rate, burst)
+        self.rates = rates or {}
+        self.bypass_level = bypass_level
+        self.attribute = attribute
+        self.buckets = {}
+        self.suppressed_total = 0
+        self.lock = threading.Lock()
+    def _limit(self, name):
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition('.')[0]
+        return self.default
+    def filter(self, record):
+        if record.levelno >= self.bypass_level:
+            return True
+        limit = self._limit(record.name)
+        if limit is None:
+            return True
+        rate, burst = limit
+        now = time.monotonic()
+        with self.lock:
+            bucket = self.buckets.get(record.name)
+            if bucket is None:
+                bucket = self.buckets[record.name] = [burst, now, 0]
+            tokens = min(burst, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+            if tokens < 1:
+                bucket[0] = tokens
+                bucket[2] += 1
+                self.suppressed_total += 1
+                return False
+            bucket[0] = tokens - 1
+            suppressed, bucket[2] = bucket[2], 0
+        if suppressed:
+            setattr(record, self.attribute, suppressed)
+        return True
+class DeferredQueueHandler(QueueHandler):
+    def prepare(self, record):
+        if not hasattr(record, 'source'):
+            record.source = ""
+        return record
+class JsonLinesFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'time': round(record.created, 3),
+            'level': record.levelname,
+            'category': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage(),
+        }
+        if record.source:
+            entry['source'] = record.source.strip()
+        if getattr(record, 'suppressed', 0):
+            entry['suppressed'] = record.suppressed
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+class TextFormatter(logging.Formatter):
+    def __init__(self, attribute='suppressed', timestamps=True):
+        super().__init__("%(asctime)s %(levelname)s %(name)s: %(source)s%(message)s" if timestamps
+                         else "%(source)s%(message)s", datefmt="%H:%M:%S")
+        self.attribute = attribute
+    def format(self, record):
+        text = super().format(record)
+        suppressed = getattr(record, self.attribute, 0)
+        if suppressed:
+            text += f" (пропущено похожих: {suppressed})"
+        return text
+class CallbackHandler(logging.Handler):
+    def __init__(self, callback, level=logging.INFO):
+        super().__init__(level)
+        self.callback = callback
+    def emit(self, record):
+        try:
+            self.callback(self.format(record))
+        except Exception:
+            self.handleError(record)
+class LogPipeline:
+    def __init__(self, level=logging.INFO, log_file=None, console=False, rate=20.0, burst=40, rates=None):
+        self.logger = logging.getLogger(ROOT_LOGGER)
+        self.level = level
+        self.log_file = log_file
+        self.queue = queue.SimpleQueue()
+        self.queue_handler = DeferredQueueHandler(self.queue)
+        self.rate_limit = RateLimitFilter(rate, burst, rates)
+        self.queue_handler.addFilter(self.rate_limit)
+        handlers = []
+        if log_file:
+            file_handler = RotatingFileHandler(log_file, maxBytes=5 * 1024 ** 2, backupCount=3,
+                                               encoding='utf-8', delay=True)
+            file_handler.setFormatter(JsonLinesFormatter())
+            handlers.append(file_handler)
+        if console:
+            console_handler = logging.StreamHandler(sys.stderr)
+            console_handler.setFormatter(TextFormatter())
+            handlers.append(console_handler)
+        self.listener = QueueListener(self.queue, *handlers, respect_handler_level=True)
+        self.started = False
+    def add_handler(self, handler):
+        self.listener.handlers = self.listener.handlers + (handler,)
+        return handler
+    def set_level(self, level):
+        self.level = level
+        self.logger.setLevel(level)
+    def start(self):
+        if self.started:
+            return self
+        if self.log_file:
+            os.makedirs(os.path.dirname(self.log_file) or ".", exist_ok=True)
+        self.logger.addHandler(self.queue_handler)
+        self.logger.setLevel(self.level)
+        self.logger.propagate = False
+        self.listener.start()
+        self.started = True
+        return self
+    def stop(self):
+        if not self.started:
+            return
+        self.logger.removeHandler(self.queue_handler)
+        self.logger.propagate = True
+        self.listener.stop()
+        for handler in self.listener.handlers:
+            handler.close()
+        self.started = False
@@ -0,0 +1,143 @@
+import os
+import json
+import time
+import bisect
+import threading
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+class Counter:
+    kind = 'counter'
+    def __init__(self):
+        self.value = 0
+    def inc(self, amount=1):
+        self.value += amount
+    def snapshot(self):
+        return self.value
+class Gauge:
+    kind = 'gauge'
+    def __init__(self):
+        self.value = 0
+    def set(self, value):
+        self.value = value
+    def snapshot(self):
+        return self.value
+class Histogram:
+    kind = 'histogram'
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+    def quantile(self, q):
+        counts = list(self.counts)
+        total = sum(counts)
+        if not total:
+            return None
+        rank = q * total
+        seen = 0
+        for index, count in enumerate(counts):
+            seen += count
+            if seen >= rank:
+                return self.buckets[index] if index < len(self.buckets) else float('inf')
+        return float('inf')
+    def snapshot(self):
+        cumulative, seen = [], 0
+        for count in list(self.counts):
+            seen += count
+            cumulative.append(seen)
+        snapshot = {'count': seen, 'sum': self.sum,
+                    'buckets': dict(zip([*map(str, self.buckets), '+Inf'], cumulative))}
+        snapshot['p50'] = self.quantile(0.5)
+        snapshot['p95'] = self.quantile(0.95)
+        return snapshot
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics = {}
+        self.help = {}
+        self.lock = threading.Lock()
+    def _get(self, cls, name, help_text, labels, **kwargs):
+        key = (name, tuple(sorted(labels.items())))
+        metric = self.metrics.get(key)
+        if metric is None:
+            with self.lock:
+                metric = self.metrics.get(key)
+                if metric is None:
+                    metric = self.metrics[key] = cls(**kwargs)
+                    self.help.setdefault(name, (cls.kind, help_text))
+        return metric
+    def counter(self, name, help_text="", **labels):
+        return self._get(Counter, name, help_text, labels)
+    def gauge(self, name, help_text="", **labels):
+        return self._get(Gauge, name, help_text, labels)
+    def histogram(self, name, help_text="", buckets=DEFAULT_BUCKETS, **labels):
+        return self._get(Histogram, name, help_text, labels, buckets=buckets)
+    def value(self, name, default=0, **labels):
+        metric = self.metrics.get((name, tuple(sorted(labels.items()))))
+        return metric.snapshot() if metric is not None else default
+    def _family(self, name):
+        with self.lock:
+            return [metric for (metric_name, _), metric in self.metrics.items() if metric_name == name]
+    def total(self, name):
+        return sum(metric.snapshot() for metric in self._family(name) if metric.kind != 'histogram')
+    def quantile(self, name, q):
+        histograms = [metric for metric in self._family(name) if metric.kind == 'histogram']
+        if not histograms:
+            return None
+        merged = Histogram(histograms[0].buckets)
+        for histogram in histograms:
+            merged.counts = [a + b for a, b in zip(merged.counts, list(histogram.counts))]
+        return merged.quantile(q)
+    def reset(self):
+        with self.lock:
+            self.metrics.clear()
+            self.help.clear()
+    def snapshot(self):
+        with self.lock:
+            items = sorted(self.metrics.items(), key=lambda item: item[0])
+        metrics = {}
+        for (name, labels), metric in items:
+            metrics.setdefault(name, []).append({'labels': dict(labels), 'value': metric.snapshot()})
+        return {'timestamp': time.time(), 'metrics': metrics}
+    def to_prometheus(self):
+        with self.lock:
+            items = sorted(self.metrics.items(), key=lambda item: item[0])
+            help_texts = dict(self.help)
+        lines = []
+        described = set()
+        for (name, labels), metric in items:
+            if name not in described:
+                kind, help_text = help_texts[name]
+                if help_text:
+                    lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                described.add(name)
+            if metric.kind != 'histogram':
+                lines.append(f"{name}{self._format_labels(labels)} {metric.snapshot()}")
+                continue
+            snapshot = metric.snapshot()
+            for bound, count in snapshot['buckets'].items():
+                lines.append(f"{name}_bucket{self._format_labels(labels + (('le', bound),))} {count}")
+            lines.append(f"{name}_sum{self._format_labels(labels)} {snapshot['sum']}")
+            lines.append(f"{name}_count{self._format_labels(labels)} {snapshot['count']}")
+        return "\n".join(lines) + "\n"
+    @staticmethod
+    def _format_labels(labels):
+        if not labels:
+            return ""
+        escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+                   for _, value in labels)
+        return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(labels, escaped)) + "}"
+    def export(self, path):
+        if path.lower().endswith(".json"):
+            content = json.dumps(self.snapshot(), ensure_ascii=False, indent=2)
+        else:
+            content = self.to_prometheus()
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(temp_path, path)
+        return path
+registry = MetricsRegistry()
@@ -1,16 +1,27 @@
 import os
+import time
+import threading
+from .model_registry import ModelPool
+from .startup_profile import lazy_import
 class ModelManager:
-    def __init__(self):
+    def __init__(self, registry=None, pool=None):
         self.model_path = None
         self.model = None
+        self.fallback_model_path = None
         self.Model = None
         self.KaldiRecognizer = None
-        self.init_vosk()
+        self.registry = registry
+        self.pool = pool or ModelPool()
+        self.load_lock = threading.Lock()
+        self.last_load_seconds = None
+        self.last_load_cached = False
+        self.vosk_checked = False
     def init_vosk(self):
+        self.vosk_checked = True
         try:
-            from vosk import Model, KaldiRecognizer
-            self.Model = Model
-            self.KaldiRecognizer = KaldiRecognizer
+            vosk = lazy_import('vosk')
+            self.Model = vosk.Model
+            self.KaldiRecognizer = vosk.KaldiRecognizer
             print("Vosk библиотека загружена успешно")
             return True
         except ImportError as e:
@@ -20,8 +31,15 @@ class ModelManager:
             print(f"Ошибка загрузки Vosk: {e}")
             return False
     def is_vosk_available(self):
+        if not self.vosk_checked:
+            self.init_vosk()
         return self.Model is not None and self.KaldiRecognizer is not None
     def validate_model_path(self, path):
+        is_valid, message = self._check_model_path(path)
+        if self.registry is not None and path and os.path.isdir(path):
+            self.registry.record_validation(path, is_valid, message)
+        return is_valid, message
+    def _check_model_path(self, path):
         if not path or not os.path.exists(path):
             return False, "Путь не существует"
         if not os.path.isdir(path):
@@ -44,14 +62,45 @@ class ModelManager:
     def load_model(self):
         if not self.is_vosk_available() or not self.model_path:
             return False
-        
-        try:
-            self.model = self.Model(self.model_path)
+        with self.load_lock:
+            model_path = self.model_path
+            started = time.perf_counter()
+            model = self.pool.get(model_path)
+            self.last_load_cached = model is not None
+            try:
+                if model is None:
+                    model = self.Model(model_path)
+                    size = self.registry.get_size(model_path) if self.registry is not None else 0
+                    self.pool.put(model_path, model, size)
+            except Exception as e:
+                print(f"Ошибка загрузки модели: {e}")
+                self.model = None
+                return False
+            self.model = model
+            self.last_load_seconds = time.perf_counter() - started
+            if self.registry is not None:
+                self.registry.record_load(model_path, self.last_load_seconds)
             return self.model is not None
-        except Exception as e:
-            print(f"Ошибка загрузки модели: {e}")
-            self.model = None
-            return False
+    def load_fallback_model(self):
+        if not self.fallback_model_path or not self.is_vosk_available():
+            return None
+        model = self.pool.get(self.fallback_model_path)
+        if model is None:
+            try:
+                model = self.Model(self.fallback_model_path)
+            except Exception as e:
+                print(f"Ошибка загрузки запасной модели: {e}")
+                return None
+            size = self.registry.get_size(self.fallback_model_path) if self.registry is not None else 0
+            self.pool.put(self.fallback_model_path, model, size)
+        return model
+    def get_preload_path(self):
+        if self.registry is None:
+            return None
+        path = self.registry.get_last_used()
+        if path and self.registry.is_unchanged(path):
+            return path
+        return None
     def is_model_loaded(self):
         return self.model is not None
     def get_model_name(self):
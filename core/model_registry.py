@@ -0,0 +1,101 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+REGISTRY_PATH = os.path.join(os.path.expanduser("~"), ".speech_to_text_app", "models.json")
+class ModelRegistry:
+    def __init__(self, path=REGISTRY_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.data = {'last_used': None, 'models': {}}
+        self.load()
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict) and isinstance(data.get('models'), dict):
+                self.data = data
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Ошибка чтения реестра моделей: {e}")
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Ошибка записи реестра моделей: {e}")
+    @staticmethod
+    def fingerprint(path):
+        digest = hashlib.sha1()
+        total_size = 0
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                file_path = os.path.join(root, name)
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    continue
+                total_size += stat.st_size
+                digest.update(f"{os.path.relpath(file_path, path)}:{stat.st_size}:{stat.st_mtime_ns}".encode('utf-8'))
+        return digest.hexdigest(), total_size
+    def _entry(self, path):
+        return self.data['models'].setdefault(os.path.abspath(path), {})
+    def record_validation(self, path, is_valid, message):
+        fingerprint, size = self.fingerprint(path) if is_valid else (None, 0)
+        with self.lock:
+            self._entry(path).update({'valid': is_valid, 'message': message, 'fingerprint': fingerprint,
+                                      'size': size, 'validated_at': time.time()})
+            self.save()
+    def record_load(self, path, seconds):
+        with self.lock:
+            self._entry(path).update({'load_seconds': seconds, 'loaded_at': time.time()})
+            self.data['last_used'] = os.path.abspath(path)
+            self.save()
+    def get(self, path):
+        return self.data['models'].get(os.path.abspath(path))
+    def get_size(self, path):
+        entry = self.get(path)
+        return entry.get('size', 0) if entry else 0
+    def get_last_used(self):
+        return self.data.get('last_used')
+    def is_unchanged(self, path):
+        entry = self.get(path)
+        if not entry or not entry.get('valid') or not os.path.isdir(path):
+            return False
+        return entry.get('fingerprint') == self.fingerprint(path)[0]
+class ModelPool:
+    def __init__(self, max_models=2, memory_budget=None):
+        self.max_models = max_models
+        self.memory_budget = memory_budget
+        self.models = OrderedDict()
+        self.lock = threading.Lock()
+    def get(self, path):
+        key = os.path.abspath(path)
+        with self.lock:
+            if key not in self.models:
+                return None
+            self.models.move_to_end(key)
+            return self.models[key][0]
+    def put(self, path, model, size=0):
+        key = os.path.abspath(path)
+        with self.lock:
+            self.models[key] = (model, size)
+            self.models.move_to_end(key)
+            evicted = []
+            while len(self.models) > 1 and (len(self.models) > self.max_models or self._over_budget()):
+                evicted.append(self.models.popitem(last=False)[0])
+            return evicted
+    def _over_budget(self):
+        if not self.memory_budget:
+            return False
+        return sum(size for _, size in self.models.values()) > self.memory_budget
+    def resident_paths(self):
+        with self.lock:
+            return list(self.models)
@@ -0,0 +1,110 @@
+import threading
+from .audio_manager import AudioManager
+from .recording_manager import RecordingManager
+from .ring_buffer import AudioRingBuffer
+from .watchdog import RecognitionWatchdog
+class DeviceSession:
+    def __init__(self, device, model_manager, message_queue_func, slots=10,
+                 policy=AudioRingBuffer.POLICY_DROP_OLDEST, audio_settings=None, watchdog=False):
+        self.device = device
+        self.label = f"[{device['name']}]"
+        self.audio_manager = AudioManager(input_device_index=device['index'])
+        for name, value in (audio_settings or {}).items():
+            setattr(self.audio_manager, name, value)
+        self.recording_manager = RecordingManager(self.audio_manager, model_manager)
+        self.recording_manager.metric_labels = {'source': device['name']}
+        self.recording_manager.log_source = self.label
+        if watchdog:
+            self.recording_manager.watchdog = RecognitionWatchdog()
+        self.audio_queue = AudioRingBuffer(slots=slots, slot_size=self.audio_manager.chunk_bytes, policy=policy)
+        self.stop_flags = {
+            'recording': threading.Event(),
+            'processing': threading.Event()
+        }
+        self.message_queue_func = message_queue_func
+        self.listeners = {}
+    def queue_message(self, msg_type, title="", message="", **kwargs):
+        if msg_type in ("log", "text"):
+            message = f"{self.label} {message}"
+        if msg_type in ("text", "partial"):
+            kwargs['source'] = self.label
+        self.message_queue_func(msg_type, title, message, **kwargs)
+    def add_result_listener(self, listener, partials=True):
+        def labeled(kind, text, result):
+            listener(kind, text, result, source=self.label)
+        self.listeners[listener] = labeled
+        self.recording_manager.add_result_listener(labeled, partials=partials)
+    def remove_result_listener(self, listener):
+        labeled = self.listeners.pop(listener, None)
+        if labeled is not None:
+            self.recording_manager.remove_result_listener(labeled)
+    def begin(self):
+        self.recording_manager.begin_session()
+        self.audio_queue.clear()
+        for flag in self.stop_flags.values():
+            flag.clear()
+    def stop(self, drain=True):
+        self.stop_flags['recording'].set()
+        if not drain:
+            self.stop_flags['processing'].set()
+    def record(self):
+        return self.recording_manager.record_audio(self.audio_queue, self.stop_flags['recording'],
+                                                   self.queue_message)
+    def process(self):
+        return self.recording_manager.process_audio(self.audio_queue, self.stop_flags['processing'],
+                                                    self.queue_message)
+    def get_metrics(self):
+        return {
+            'device': self.device['name'],
+            'index': self.device['index'],
+            'dropped_chunks': self.recording_manager.dropped_chunks,
+            'callback': dict(self.audio_manager.callback_stats),
+            'ring_buffer': self.audio_queue.get_stats(),
+            'partials': dict(self.recording_manager.partial_policy.stats),
+            'words': len(self.recording_manager.session_words),
+        }
+class MultiDeviceRecorder:
+    THREADS_PER_DEVICE = 2
+    def __init__(self, devices, model_manager, message_queue_func, slots=10,
+                 policy=AudioRingBuffer.POLICY_DROP_OLDEST, audio_settings=None, watchdog=False):
+        self.sessions = [DeviceSession(device, model_manager, message_queue_func, slots, policy, audio_settings,
+                                       watchdog)
+                         for device in devices]
+        self.lock = threading.Lock()
+        self.active = 0
+        self.on_finished = None
+    @classmethod
+    def worker_count(cls, device_count):
+        return cls.THREADS_PER_DEVICE * max(1, device_count)
+    def add_result_listener(self, listener, partials=True):
+        for session in self.sessions:
+            session.add_result_listener(listener, partials=partials)
+    def remove_result_listener(self, listener):
+        for session in self.sessions:
+            session.remove_result_listener(listener)
+    def start(self, executor, on_finished=None):
+        self.on_finished = on_finished
+        self.active = len(self.sessions)
+        futures = []
+        for session in self.sessions:
+            session.begin()
+            futures.append(executor.submit(session.record))
+            futures.append(executor.submit(self._process_worker, session))
+        return futures
+    def _process_worker(self, session):
+        try:
+            return session.process()
+        finally:
+            with self.lock:
+                self.active -= 1
+                finished = self.active == 0
+            if finished and self.on_finished:
+                self.on_finished()
+    def stop(self, drain=True):
+        for session in self.sessions:
+            session.stop(drain)
+    def set_grammar(self, grammar):
+        for session in self.sessions:
+            session.audio_manager.set_grammar(grammar)
+    def get_metrics(self):
+        return {session.label: session.get_metrics() for session in self.sessions}
@@ -0,0 +1,35 @@
+import os
+class PartialResultPolicy:
+    def __init__(self, min_interval=0.2, diff=True, enabled=True):
+        self.min_interval = min_interval
+        self.diff = diff
+        self.enabled = enabled
+        self.last_text = ""
+        self.last_emit_time = 0.0
+        self.stats = {'polls': 0, 'skipped_polls': 0, 'unchanged': 0, 'throttled': 0,
+                      'emitted': 0, 'chars_sent': 0, 'chars_saved': 0}
+    def should_poll(self, has_consumers):
+        if not self.enabled or not has_consumers:
+            self.stats['skipped_polls'] += 1
+            return False
+        self.stats['polls'] += 1
+        return True
+    def update(self, text, now):
+        if text == self.last_text:
+            self.stats['unchanged'] += 1
+            return None
+        if now - self.last_emit_time < self.min_interval:
+            self.stats['throttled'] += 1
+            return None
+        prefix = len(os.path.commonprefix((self.last_text, text))) if self.diff else 0
+        self.last_text = text
+        self.last_emit_time = now
+        self.stats['emitted'] += 1
+        self.stats['chars_sent'] += len(text) - prefix
+        self.stats['chars_saved'] += prefix
+        return prefix, text[prefix:]
+    def reset(self):
+        self.last_text = ""
+    @property
+    def is_active(self):
+        return bool(self.last_text)
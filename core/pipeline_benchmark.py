@@ -0,0 +1,162 @@
+import time
+import queue
+import threading
+from .audio_manager import AudioManager
+from .audio_sources import create_audio_source
+from .recording_manager import RecordingManager
+from .ring_buffer import AudioRingBuffer
+from utils.helpers import Utils
+class TimedQueue(queue.Queue):
+    def __init__(self, maxsize=0):
+        super().__init__(maxsize)
+        self.wait_times = []
+        self.last_put_time = None
+    def _put(self, item):
+        super()._put((time.perf_counter(), item))
+    def _get(self):
+        put_time, item = super()._get()
+        self.wait_times.append(time.perf_counter() - put_time)
+        self.last_put_time = put_time
+        return item
+class TimedRecognizer:
+    def __init__(self, recognizer):
+        self.recognizer = recognizer
+        self.accept_times = []
+    def AcceptWaveform(self, data):
+        started = time.perf_counter()
+        accepted = self.recognizer.AcceptWaveform(data)
+        self.accept_times.append(time.perf_counter() - started)
+        return accepted
+    def __getattr__(self, name):
+        return getattr(self.recognizer, name)
+class BenchmarkAudioManager(AudioManager):
+    def __init__(self):
+        super().__init__()
+        self.accept_times = []
+    def create_recognizer(self, model, rate=None):
+        if not super().create_recognizer(model, rate):
+            return False
+        self.recognizer = TimedRecognizer(self.recognizer)
+        self.accept_times = self.recognizer.accept_times
+        return True
+class UIQueueProbe:
+    def __init__(self, interval=0.1):
+        self.interval = interval
+        self.ui_queue = queue.Queue()
+        self.wait_times = []
+        self.stop_flag = threading.Event()
+        self.thread = None
+    def queue_message(self, msg_type, title="", message="", **kwargs):
+        self.ui_queue.put((time.perf_counter(), msg_type))
+    def start(self):
+        self.thread = threading.Thread(target=self._drain, daemon=True)
+        self.thread.start()
+    def stop(self):
+        self.stop_flag.set()
+        self.thread.join()
+    def _drain(self):
+        while True:
+            stopping = self.stop_flag.wait(self.interval)
+            now = time.perf_counter()
+            try:
+                while True:
+                    put_time, _ = self.ui_queue.get_nowait()
+                    self.wait_times.append(now - put_time)
+            except queue.Empty:
+                pass
+            if stopping:
+                break
+class PipelineBenchmark:
+    def __init__(self, model_manager, audio_spec, paced=False, ui_interval=0.1, adaptive=False, vad=False,
+                 policy=AudioRingBuffer.POLICY_DROP_OLDEST, words=False,
+                 partial_interval=0.2, partials=True, grammar=None, reference=None):
+        self.model_manager = model_manager
+        self.audio_spec = audio_spec
+        self.paced = paced
+        self.ui_interval = ui_interval
+        self.adaptive = adaptive
+        self.vad = vad
+        self.policy = policy
+        self.words = words
+        self.partial_interval = partial_interval
+        self.partials = partials
+        self.grammar = grammar
+        self.reference = reference
+        self.last_latencies = None
+    def run(self, chunk, queue_size):
+        audio_manager = BenchmarkAudioManager()
+        audio_manager.chunk = chunk
+        audio_manager.adaptive_chunk = self.adaptive
+        audio_manager.word_timings = self.words
+        audio_manager.set_grammar(self.grammar)
+        recording_manager = RecordingManager(audio_manager, self.model_manager)
+        recording_manager.vad_enabled = self.vad
+        recording_manager.partial_min_interval = self.partial_interval
+        recording_manager.partials_enabled = self.partials
+        if self.policy == 'queue':
+            audio_queue = TimedQueue(queue_size)
+        else:
+            audio_queue = AudioRingBuffer(queue_size, chunk * 2, self.policy, track_timing=True)
+        probe = UIQueueProbe(self.ui_interval)
+        latencies = {'partial': [], 'final': []}
+        finals = []
+        def on_result(kind, text, result):
+            if audio_queue.last_put_time is not None:
+                latencies[kind].append(time.perf_counter() - audio_queue.last_put_time)
+            if kind == 'final':
+                finals.append(text)
+        recording_manager.add_result_listener(on_result, partials=self.partials)
+        source = create_audio_source(self.audio_spec, chunk, paced=self.paced)
+        stop_flags = {'recording': threading.Event(), 'processing': threading.Event()}
+        recording_manager.begin_session()
+        probe.start()
+        started = time.perf_counter()
+        recording_thread = threading.Thread(target=recording_manager.record_audio,
+                                            args=(audio_queue, stop_flags['recording'],
+                                                  probe.queue_message, source))
+        processing_thread = threading.Thread(target=recording_manager.process_audio,
+                                             args=(audio_queue, stop_flags['processing'],
+                                                   probe.queue_message))
+        recording_thread.start()
+        processing_thread.start()
+        recording_thread.join()
+        processing_thread.join()
+        wall = time.perf_counter() - started
+        probe.stop()
+        self.last_latencies = latencies
+        accept_times = audio_manager.accept_times
+        report = {
+            'audio': self.audio_spec,
+            'paced': self.paced,
+            'chunk': chunk,
+            'queue_size': queue_size,
+            'policy': self.policy,
+            'vocabulary': self.grammar.name if self.grammar else 'open',
+            'audio_seconds': source.duration,
+            'wall_seconds': wall,
+            'rtf': wall / source.duration if source.duration else None,
+            'decode_rtf': sum(accept_times) / source.duration if source.duration else None,
+            'dropped_chunks': recording_manager.dropped_chunks,
+            'accept_waveform': Utils.summarize(accept_times),
+            'partial_latency': Utils.summarize(latencies['partial']),
+            'final_latency': Utils.summarize(latencies['final']),
+            'audio_queue_wait': Utils.summarize(audio_queue.wait_times),
+            'ui_queue_wait': Utils.summarize(probe.wait_times),
+            'result_parse': Utils.summarize(list(recording_manager.parse_times)),
+            'words': len(recording_manager.session_words),
+            'partials': dict(recording_manager.partial_policy.stats),
+        }
+        report['text'] = " ".join(finals)
+        if self.reference is not None:
+            report['accuracy'] = Utils.word_error_rate(self.reference, report['text'])
+        if isinstance(audio_queue, AudioRingBuffer):
+            report['ring_buffer'] = audio_queue.get_stats()
+        if recording_manager.adaptive_chunks:
+            report['adaptive'] = recording_manager.adaptive_chunks.get_metrics()
+        if recording_manager.vad:
+            report['vad'] = recording_manager.vad.get_stats()
+        return report
+    def sweep(self, chunks, queue_sizes):
+        for chunk in chunks:
+            for queue_size in queue_sizes:
+                yield self.run(chunk, queue_size)
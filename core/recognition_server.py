@@ -0,0 +1,124 @@
+import os
+import json
+import select
+import socket
+import socketserver
+import threading
+class RecognitionSession(socketserver.BaseRequestHandler):
+    def setup(self):
+        self.pending = b""
+        self.last_partial = ""
+        self.received = 0
+    def handle(self):
+        server = self.server
+        if not server.acquire_session():
+            server.count('rejected')
+            self._send({'type': 'error', 'message': "Сервер занят: достигнут лимит сессий"})
+            return
+        try:
+            self._serve()
+        except (ConnectionError, OSError) as e:
+            print(f"Сессия {self.client_address} прервана: {e}")
+        finally:
+            server.count('bytes', self.received)
+            server.release_session()
+    def _serve(self):
+        server = self.server
+        recognizer = server.create_recognizer()
+        self._send({'type': 'ready', 'rate': server.sample_rate})
+        while True:
+            if not self._wait_for_data():
+                server.count('timed_out')
+                self._send({'type': 'error',
+                            'message': f"Нет данных {server.idle_timeout:g} сек: сессия закрыта"})
+                return
+            data = self.request.recv(server.read_size)
+            if not data:
+                break
+            data = self.pending + data
+            if len(data) % 2:
+                self.pending, data = data[-1:], data[:-1]
+            else:
+                self.pending = b""
+            self.received += len(data)
+            if recognizer.AcceptWaveform(data):
+                self._send_result('final', recognizer.Result())
+                self.last_partial = ""
+            elif server.partials:
+                partial = json.loads(recognizer.PartialResult()).get("partial", "")
+                if partial and partial != self.last_partial:
+                    self.last_partial = partial
+                    self._send({'type': 'partial', 'text': partial})
+        self._send_result('final', recognizer.FinalResult(), eof=True)
+    def _wait_for_data(self):
+        if self.server.idle_timeout <= 0:
+            return True
+        readable, _, _ = select.select([self.request], [], [], self.server.idle_timeout)
+        return bool(readable)
+    def _send_result(self, result_type, raw_result, eof=False):
+        result = json.loads(raw_result)
+        message = {'type': result_type, 'text': result.get("text", "")}
+        if 'result' in result:
+            message['words'] = result['result']
+        if eof:
+            message['eof'] = True
+        self._send(message)
+    def _send(self, message):
+        self.request.sendall((json.dumps(message, ensure_ascii=False) + "\n").encode('utf-8'))
+class RecognitionServerMixin:
+    daemon_threads = True
+    allow_reuse_address = True
+    def init_recognition(self, model_manager, sample_rate=16000, max_sessions=16,
+                         session_wait=0.0, idle_timeout=30.0, read_size=8192, recv_buffer=65536, partials=True):
+        self.model_manager = model_manager
+        self.sample_rate = sample_rate
+        self.max_sessions = max_sessions
+        self.session_wait = session_wait
+        self.idle_timeout = idle_timeout
+        self.read_size = read_size
+        self.recv_buffer = recv_buffer
+        self.partials = partials
+        self.session_slots = threading.BoundedSemaphore(max_sessions)
+        self.stats_lock = threading.Lock()
+        self.stats = {'active': 0, 'total': 0, 'rejected': 0, 'timed_out': 0, 'bytes': 0}
+    def get_request(self):
+        request, client_address = super().get_request()
+        try:
+            request.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.recv_buffer)
+        except OSError:
+            pass
+        return request, client_address
+    def acquire_session(self):
+        acquired = self.session_slots.acquire(timeout=self.session_wait) if self.session_wait > 0 \
+            else self.session_slots.acquire(blocking=False)
+        if acquired:
+            with self.stats_lock:
+                self.stats['active'] += 1
+                self.stats['total'] += 1
+        return acquired
+    def count(self, name, value=1):
+        with self.stats_lock:
+            self.stats[name] += value
+    def release_session(self):
+        with self.stats_lock:
+            self.stats['active'] -= 1
+        self.session_slots.release()
+    def create_recognizer(self):
+        return self.model_manager.KaldiRecognizer(self.model_manager.model, self.sample_rate)
+class TCPRecognitionServer(RecognitionServerMixin, socketserver.ThreadingTCPServer):
+    def __init__(self, address, model_manager, **kwargs):
+        self.init_recognition(model_manager, **kwargs)
+        super().__init__(address, RecognitionSession)
+if hasattr(socketserver, 'ThreadingUnixStreamServer'):
+    class UnixRecognitionServer(RecognitionServerMixin, socketserver.ThreadingUnixStreamServer):
+        def __init__(self, address, model_manager, **kwargs):
+            self.init_recognition(model_manager, **kwargs)
+            super().__init__(address, RecognitionSession)
+        def server_close(self):
+            super().server_close()
+            try:
+                os.unlink(self.server_address)
+            except OSError:
+                pass
+else:
+    UnixRecognitionServer = None
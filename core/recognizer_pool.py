@@ -0,0 +1,53 @@
+import threading
+from collections import OrderedDict
+class RecognizerPool:
+    def __init__(self, max_idle=2, max_keys=8):
+        self.max_idle = max_idle
+        self.max_keys = max_keys
+        self.idle = OrderedDict()
+        self.lock = threading.Lock()
+        self.stats = {'created': 0, 'reused': 0, 'released': 0, 'discarded': 0}
+    @staticmethod
+    def make_key(model, rate, words=False, partial_words=False, grammar=None):
+        return model, int(rate), bool(words), bool(partial_words), grammar
+    def acquire(self, key, factory):
+        with self.lock:
+            recognizers = self.idle.get(key)
+            if recognizers:
+                self.idle.move_to_end(key)
+                self.stats['reused'] += 1
+                return recognizers.pop(), True
+            self.stats['created'] += 1
+        return factory(), False
+    def release(self, key, recognizer):
+        if recognizer is None:
+            return
+        if hasattr(recognizer, 'Reset'):
+            recognizer.Reset()
+        with self.lock:
+            for other in [other for other in self.idle if other[0] is not key[0]]:
+                self.stats['discarded'] += len(self.idle.pop(other))
+            recognizers = self.idle.setdefault(key, [])
+            self.idle.move_to_end(key)
+            if len(recognizers) < self.max_idle:
+                recognizers.append(recognizer)
+                self.stats['released'] += 1
+            else:
+                self.stats['discarded'] += 1
+            while len(self.idle) > self.max_keys:
+                self.stats['discarded'] += len(self.idle.popitem(last=False)[1])
+    def warm(self, key, factory, count=1):
+        created = 0
+        while self.idle_count(key) < min(count, self.max_idle):
+            recognizer = factory()
+            with self.lock:
+                self.stats['created'] += 1
+            self.release(key, recognizer)
+            created += 1
+        return created
+    def idle_count(self, key):
+        with self.lock:
+            return len(self.idle.get(key, ()))
+    def clear(self):
+        with self.lock:
+            self.idle.clear()
@@ -1,84 +1,479 @@
 import json
+import time
 import queue
-from datetime import time
+import threading
+from collections import deque
+from utils.helpers import Utils
+from .audio_sources import MicrophoneSource
+from .adaptive_chunk import AdaptiveChunkController
+from .vad import VoiceActivityDetector
+from .word_timings import WordTimings, RecognitionResult
+from .partial_policy import PartialResultPolicy
+from .metrics import registry
+from .sampling_profiler import SamplingProfiler
+from .logging_pipeline import get_logger
+from .watchdog import RecognitionWatchdog
+START_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
 class RecordingManager:
     def __init__(self, audio_manager, model_manager):
         self.audio_manager = audio_manager
         self.model_manager = model_manager
-        self.last_partial_text = ""
-        self.partial_text_counter = 0
-        self.max_partial_duplicates = 3
+        self.partials_enabled = True
+        self.partial_min_interval = 0.2
+        self.partial_diff = True
+        self.ui_partials = True
+        self.partial_policy = PartialResultPolicy(self.partial_min_interval, self.partial_diff)
+        self.capture_finished = threading.Event()
+        self.result_listeners = []
+        self.partial_listeners = []
+        self.dropped_chunks = 0
+        self.live_put_timeout = 0.1
+        self.drain_timeout = 2.0
+        self.capture_stop = None
+        self.drain_started = None
+        self.callback_capture = None
+        self.start_latency = None
+        self.adaptive_chunks = None
+        self.vad_enabled = False
+        self.vad_threshold_db = -40.0
+        self.vad_hangover_ms = 300
+        self.vad = None
+        self.parse_times = deque(maxlen=5000)
+        self.session_words = WordTimings()
+        self.metrics = registry
+        self.metric_labels = {}
+        self.profile_decode = False
+        self.profile_interval = 0.005
+        self.last_profile = None
+        self.log_source = None
+        self.watchdog = None
+        self.model_override = None
+        self.pending_model = None
+        self.fallback_wanted = False
+        self._bind_metrics()
+        self._bind_loggers()
+    def _bind_loggers(self):
+        self.capture_log = get_logger('capture', self.log_source)
+        self.decode_log = get_logger('decode', self.log_source)
+        self.results_log = get_logger('results', self.log_source)
+        self.stats_log = get_logger('stats', self.log_source)
+        self.watchdog_log = get_logger('watchdog', self.log_source)
+    def _bind_metrics(self):
+        metrics, labels = self.metrics, self.metric_labels
+        self.chunks_counter = metrics.counter('stt_audio_chunks_total', "Чанков аудио поставлено в очередь",
+                                              **labels)
+        self.dropped_counter = metrics.counter('stt_dropped_chunks_total',
+                                               "Чанков отброшено при полной очереди", **labels)
+        self.ring_dropped_gauge = metrics.gauge('stt_ring_buffer_dropped_chunks',
+                                                "Чанков вытеснено из кольцевого буфера за сессию", **labels)
+        self.queue_depth_gauge = metrics.gauge('stt_audio_queue_depth', "Чанков в audio_queue", **labels)
+        self.decode_histogram = metrics.histogram('stt_decode_seconds', "Время AcceptWaveform на чанк", **labels)
+        self.decoded_audio_counter = metrics.counter('stt_decoded_audio_seconds_total',
+                                                     "Секунд аудио передано распознавателю", **labels)
+        self.decode_busy_counter = metrics.counter('stt_decode_busy_seconds_total',
+                                                   "Секунд потока распознавания в AcceptWaveform", **labels)
+        self.final_counter = metrics.counter('stt_results_total', "Результатов распознавания",
+                                             kind='final', **labels)
+        self.partial_counter = metrics.counter('stt_results_total', "Результатов распознавания",
+                                               kind='partial', **labels)
+        self.start_histogram = metrics.histogram('stt_start_latency_seconds', "Время от нажатия до старта записи",
+                                                 buckets=START_BUCKETS, **labels)
+    def begin_session(self):
+        self.capture_finished.clear()
+        self.capture_stop = None
+        self.drain_started = None
+        self.dropped_chunks = 0
+        self.adaptive_chunks = None
+        self.vad = None
+        self.parse_times.clear()
+        self.session_words = WordTimings()
+        self.partial_policy = PartialResultPolicy(self.partial_min_interval, self.partial_diff,
+                                                  self.partials_enabled)
+        self._bind_metrics()
+        self._bind_loggers()
+        self.model_override = None
+        self.pending_model = None
+        self.fallback_wanted = False
+        if self.watchdog is not None:
+            self.watchdog.reset(self._watchdog_stages(), self.metric_labels)
+        self.reset_state()
     def reset_state(self):
-        self.last_partial_text = ""
-        self.partial_text_counter = 0
-    def record_audio(self, audio_queue, stop_flag, message_queue_func):
+        self.partial_policy.reset()
+    def record_audio(self, audio_queue, stop_flag, message_queue_func, audio_source=None):
+        started = time.perf_counter()
+        self.capture_stop = stop_flag
+        if audio_source is None and self.audio_manager.callback_mode:
+            return self.start_callback_capture(audio_queue, stop_flag, message_queue_func, started)
+        source = audio_source or MicrophoneSource(self.audio_manager)
         try:
-            message_queue_func("log", "", f"Создание распознавателя с частотой {self.audio_manager.rate}Hz")
-            success = self.audio_manager.create_recognizer(self.model_manager.model)
-            if not success:
-                raise Exception("Распознаватель не создан")
-            message_queue_func("log", "", "Распознаватель создан успешно")
-            message_queue_func("log", "", "Открытие аудиопотока...")
-            success = self.audio_manager.open_audio_stream()
+            self._prepare_recognizer(source.sample_rate)
+            self.capture_log.info("Открытие аудиопотока...")
+            success = source.open()
             if not success:
                 raise Exception("Не удалось открыть аудиопоток")
-            message_queue_func("log", "", "Аудиопоток запущен")
+            self.capture_log.info("Аудиопоток запущен")
+            if audio_source is None:
+                self._log_start(started)
+            if self.audio_manager.adaptive_chunk:
+                self.adaptive_chunks = AdaptiveChunkController(
+                    source.sample_rate, self.audio_manager.min_chunk, source.chunk_size)
+                self.capture_log.info("Адаптивный размер чанка: %d-%d фреймов",
+                                      self.audio_manager.min_chunk, source.chunk_size)
             while not stop_flag.is_set():
                 try:
-                    data = self.audio_manager.read_audio_chunk()
-                    if data and len(data) > 0:
-                        try:
-                            audio_queue.put_nowait(data)
-                        except queue.Full:
-                            time.sleep(0.01)
-                            continue
+                    frames = None
+                    if self.adaptive_chunks:
+                        frames = self.adaptive_chunks.next_chunk_size(audio_queue.qsize(), audio_queue.maxsize)
+                    data = source.read_chunk(frames)
+                    if data is None:
+                        if not source.is_active():
+                            break
+                        continue
+                    if len(data) > 0:
+                        self._enqueue_chunk(audio_queue, data, stop_flag, source.is_live)
                 except Exception as e:
                     if not stop_flag.is_set():
-                        message_queue_func("log", "", f"Ошибка чтения аудио: {e}")
+                        self.capture_log.warning("Ошибка чтения аудио: %s", e)
                     break
         except Exception as e:
-            message_queue_func("log", "", f"❌ Ошибка записи: {e}")
+            self.capture_log.error("❌ Ошибка записи: %s", e)
         finally:
+            source.close()
+            self.capture_finished.set()
+            self._log_capture_stats(audio_queue)
+            if self.adaptive_chunks:
+                metrics = self.adaptive_chunks.get_metrics()
+                self.stats_log.info("Размеры чанков: %s, задержка p95: %.3f сек", metrics['chunk_sizes'],
+                                    metrics['estimated_latency'].get('p95', 0))
+    def _prepare_recognizer(self, sample_rate):
+        self.capture_log.info("Создание распознавателя с частотой %dHz", sample_rate)
+        success = self.audio_manager.create_recognizer(self.current_model, sample_rate)
+        if not success:
+            raise Exception("Распознаватель не создан")
+        self.capture_log.info("Распознаватель создан успешно")
+        if self.vad_enabled:
+            self._create_vad(sample_rate)
+    def start_callback_capture(self, audio_queue, stop_flag, message_queue_func, started=None):
+        started = started or time.perf_counter()
+        self.capture_stop = stop_flag
+        def on_audio(data):
+            if stop_flag.is_set():
+                self.capture_finished.set()
+                return False
+            try:
+                audio_queue.put_nowait(data)
+                self.chunks_counter.inc()
+            except queue.Full:
+                self._count_drop()
+            self.queue_depth_gauge.set(audio_queue.qsize())
+            return True
+        try:
+            self._prepare_recognizer(self.audio_manager.rate)
+            self.capture_log.info("Открытие аудиопотока в режиме обратного вызова...")
+            if not self.audio_manager.open_audio_stream(on_audio):
+                raise Exception("Не удалось открыть аудиопоток")
+            self.callback_capture = audio_queue
+            self.capture_log.info("Аудиопоток запущен")
+            self._log_start(started)
+            return True
+        except Exception as e:
+            self.capture_log.error("❌ Ошибка записи: %s", e)
             self.audio_manager.cleanup()
-            message_queue_func("log", "", "Аудиопоток закрыт")
+            self.capture_finished.set()
+            return False
+    def stop_callback_capture(self, message_queue_func):
+        audio_queue, self.callback_capture = self.callback_capture, None
+        if audio_queue is None:
+            return
+        stats = dict(self.audio_manager.callback_stats)
+        self.audio_manager.cleanup()
+        self.capture_finished.set()
+        self._log_capture_stats(audio_queue)
+        self.stats_log.info("Обратных вызовов PortAudio: %d, переполнений входа %d, опустошений %d",
+                            stats['callbacks'], stats['input_overflow'], stats['input_underflow'])
+    def _log_start(self, started):
+        self.start_latency = time.perf_counter() - started
+        self.start_histogram.observe(self.start_latency)
+        audio_manager = self.audio_manager
+        recognizer = "из пула" if audio_manager.last_recognizer_reused else "новый"
+        stream = "возобновлён" if audio_manager.last_stream_resumed else "открыт"
+        self.capture_log.info("Старт записи за %.1f мс (распознаватель: %s, аудиопоток: %s)",
+                              self.start_latency * 1000, recognizer, stream)
+        description = audio_manager.describe_capture()
+        if description:
+            self.capture_log.info(description)
+    def _log_capture_stats(self, audio_queue):
+        self.capture_log.info("Аудиопоток закрыт")
+        if hasattr(audio_queue, 'get_stats'):
+            stats = audio_queue.get_stats()
+            self.stats_log.info("Буфер аудио (%s): записано %d, переполнений %d, отброшено старых %d, новых %d",
+                                stats['policy'], stats['written'], stats['overruns'],
+                                stats['dropped_oldest'], stats['dropped_newest'])
+        if self.dropped_chunks:
+            self.stats_log.warning("⚠ Отброшено чанков: %d", self.dropped_chunks)
+    def _create_vad(self, sample_rate):
+        if not VoiceActivityDetector.is_available():
+            self.capture_log.warning("⚠ VAD отключён: не установлен numpy")
+            return
+        self.vad = VoiceActivityDetector(sample_rate, threshold_db=self.vad_threshold_db,
+                                         hangover_ms=self.vad_hangover_ms)
+        self.capture_log.info("VAD включён: порог %s дБ, удержание %s мс",
+                              self.vad_threshold_db, self.vad_hangover_ms)
+    def _count_drop(self):
+        self.dropped_chunks += 1
+        self.dropped_counter.inc()
+    def _enqueue_chunk(self, audio_queue, data, stop_flag, is_live):
+        if is_live:
+            try:
+                audio_queue.put(data, timeout=self.live_put_timeout)
+                self.chunks_counter.inc()
+            except queue.Full:
+                self._count_drop()
+            self.queue_depth_gauge.set(audio_queue.qsize())
+            return
+        while not stop_flag.is_set():
+            if audio_queue.full():
+                time.sleep(0.005)
+                continue
+            audio_queue.put(data)
+            self.chunks_counter.inc()
+            self.queue_depth_gauge.set(audio_queue.qsize())
+            return
     def process_audio(self, audio_queue, stop_flag, message_queue_func):
+        profiler = SamplingProfiler(self.profile_interval).start() if self.profile_decode else None
+        try:
+            self._decode_loop(audio_queue, stop_flag, message_queue_func)
+        finally:
+            if profiler is not None:
+                self.last_profile = profiler.stop()
+            self.stop_callback_capture(message_queue_func)
+            self.audio_manager.release_recognizer()
+        if profiler is not None:
+            self._log_profile(profiler)
+        stats = self.partial_policy.stats
+        self.stats_log.info("Частичные результаты: запросов %d, пропущено %d, без изменений %d, "
+                            "отложено %d, отправлено %d", stats['polls'], stats['skipped_polls'],
+                            stats['unchanged'], stats['throttled'], stats['emitted'])
+        if self.parse_times:
+            parse = Utils.summarize(list(self.parse_times))
+            self.stats_log.info("Разбор результатов: %d, p50 %.0f мкс, p95 %.0f мкс, слов с таймингами: %d",
+                                parse['count'], parse['p50'] * 1e6, parse['p95'] * 1e6, len(self.session_words))
+        if self.watchdog is not None and self.watchdog.transitions:
+            transitions = self.watchdog.transitions
+            self.stats_log.info("Сторож нагрузки: упрощений %d, восстановлений %d, итоговая ступень %d из %d",
+                                sum(1 for t in transitions if t['degraded']),
+                                sum(1 for t in transitions if not t['degraded']),
+                                self.watchdog.level, len(self.watchdog.stages))
+        if self.vad:
+            stats = self.vad.get_stats()
+            self.stats_log.info("VAD: пропущено %.1f из %.1f сек (%.0f%%), фраз: %d", stats['dropped_seconds'],
+                                stats['total_seconds'], stats['dropped_ratio'] * 100, stats['utterances'])
+    def _log_profile(self, profiler):
+        report = profiler.report(limit=5)
+        self.stats_log.info("Профиль потока распознавания: %d выборок за %.1f сек",
+                            report['samples'], report['seconds'])
+        for entry in report['top']:
+            self.stats_log.info("  %.0f%% %s", entry['share'] * 100, entry['function'])
+    def _decode_loop(self, audio_queue, stop_flag, message_queue_func):
+        is_ring = hasattr(audio_queue, 'stats')
         while not stop_flag.is_set():
             try:
                 data = audio_queue.get(timeout=0.1)
+                self.queue_depth_gauge.set(audio_queue.qsize())
+                if is_ring:
+                    stats = audio_queue.stats
+                    self.ring_dropped_gauge.set(stats['dropped_oldest'] + stats['dropped_newest'])
                 if self.audio_manager.recognizer and data:
-                    result_accepted = self.audio_manager.recognizer.AcceptWaveform(data)
-                    if result_accepted:
-                        result = json.loads(self.audio_manager.recognizer.Result())
-                        text = result.get("text", "").strip()
-                        if text:
-                            message_queue_func("log", "", f"РАСПОЗНАНО: '{text}'")
-                            message_queue_func("text", "", text)
-                            self.reset_state()
-                        else:
-                            message_queue_func("log", "", "Получен пустой результат")
-                    else:
-                        partial_result = json.loads(self.audio_manager.recognizer.PartialResult())
-                        partial_text = partial_result.get("partial", "").strip()
-                        
-                        if partial_text:
-                            should_log, log_message = self._should_log_partial(partial_text)
-                            if should_log:
-                                message_queue_func("log", "", log_message)
-                        elif self.last_partial_text:
-                            self.reset_state()
+                    started = time.perf_counter()
+                    self.decode_chunk(data, message_queue_func)
+                    if self.watchdog is not None:
+                        self._watch(time.perf_counter() - started, len(data), audio_queue, message_queue_func)
             except queue.Empty:
+                if audio_queue.empty() and (self.capture_finished.is_set() or self._capture_lost()):
+                    self._flush_final(message_queue_func)
+                    break
                 continue
             except Exception as e:
                 if not stop_flag.is_set():
-                    message_queue_func("log", "", f"❌ Ошибка обработки аудио: {e}")
+                    self.decode_log.error("❌ Ошибка обработки аудио: %s", e)
                 break
-    def _should_log_partial(self, partial_text):
-        if partial_text == self.last_partial_text:
-            self.partial_text_counter += 1
-            if self.partial_text_counter <= self.max_partial_duplicates:
-                return True, f"ЧАСТИЧНО: '{partial_text}' (повтор {self.partial_text_counter})"
+    def _capture_lost(self):
+        if self.callback_capture is not None and not self.audio_manager.is_stream_active():
+            self.capture_log.warning("⚠ Аудиопоток остановился без сигнала завершения")
+            return True
+        if self.capture_stop is None or not self.capture_stop.is_set():
+            return False
+        now = time.monotonic()
+        if self.drain_started is None:
+            self.drain_started = now
+        if now - self.drain_started < self.drain_timeout:
+            return False
+        self.capture_log.warning("⚠ Захват не завершился за %.1f сек после остановки", self.drain_timeout)
+        return True
+    @property
+    def current_model(self):
+        return self.model_override or self.model_manager.model
+    def _watchdog_stages(self):
+        stages = [RecognitionWatchdog.STAGE_NO_PARTIALS]
+        if not self.vad_enabled and VoiceActivityDetector.is_available():
+            stages.append(RecognitionWatchdog.STAGE_VAD)
+        if self.model_manager.fallback_model_path:
+            stages.append(RecognitionWatchdog.STAGE_SMALL_MODEL)
+        return stages
+    def _watch(self, elapsed, size, audio_queue, message_queue_func):
+        rate = self.audio_manager.recognizer_rate or self.audio_manager.rate
+        backlog = audio_queue.qsize() / audio_queue.maxsize if audio_queue.maxsize else 0.0
+        transition = self.watchdog.observe(elapsed, size / 2 / rate, backlog)
+        if transition is None:
+            return
+        self._apply_stage(transition['stage'], transition['degraded'])
+        names = {RecognitionWatchdog.STAGE_NO_PARTIALS: ("частичные результаты", "отключены", "возвращены"),
+                 RecognitionWatchdog.STAGE_VAD: ("пропуск тишины (VAD)", "включён", "выключен"),
+                 RecognitionWatchdog.STAGE_SMALL_MODEL: ("запасная модель", "включена", "выключена")}
+        name, degraded_action, restored_action = names[transition['stage']]
+        if transition['degraded']:
+            self.watchdog_log.warning("⚠ Распознавание не успевает (нагрузка %.2f×, очередь %.0f%%): %s %s",
+                                      transition['load'], transition['backlog'] * 100, degraded_action, name)
+        else:
+            self.watchdog_log.info("Нагрузка снизилась (%.2f×): %s %s", transition['load'], restored_action, name)
+        active = [names[stage][0] for stage in self.watchdog.active_stages]
+        if active:
+            message_queue_func("status", "", f"⚠ Упрощённый режим: {', '.join(active)}", fg="orange")
+        else:
+            message_queue_func("status", "", "🎤 Запись активна... Говорите! (F9 для остановки)", fg="red")
+    def _apply_stage(self, stage, degraded):
+        if stage == RecognitionWatchdog.STAGE_NO_PARTIALS:
+            self.partial_policy.enabled = self.partials_enabled and not degraded
+            if degraded:
+                self.reset_state()
+        elif stage == RecognitionWatchdog.STAGE_VAD:
+            if degraded:
+                self._create_vad(self.audio_manager.recognizer_rate or self.audio_manager.rate)
+            elif not self.vad_enabled:
+                self.vad = None
+        elif stage == RecognitionWatchdog.STAGE_SMALL_MODEL:
+            self.fallback_wanted = degraded
+            if degraded:
+                threading.Thread(target=self._load_fallback_model, name="fallback-model", daemon=True).start()
+            elif self.model_override is not None:
+                self.model_override = None
+                self.pending_model = self.model_manager.model
+    def _load_fallback_model(self):
+        model = self.model_manager.load_fallback_model()
+        if model is None:
+            self.watchdog_log.error("❌ Не удалось загрузить запасную модель %s",
+                                    self.model_manager.fallback_model_path)
+        elif self.fallback_wanted:
+            self.model_override = model
+            self.pending_model = model
+    def decode_chunk(self, data, message_queue_func):
+        if self.pending_model is not None:
+            self.pending_model = None
+            self._switch_model(message_queue_func)
+        if self.audio_manager.grammar_changed:
+            self._switch_recognizer(message_queue_func)
+            if self.audio_manager.recognizer is None:
+                return
+        if self.vad:
+            data, utterance_end = self.vad.process(data)
+            if data:
+                self._decode_speech(data, message_queue_func)
+            if utterance_end:
+                self._flush_final(message_queue_func)
+            return
+        self._decode_speech(data, message_queue_func)
+    def _decode_speech(self, data, message_queue_func):
+        recognizer = self.audio_manager.recognizer
+        started = time.perf_counter()
+        is_final = recognizer.AcceptWaveform(data)
+        elapsed = time.perf_counter() - started
+        self.decode_histogram.observe(elapsed)
+        self.decode_busy_counter.inc(elapsed)
+        rate = self.audio_manager.recognizer_rate or self.audio_manager.rate
+        self.decoded_audio_counter.inc(len(data) / 2 / rate)
+        if is_final:
+            result = self._parse_result('final', recognizer.Result())
+            if result.text:
+                self._emit_final(result, message_queue_func)
+            else:
+                self.decode_log.debug("Получен пустой результат")
+        elif self.partial_policy.should_poll(self.has_partial_consumers()):
+            result = self._parse_result('partial', recognizer.PartialResult())
+            if self.adaptive_chunks:
+                self.adaptive_chunks.update_speech(bool(result.text))
+            if result.text:
+                change = self.partial_policy.update(result.text, time.perf_counter())
+                if change is not None:
+                    self._emit_partial(result, change, message_queue_func)
+            elif self.partial_policy.is_active:
+                self.reset_state()
+    def has_partial_consumers(self):
+        return bool(self.ui_partials or self.partial_listeners or self.adaptive_chunks)
+    def _emit_partial(self, result, change, message_queue_func):
+        prefix, suffix = change
+        self.partial_counter.inc()
+        if self.ui_partials:
+            message_queue_func("partial", "", suffix, prefix=prefix)
+        self._notify_result('partial', result.text, result)
+    def _parse_result(self, kind, raw_result):
+        started = time.perf_counter()
+        parsed = json.loads(raw_result)
+        if kind == 'partial':
+            text = parsed.get("partial", "").strip()
+            words = parsed.get("partial_result")
         else:
-            self.last_partial_text = partial_text
-            self.partial_text_counter = 1
-            return True, f"ЧАСТИЧНО: '{partial_text}'"
-        return False, ""
\ No newline at end of file
+            text = parsed.get("text", "").strip()
+            words = parsed.get("result")
+        result = RecognitionResult(kind, text, WordTimings.from_result(words) if words else None)
+        result.parse_seconds = time.perf_counter() - started
+        self.parse_times.append(result.parse_seconds)
+        return result
+    def _emit_final(self, result, message_queue_func):
+        self.final_counter.inc()
+        self.results_log.info("РАСПОЗНАНО: '%s'", result.text)
+        message_queue_func("text", "", result.text)
+        if result.words:
+            self.session_words.extend(result.words)
+        self._notify_result('final', result.text, result)
+        self.reset_state()
+    def _switch_model(self, message_queue_func):
+        self._flush_final(message_queue_func)
+        started = time.perf_counter()
+        audio_manager = self.audio_manager
+        if not audio_manager.create_recognizer(self.current_model, audio_manager.recognizer_rate):
+            self.watchdog_log.error("❌ Не удалось переключить модель распознавателя")
+            return
+        name = "запасная" if self.model_override is not None else "основная"
+        self.watchdog_log.info("Модель переключена: %s за %.1f мс", name, (time.perf_counter() - started) * 1000)
+    def _switch_recognizer(self, message_queue_func):
+        self._flush_final(message_queue_func)
+        started = time.perf_counter()
+        audio_manager = self.audio_manager
+        if not audio_manager.create_recognizer(self.current_model, audio_manager.recognizer_rate):
+            self.decode_log.error("❌ Не удалось переключить словарь распознавателя")
+            return
+        mode = "список фраз" if audio_manager.grammar else "свободная речь"
+        source = "из пула" if audio_manager.last_recognizer_reused else "новый"
+        self.decode_log.info("Словарь переключён: %s за %.1f мс (распознаватель: %s)",
+                             mode, (time.perf_counter() - started) * 1000, source)
+    def _flush_final(self, message_queue_func):
+        recognizer = self.audio_manager.recognizer
+        if recognizer is None:
+            return
+        result = self._parse_result('final', recognizer.FinalResult())
+        if result.text:
+            self._emit_final(result, message_queue_func)
+        self.reset_state()
+    def add_result_listener(self, listener, partials=True):
+        self.result_listeners.append(listener)
+        if partials:
+            self.partial_listeners.append(listener)
+    def remove_result_listener(self, listener):
+        if listener in self.result_listeners:
+            self.result_listeners.remove(listener)
+        if listener in self.partial_listeners:
+            self.partial_listeners.remove(listener)
+    def _notify_result(self, kind, text, result):
+        listeners = self.partial_listeners if kind == 'partial' else self.result_listeners
+        for listener in listeners:
+            listener(kind, text, result)
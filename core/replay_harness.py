@@ -0,0 +1,173 @@
+import os
+import json
+import time
+from .pipeline_benchmark import PipelineBenchmark
+from .batch_transcriber import AUDIO_EXTENSIONS
+from .ring_buffer import AudioRingBuffer
+from utils.helpers import Utils
+REFERENCE_EXTENSION = ".txt"
+def load_corpus(inputs):
+    entries = []
+    for item in inputs:
+        if item.lower().endswith(".jsonl"):
+            entries.extend(_load_manifest(item))
+        elif os.path.isdir(item):
+            for root, _, names in os.walk(item):
+                entries.extend(_corpus_entry(os.path.join(root, name)) for name in sorted(names)
+                               if name.lower().endswith(AUDIO_EXTENSIONS))
+        elif os.path.isfile(item):
+            entries.append(_corpus_entry(item))
+        else:
+            raise FileNotFoundError(f"Файл не найден: {item}")
+    return entries
+def _corpus_entry(audio_path, reference=None):
+    if reference is None:
+        reference_path = os.path.splitext(audio_path)[0] + REFERENCE_EXTENSION
+        if os.path.isfile(reference_path):
+            with open(reference_path, 'r', encoding='utf-8') as f:
+                reference = f.read()
+    return {'audio': audio_path, 'reference': reference}
+def _load_manifest(path):
+    base = os.path.dirname(path)
+    entries = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            entries.append(_corpus_entry(os.path.join(base, item['audio']), item.get('reference')))
+    return entries
+class ReplayHarness:
+    DEFAULT_CONFIG = {'chunk': 8192, 'queue_size': 10, 'policy': AudioRingBuffer.POLICY_DROP_OLDEST,
+                      'paced': False, 'vad': False, 'partials': True, 'partial_interval': 0.2, 'words': False}
+    def __init__(self, model_manager, label=None, **config):
+        self.model_manager = model_manager
+        self.label = label
+        self.config = dict(self.DEFAULT_CONFIG, **config)
+    def run_file(self, entry):
+        config = self.config
+        benchmark = PipelineBenchmark(self.model_manager, entry['audio'], paced=config['paced'], vad=config['vad'],
+                                      policy=config['policy'], words=config['words'],
+                                      partial_interval=config['partial_interval'], partials=config['partials'],
+                                      reference=entry['reference'])
+        report = benchmark.run(config['chunk'], config['queue_size'])
+        accuracy = report.get('accuracy') or {}
+        record = {
+            'file': entry['audio'],
+            'audio_seconds': report['audio_seconds'],
+            'wall_seconds': report['wall_seconds'],
+            'rtf': report['rtf'],
+            'decode_rtf': report['decode_rtf'],
+            'dropped_chunks': report['dropped_chunks'],
+            'final_latency_p95': report['final_latency'].get('p95'),
+            'text': report['text'],
+            'reference': entry['reference'],
+            'wer': accuracy.get('wer'),
+            'errors': accuracy.get('errors'),
+            'reference_words': accuracy.get('reference_words'),
+        }
+        return record, benchmark.last_latencies
+    def run(self, entries):
+        started = time.time()
+        files = []
+        latencies = {'partial': [], 'final': []}
+        for entry in entries:
+            record, file_latencies = self.run_file(entry)
+            files.append(record)
+            for kind, values in file_latencies.items():
+                latencies[kind].extend(values)
+        return {
+            'label': self.label or self.model_manager.get_model_name(),
+            'model': self.model_manager.model_path,
+            'config': self.config,
+            'started_at': started,
+            'summary': self.summarize(files, latencies),
+            'files': files,
+        }
+    @staticmethod
+    def summarize(files, latencies):
+        audio = sum(record['audio_seconds'] or 0 for record in files)
+        wall = sum(record['wall_seconds'] for record in files)
+        scored = [record for record in files if record['reference_words'] is not None]
+        reference_words = sum(record['reference_words'] for record in scored)
+        errors = sum(record['errors'] for record in scored)
+        return {
+            'files': len(files),
+            'scored_files': len(scored),
+            'audio_seconds': audio,
+            'wall_seconds': wall,
+            'rtf': wall / audio if audio else None,
+            'throughput': audio / wall if wall else None,
+            'wer': errors / reference_words if reference_words else None,
+            'errors': errors,
+            'reference_words': reference_words,
+            'dropped_chunks': sum(record['dropped_chunks'] for record in files),
+            'final_latency': Utils.summarize(latencies['final']),
+            'partial_latency': Utils.summarize(latencies['partial']),
+        }
+LOWER_IS_BETTER = ('wer', 'rtf', 'dropped_chunks', 'final_latency_p50', 'final_latency_p95', 'partial_latency_p95')
+def _flat_summary(run):
+    summary = run['summary']
+    flat = {name: summary.get(name) for name in ('wer', 'rtf', 'throughput', 'dropped_chunks')}
+    flat['final_latency_p50'] = summary['final_latency'].get('p50')
+    flat['final_latency_p95'] = summary['final_latency'].get('p95')
+    flat['partial_latency_p95'] = summary['partial_latency'].get('p95')
+    return flat
+def compare_runs(baseline, candidate, max_wer_increase=0.005, max_rtf_increase=0.10):
+    base, cand = _flat_summary(baseline), _flat_summary(candidate)
+    metrics = {}
+    for name in base:
+        before, after = base[name], cand[name]
+        delta = after - before if before is not None and after is not None else None
+        metrics[name] = {'baseline': before, 'candidate': after, 'delta': delta,
+                         'relative': delta / before if delta is not None and before else None}
+    regressions = []
+    wer = metrics['wer']
+    if wer['delta'] is not None and wer['delta'] > max_wer_increase:
+        regressions.append(f"WER вырос на {wer['delta']:.2%} (допустимо {max_wer_increase:.2%})")
+    rtf = metrics['rtf']
+    if rtf['relative'] is not None and rtf['relative'] > max_rtf_increase:
+        regressions.append(f"RTF вырос на {rtf['relative']:.0%} (допустимо {max_rtf_increase:.0%})")
+    baseline_files = {record['file']: record for record in baseline['files']}
+    changed = []
+    for record in candidate['files']:
+        before = baseline_files.get(record['file'])
+        if before is None or before['text'] == record['text']:
+            continue
+        changed.append({'file': record['file'], 'baseline_wer': before['wer'], 'candidate_wer': record['wer'],
+                        'baseline_text': before['text'], 'candidate_text': record['text'],
+                        'difference': Utils.word_error_rate(before['text'], record['text'])['wer']})
+    changed.sort(key=lambda item: (item['candidate_wer'] or 0) - (item['baseline_wer'] or 0), reverse=True)
+    return {'baseline': baseline['label'], 'candidate': candidate['label'],
+            'baseline_config': baseline['config'], 'candidate_config': candidate['config'],
+            'metrics': metrics, 'changed_files': changed, 'regressions': regressions}
+def format_comparison(comparison):
+    lines = [f"# {comparison['baseline']} → {comparison['candidate']}", "",
+             "| Метрика | База | Кандидат | Изменение |", "|---|---|---|---|"]
+    for name, values in comparison['metrics'].items():
+        before, after, delta = values['baseline'], values['candidate'], values['delta']
+        marker = ""
+        if delta:
+            better = delta < 0 if name in LOWER_IS_BETTER else delta > 0
+            marker = " ✅" if better else " ⚠"
+        lines.append(f"| {name} | {_format_value(before)} | {_format_value(after)} | "
+                     f"{_format_value(delta, signed=True)}{marker} |")
+    changed_config = {key: (value, comparison['candidate_config'].get(key))
+                      for key, value in comparison['baseline_config'].items()
+                      if comparison['candidate_config'].get(key) != value}
+    if changed_config:
+        lines += ["", "Отличия конфигурации: " + ", ".join(f"{key}: {before} → {after}"
+                                                           for key, (before, after) in changed_config.items())]
+    if comparison['changed_files']:
+        lines += ["", f"Изменился текст в {len(comparison['changed_files'])} файлах:"]
+        for item in comparison['changed_files']:
+            lines.append(f"* {item['file']}: WER {_format_value(item['baseline_wer'])} → "
+                         f"{_format_value(item['candidate_wer'])}")
+    lines += ["", "Регрессии: " + ("; ".join(comparison['regressions']) if comparison['regressions'] else "нет")]
+    return "\n".join(lines) + "\n"
+def _format_value(value, signed=False):
+    if value is None:
+        return "–"
+    if isinstance(value, float):
+        return f"{value:+.4f}" if signed else f"{value:.4f}"
+    return f"{value:+d}" if signed else str(value)
@@ -0,0 +1,107 @@
+import time
+try:
+    import numpy as np
+except ImportError:
+    np = None
+class AudioResampler:
+    QUALITY_FAST = 'fast'
+    QUALITY_LINEAR = 'linear'
+    QUALITY_HIGH = 'high'
+    QUALITIES = (QUALITY_FAST, QUALITY_LINEAR, QUALITY_HIGH)
+    def __init__(self, input_rate, output_rate=16000, channels=1, quality=QUALITY_LINEAR, taps=63):
+        if quality not in self.QUALITIES:
+            raise ValueError(f"Неизвестное качество передискретизации: {quality}")
+        self.input_rate = int(input_rate)
+        self.output_rate = int(output_rate)
+        self.channels = channels
+        self.quality = quality
+        self.step = self.input_rate / self.output_rate
+        self.kernel = None
+        if quality == self.QUALITY_HIGH and self.input_rate > self.output_rate:
+            self.kernel = self._lowpass_kernel(taps, 0.45 / self.step)
+        self.reset()
+    @staticmethod
+    def is_available():
+        return np is not None
+    @staticmethod
+    def _lowpass_kernel(taps, cutoff):
+        n = np.arange(taps) - (taps - 1) / 2
+        kernel = 2 * cutoff * np.sinc(2 * cutoff * n) * np.hamming(taps)
+        return (kernel / kernel.sum()).astype(np.float32)
+    def reset(self):
+        self.pending = b""
+        self.last_sample = np.float32(0.0) if np is not None else 0.0
+        self.consumed = 0
+        self.produced = 0
+        self.history = np.zeros(len(self.kernel) - 1, dtype=np.float32) if self.kernel is not None else None
+    @property
+    def is_passthrough(self):
+        return self.input_rate == self.output_rate and self.channels == 1
+    def input_frames(self, output_frames):
+        return max(1, int(round(output_frames * self.step)))
+    def process(self, data):
+        if self.is_passthrough:
+            return data
+        frame_bytes = 2 * self.channels
+        data = self.pending + data
+        usable = len(data) - len(data) % frame_bytes
+        self.pending = data[usable:]
+        samples = np.frombuffer(data[:usable], dtype=np.int16)
+        if self.channels > 1:
+            samples = samples.reshape(-1, self.channels).mean(axis=1, dtype=np.float32)
+        else:
+            samples = samples.astype(np.float32)
+        if self.input_rate != self.output_rate:
+            samples = self._resample(samples)
+        return np.clip(np.rint(samples), -32768, 32767).astype(np.int16).tobytes()
+    def _resample(self, samples):
+        if self.kernel is not None:
+            padded = np.concatenate((self.history, samples))
+            self.history = padded[len(padded) - len(self.history):]
+            samples = np.convolve(padded, self.kernel, mode='valid').astype(np.float32)
+        count = len(samples)
+        if count == 0:
+            return samples
+        source = np.empty(count + 1, dtype=np.float32)
+        source[0] = self.last_sample
+        source[1:] = samples
+        origin = self.consumed - 1
+        last = int((self.consumed + count) / self.step) + 1
+        times = np.arange(self.produced, max(self.produced, last)) * self.step
+        if self.quality == self.QUALITY_FAST:
+            indices = np.floor(times + 0.5).astype(np.intp) - origin
+            indices = indices[indices <= count]
+            resampled = source[indices]
+        else:
+            positions = times - origin
+            positions = positions[positions <= count]
+            resampled = np.interp(positions, np.arange(count + 1, dtype=np.float32), source).astype(np.float32)
+        self.produced += len(resampled)
+        self.consumed += count
+        self.last_sample = source[-1]
+        return resampled
+def benchmark_resampler(input_rate, channels=1, output_rate=16000, quality=AudioResampler.QUALITY_LINEAR,
+                        seconds=30, chunk=8192):
+    resampler = AudioResampler(input_rate, output_rate, channels, quality)
+    frames = int(input_rate * seconds)
+    t = np.arange(frames, dtype=np.float32) / input_rate
+    tone = (8000 * np.sin(2 * np.pi * 440 * t)).astype(np.int16)
+    data = np.repeat(tone, channels).tobytes()
+    step = resampler.input_frames(chunk) * 2 * channels
+    produced = 0
+    started_cpu = time.process_time()
+    started = time.perf_counter()
+    for offset in range(0, len(data), step):
+        produced += len(resampler.process(data[offset:offset + step]))
+    cpu = time.process_time() - started_cpu
+    elapsed = time.perf_counter() - started
+    return {
+        'input_rate': input_rate,
+        'channels': channels,
+        'output_rate': output_rate,
+        'quality': quality,
+        'audio_seconds': seconds,
+        'output_seconds': round(produced / 2 / output_rate, 3),
+        'cpu_per_audio_second': cpu / seconds,
+        'wall_per_audio_second': elapsed / seconds,
+    }
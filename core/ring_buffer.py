@@ -0,0 +1,132 @@
+import time
+import queue
+import threading
+from array import array
+class AudioRingBuffer:
+    POLICY_BLOCK = 'block'
+    POLICY_DROP_OLDEST = 'drop_oldest'
+    POLICY_DROP_NEWEST = 'drop_newest'
+    POLICIES = (POLICY_BLOCK, POLICY_DROP_OLDEST, POLICY_DROP_NEWEST)
+    def __init__(self, slots=10, slot_size=16384, policy=POLICY_DROP_OLDEST, track_timing=False):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Неизвестная политика переполнения: {policy}")
+        self.maxsize = slots
+        self.slot_size = slot_size
+        self.policy = policy
+        self.track_timing = track_timing
+        self.max_read_retries = 3
+        self.buffer = bytearray(slots * slot_size)
+        self.view = memoryview(self.buffer)
+        self.lengths = array('L', [0] * slots)
+        self.put_times = array('d', [0.0] * slots)
+        self.sequence = array('q', [0] * slots)
+        self.head = 0
+        self.tail = 0
+        self.not_empty = threading.Event()
+        self.not_full = threading.Event()
+        self.last_put_time = None
+        self.reset_stats()
+    def reset_stats(self):
+        self.stats = {'written': 0, 'read': 0, 'overruns': 0, 'dropped_oldest': 0,
+                      'dropped_newest': 0, 'blocked': 0, 'read_retries': 0, 'skipped': 0}
+        self.wait_times = []
+    def put(self, data, block=True, timeout=None):
+        for offset in range(0, len(data), self.slot_size):
+            self._put_slot(data[offset:offset + self.slot_size], block, timeout)
+    def put_nowait(self, data):
+        self.put(data, block=False)
+    def _put_slot(self, data, block, timeout):
+        tail = self.tail
+        if tail - self.head >= self.maxsize:
+            if self.policy == self.POLICY_BLOCK:
+                self.stats['blocked'] += 1
+                if not block or not self._wait_not_full(timeout):
+                    self.stats['overruns'] += 1
+                    raise queue.Full
+            else:
+                self.stats['overruns'] += 1
+                if self.policy == self.POLICY_DROP_NEWEST:
+                    self.stats['dropped_newest'] += 1
+                    return
+                self.stats['dropped_oldest'] += 1
+        index = tail % self.maxsize
+        start = index * self.slot_size
+        self.sequence[index] = 0
+        self.view[start:start + len(data)] = data
+        self.lengths[index] = len(data)
+        self.put_times[index] = time.perf_counter()
+        self.sequence[index] = tail + 1
+        self.tail = tail + 1
+        self.stats['written'] += 1
+        self.not_empty.set()
+    def _wait_not_full(self, timeout):
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while self.tail - self.head >= self.maxsize:
+            self.not_full.clear()
+            if self.tail - self.head < self.maxsize:
+                break
+            remaining = None if deadline is None else deadline - time.perf_counter()
+            if remaining is not None and remaining <= 0:
+                return False
+            self.not_full.wait(remaining)
+        return True
+    def get(self, block=True, timeout=None):
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        retries = 0
+        while True:
+            tail = self.tail
+            head = self.head
+            if tail == head:
+                if not block:
+                    raise queue.Empty
+                self.not_empty.clear()
+                if self.tail != head:
+                    continue
+                remaining = None if deadline is None else deadline - time.perf_counter()
+                if remaining is not None and remaining <= 0:
+                    raise queue.Empty
+                self.not_empty.wait(remaining)
+                continue
+            if tail - head > self.maxsize:
+                head = self.head = tail - self.maxsize
+            if retries > self.max_read_retries and head < tail - 1:
+                self.stats['skipped'] += tail - 1 - head
+                head = self.head = tail - 1
+            index = head % self.maxsize
+            sequence = self.sequence[index]
+            if sequence != head + 1:
+                retries += 1
+                self.stats['read_retries'] += 1
+                time.sleep(0)
+                continue
+            start = index * self.slot_size
+            put_time = self.put_times[index]
+            data = bytes(self.view[start:start + self.lengths[index]])
+            if self.sequence[index] != sequence:
+                retries += 1
+                self.stats['read_retries'] += 1
+                continue
+            self.head = head + 1
+            self.stats['read'] += 1
+            self.last_put_time = put_time
+            if self.track_timing:
+                self.wait_times.append(time.perf_counter() - put_time)
+            self.not_full.set()
+            return data
+    def get_nowait(self):
+        return self.get(block=False)
+    def qsize(self):
+        return min(self.tail - self.head, self.maxsize)
+    def empty(self):
+        return self.tail == self.head
+    def full(self):
+        return self.tail - self.head >= self.maxsize
+    def clear(self):
+        self.head = self.tail
+        self.reset_stats()
+        self.not_full.set()
+    def get_stats(self):
+        stats = dict(self.stats)
+        stats.update({'policy': self.policy, 'slots': self.maxsize, 'slot_size': self.slot_size,
+                      'depth': self.qsize()})
+        return stats
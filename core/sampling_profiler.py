@@ -0,0 +1,59 @@
+import os
+import sys
+import time
+import threading
+from collections import Counter
+class SamplingProfiler:
+    def __init__(self, interval=0.005, max_depth=30):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks = Counter()
+        self.samples = 0
+        self.target = None
+        self.thread = None
+        self.stop_event = threading.Event()
+        self.started = None
+        self.elapsed = 0.0
+    def start(self, thread_id=None):
+        if self.thread is not None:
+            return self
+        self.target = thread_id or threading.get_ident()
+        self.stop_event.clear()
+        self.started = time.perf_counter()
+        self.thread = threading.Thread(target=self._run, name="decode-profiler", daemon=True)
+        self.thread.start()
+        return self
+    def stop(self):
+        if self.thread is None:
+            return self
+        self.stop_event.set()
+        self.thread.join()
+        self.thread = None
+        self.elapsed += time.perf_counter() - self.started
+        return self
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.target)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            self.stacks[tuple(reversed(stack))] += 1
+            self.samples += 1
+    def top_functions(self, limit=10):
+        leaves = Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack[-1]] += count
+        return [{'function': name, 'samples': count, 'share': count / self.samples}
+                for name, count in leaves.most_common(limit)]
+    def write_collapsed(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(";".join(stack) + f" {count}\n")
+        return path
+    def report(self, limit=10):
+        return {'samples': self.samples, 'seconds': self.elapsed, 'interval': self.interval,
+                'top': self.top_functions(limit)}
@@ -0,0 +1,134 @@
+import os
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .audio_sources import create_audio_source
+from .vad import VoiceActivityDetector, np
+from .ring_buffer import AudioRingBuffer
+from .pipeline_benchmark import PipelineBenchmark
+from utils.helpers import Utils
+class SegmentedTranscriber:
+    def __init__(self, model_manager, workers=None, sample_rate=16000, chunk=8192, segment_seconds=30.0,
+                 min_silence_ms=300, threshold_db=-40.0, frame_ms=20):
+        self.model_manager = model_manager
+        self.workers = workers or os.cpu_count() or 1
+        self.sample_rate = sample_rate
+        self.chunk = chunk
+        self.segment_seconds = segment_seconds
+        self.min_silence_ms = min_silence_ms
+        self.threshold_db = threshold_db
+        self.frame_size = int(sample_rate * frame_ms / 1000)
+    @staticmethod
+    def is_available():
+        return VoiceActivityDetector.is_available()
+    def _open_source(self, path):
+        source = create_audio_source(path, self.chunk, self.sample_rate)
+        if source.sample_rate != self.sample_rate:
+            raise ValueError(f"Частота {source.sample_rate}Hz, ожидается {self.sample_rate}Hz")
+        source.open()
+        return source
+    def scan_levels(self, path):
+        source = self._open_source(path)
+        levels = []
+        pending = np.zeros(0, dtype=np.int16)
+        try:
+            while True:
+                data = source.read_chunk()
+                if data is None:
+                    break
+                samples = np.concatenate((pending, np.frombuffer(data, dtype=np.int16)))
+                count = len(samples) // self.frame_size
+                levels.append(VoiceActivityDetector.frame_levels(samples, self.frame_size))
+                pending = samples[count * self.frame_size:]
+            total_frames = source.frames_read
+        finally:
+            source.close()
+        return (np.concatenate(levels) if levels else np.zeros(0, dtype=np.float32)), total_frames
+    def find_segments(self, levels, total_frames):
+        segment = max(1, int(self.segment_seconds * self.sample_rate / self.frame_size))
+        min_run = max(1, int(self.min_silence_ms * self.sample_rate / 1000 / self.frame_size))
+        silent = np.concatenate(([False], levels < self.threshold_db, [False]))
+        edges = np.flatnonzero(np.diff(silent.astype(np.int8)))
+        starts, ends = edges[0::2], edges[1::2]
+        long_runs = ends - starts >= min_run
+        candidates = (starts[long_runs] + ends[long_runs]) // 2
+        boundaries = [0]
+        hard_cuts = 0
+        last_frame = len(levels)
+        while last_frame - boundaries[-1] > segment * 3 // 2:
+            target = boundaries[-1] + segment
+            window = candidates[(candidates > boundaries[-1] + segment // 2) &
+                                (candidates <= boundaries[-1] + segment * 3 // 2)]
+            if len(window):
+                boundaries.append(int(window[np.argmin(np.abs(window - target))]))
+            else:
+                boundaries.append(target)
+                hard_cuts += 1
+        frames = [boundary * self.frame_size for boundary in boundaries] + [total_frames]
+        return list(zip(frames[:-1], frames[1:])), hard_cuts
+    def _decode_segment(self, path, start, end):
+        recognizer = self.model_manager.KaldiRecognizer(self.model_manager.model, self.sample_rate)
+        recognizer.SetWords(True)
+        offset = start / self.sample_rate
+        phrases = []
+        source = self._open_source(path)
+        try:
+            source.seek(start)
+            position = start
+            while position < end:
+                data = source.read_chunk(min(self.chunk, end - position))
+                if data is None:
+                    break
+                position += len(data) // 2
+                if recognizer.AcceptWaveform(data):
+                    self._collect_phrase(recognizer.Result(), offset, phrases)
+            self._collect_phrase(recognizer.FinalResult(), offset, phrases)
+        finally:
+            source.close()
+        return phrases
+    @staticmethod
+    def _collect_phrase(raw_result, offset, phrases):
+        result = json.loads(raw_result)
+        text = result.get("text", "").strip()
+        if not text:
+            return
+        words = result.get("result") or []
+        start = words[0].get('start', 0.0) if words else 0.0
+        end = words[-1].get('end', start) if words else start
+        phrases.append({'start': round(offset + start, 2), 'end': round(offset + end, 2), 'text': text})
+    def transcribe(self, path):
+        started = time.perf_counter()
+        levels, total_frames = self.scan_levels(path)
+        segments, hard_cuts = self.find_segments(levels, total_frames)
+        scan_seconds = time.perf_counter() - started
+        workers = max(1, min(self.workers, len(segments)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(self._decode_segment, path, start, end) for start, end in segments]
+            phrases = [phrase for future in futures for phrase in future.result()]
+        elapsed = time.perf_counter() - started
+        duration = total_frames / self.sample_rate
+        return {
+            'file': path,
+            'text': " ".join(phrase['text'] for phrase in phrases),
+            'phrases': phrases,
+            'duration': duration,
+            'segments': len(segments),
+            'hard_cuts': hard_cuts,
+            'workers': workers,
+            'scan_seconds': scan_seconds,
+            'elapsed': elapsed,
+            'rtf': elapsed / duration if duration else None,
+        }
+    def transcribe_sequential(self, path):
+        benchmark = PipelineBenchmark(self.model_manager, path, ui_interval=0.1,
+                                      policy=AudioRingBuffer.POLICY_BLOCK, partials=False)
+        report = benchmark.run(self.chunk, 10)
+        return {'text': report['text'], 'elapsed': report['wall_seconds'], 'rtf': report['rtf']}
+    def compare(self, path):
+        record = self.transcribe(path)
+        sequential = self.transcribe_sequential(path)
+        record['sequential_elapsed'] = sequential['elapsed']
+        record['speedup'] = sequential['elapsed'] / record['elapsed'] if record['elapsed'] else None
+        record['sequential_text'] = sequential['text']
+        record['difference'] = Utils.word_error_rate(sequential['text'], record['text'])
+        return record
@@ -0,0 +1,68 @@
+import sys
+import json
+import time
+import importlib
+import threading
+import subprocess
+PROCESS_START = time.perf_counter()
+HEAVY_MODULES = ('vosk', 'pyaudio', 'tkinter', 'numpy')
+HEADLESS_FORBIDDEN = ('vosk', 'pyaudio', 'tkinter')
+class StartupProfiler:
+    def __init__(self, started=None):
+        self.started = PROCESS_START if started is None else started
+        self.marks = {}
+        self.imports = {}
+        self.lock = threading.Lock()
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+    def mark(self, name):
+        with self.lock:
+            return self.marks.setdefault(name, round(self.elapsed_ms(), 1))
+    def timed_import(self, name):
+        module = sys.modules.get(name)
+        if module is not None:
+            return module
+        started = time.perf_counter()
+        module = importlib.import_module(name)
+        with self.lock:
+            self.imports.setdefault(name, {
+                'ms': round((time.perf_counter() - started) * 1000, 1),
+                'at_ms': round(self.elapsed_ms(), 1),
+                'thread': threading.current_thread().name,
+            })
+        return module
+    def report(self):
+        with self.lock:
+            return {
+                'marks': dict(self.marks),
+                'lazy_imports': dict(self.imports),
+                'loaded_heavy_modules': [name for name in HEAVY_MODULES if name in sys.modules],
+            }
+    def check_budgets(self, budgets):
+        violations = []
+        for name, limit in budgets.items():
+            value = self.marks.get(name)
+            if value is None:
+                violations.append(f"{name}: не достигнуто")
+            elif value > limit:
+                violations.append(f"{name}: {value} мс > {limit} мс")
+        return violations
+profiler = StartupProfiler()
+def lazy_import(name):
+    return profiler.timed_import(name)
+_IMPORT_PROBE = """
+import sys, time, json
+started = time.perf_counter()
+import {module}
+print(json.dumps({{'ms': (time.perf_counter() - started) * 1000,
+                  'heavy': [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+def profile_entry_import(module, python=None, cwd=None):
+    probe_code = _IMPORT_PROBE.format(module=module, heavy=HEAVY_MODULES)
+    completed = subprocess.run([python or sys.executable, '-c', probe_code], capture_output=True, text=True, cwd=cwd)
+    if completed.returncode != 0:
+        return {'module': module, 'error': (completed.stderr.strip().splitlines() or [""])[-1]}
+    probe = json.loads(completed.stdout.strip().splitlines()[-1])
+    forbidden = [] if module in ('main', 'app') else [name for name in probe['heavy'] if name in HEADLESS_FORBIDDEN]
+    return {'module': module, 'import_ms': round(probe['ms'], 1), 'heavy_modules': probe['heavy'],
+            'forbidden': forbidden}
@@ -0,0 +1,171 @@
+import os
+import json
+import time
+import struct
+import bisect
+import datetime
+import threading
+import uuid
+JOURNAL_DIR = os.path.join(os.path.expanduser("~"), ".speech_to_text_app", "journal")
+INDEX_RECORD = struct.Struct('<Qd')
+class TranscriptJournal:
+    def __init__(self, directory=JOURNAL_DIR, session_id=None, include_partials=False,
+                 fsync_interval=1.0, segment_max_bytes=16 * 1024 * 1024):
+        self.directory = directory
+        self.session_id = session_id or self.new_session_id()
+        self.include_partials = include_partials
+        self.fsync_interval = fsync_interval
+        self.segment_max_bytes = segment_max_bytes
+        self.lock = threading.Lock()
+        self.pending = []
+        self.records = 0
+        self.segment = -1
+        self.data_file = None
+        self.index_file = None
+        self.stop_flag = threading.Event()
+        self.flush_thread = None
+    @staticmethod
+    def new_session_id():
+        now = datetime.datetime.now()
+        return f"{now:session-%Y%m%d-%H%M%S}-{now.microsecond // 1000:03d}-{uuid.uuid4().hex[:6]}"
+    def open(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self._open_segment()
+        self.flush_thread = threading.Thread(target=self._flush_loop, daemon=True)
+        self.flush_thread.start()
+        return self
+    def _segment_path(self, segment, extension):
+        return os.path.join(self.directory, f"{self.session_id}.{segment:04d}.{extension}")
+    def _open_segment(self):
+        if self.data_file:
+            self.data_file.close()
+            self.index_file.close()
+        self.segment += 1
+        self.data_file = open(self._segment_path(self.segment, "jsonl"), 'ab')
+        self.index_file = open(self._segment_path(self.segment, "idx"), 'ab')
+    def write(self, kind, text, result=None, source=None):
+        if kind == 'partial' and not self.include_partials:
+            return
+        record = {'n': self.records, 't': time.time(), 'type': kind, 'text': text}
+        if source is not None:
+            record['source'] = source
+        if result is not None and result.words:
+            record['words'] = result.words.to_dict()
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode('utf-8')
+        with self.lock:
+            self.pending.append((record['t'], line))
+            self.records += 1
+    def on_result(self, kind, text, result, source=None):
+        self.write(kind, text, result, source)
+    def _flush_loop(self):
+        while not self.stop_flag.wait(self.fsync_interval):
+            self.flush()
+    def flush(self):
+        with self.lock:
+            pending, self.pending = self.pending, []
+        if not pending or self.data_file is None:
+            return
+        try:
+            offset = self.data_file.tell()
+            index = bytearray()
+            for timestamp, line in pending:
+                index += INDEX_RECORD.pack(offset, timestamp)
+                offset += len(line)
+            self.data_file.write(b"".join(line for _, line in pending))
+            self.data_file.flush()
+            os.fsync(self.data_file.fileno())
+            self.index_file.write(index)
+            self.index_file.flush()
+            os.fsync(self.index_file.fileno())
+            if offset >= self.segment_max_bytes:
+                self._open_segment()
+        except OSError as e:
+            print(f"Ошибка записи журнала: {e}")
+    def close(self):
+        self.stop_flag.set()
+        if self.flush_thread:
+            self.flush_thread.join()
+            self.flush_thread = None
+        self.flush()
+        if self.data_file:
+            self.data_file.close()
+            self.index_file.close()
+            self.data_file = None
+            self.index_file = None
+class JournalReader:
+    def __init__(self, directory, session_id):
+        self.directory = directory
+        self.session_id = session_id
+        self.segments = []
+        segment = 0
+        while os.path.exists(self._segment_path(segment, "jsonl")):
+            self.segments.append(self._load_index(segment))
+            segment += 1
+        self.starts = []
+        total = 0
+        for entries in self.segments:
+            self.starts.append(total)
+            total += len(entries)
+        self.count = total
+    @staticmethod
+    def list_sessions(directory=JOURNAL_DIR):
+        if not os.path.isdir(directory):
+            return []
+        return sorted({name.split('.')[0] for name in os.listdir(directory) if name.endswith(".jsonl")})
+    @classmethod
+    def from_path(cls, path):
+        return cls(os.path.dirname(path), os.path.basename(path).split('.')[0])
+    def _segment_path(self, segment, extension):
+        return os.path.join(self.directory, f"{self.session_id}.{segment:04d}.{extension}")
+    def _load_index(self, segment):
+        data_size = os.path.getsize(self._segment_path(segment, "jsonl"))
+        index_path = self._segment_path(segment, "idx")
+        if not os.path.exists(index_path):
+            return []
+        with open(index_path, 'rb') as f:
+            raw = f.read()
+        raw = raw[:len(raw) - len(raw) % INDEX_RECORD.size]
+        return [entry for entry in INDEX_RECORD.iter_unpack(raw) if entry[0] < data_size]
+    def __len__(self):
+        return self.count
+    def _locate(self, number):
+        segment = bisect.bisect_right(self.starts, number) - 1
+        return segment, number - self.starts[segment]
+    def read(self, start=0, count=None):
+        end = self.count if count is None else min(self.count, start + count)
+        number = max(0, start)
+        while number < end:
+            segment, position = self._locate(number)
+            entries = self.segments[segment]
+            with open(self._segment_path(segment, "jsonl"), 'rb') as f:
+                f.seek(entries[position][0])
+                while number < end and position < len(entries):
+                    line = f.readline()
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        return
+                    number += 1
+                    position += 1
+    def find_time(self, timestamp):
+        for segment, entries in enumerate(self.segments):
+            if entries and entries[-1][1] >= timestamp:
+                position = bisect.bisect_left([entry[1] for entry in entries], timestamp)
+                return self.starts[segment] + position
+        return self.count
+    def read_since(self, timestamp, count=None):
+        return self.read(self.find_time(timestamp), count)
+    def search(self, query, kinds=('final',)):
+        needle = query.lower()
+        for segment in range(len(self.segments)):
+            with open(self._segment_path(segment, "jsonl"), 'rb') as f:
+                for line in f:
+                    decoded = line.decode('utf-8', errors='ignore')
+                    if needle not in decoded.lower():
+                        continue
+                    try:
+                        record = json.loads(decoded)
+                    except ValueError:
+                        continue
+                    if record.get('type') in kinds and needle in record.get('text', '').lower():
+                        yield record
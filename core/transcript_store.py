@@ -0,0 +1,73 @@
+import tempfile
+import threading
+SEPARATOR = "\x1e"
+class TranscriptStore:
+    def __init__(self, chunk_entries=500, max_memory_chunks=20):
+        self.chunk_entries = chunk_entries
+        self.max_memory_chunks = max_memory_chunks
+        self.lock = threading.Lock()
+        self.spill_file = None
+        self.clear()
+    def clear(self):
+        with self.lock:
+            self.tail = []
+            self.chunks = []
+            self.memory_chunks = 0
+            self.count = 0
+            if self.spill_file:
+                self.spill_file.close()
+                self.spill_file = None
+    def append(self, entry):
+        self.extend([entry])
+    def extend(self, entries):
+        with self.lock:
+            for entry in entries:
+                self.tail.append(entry.replace(SEPARATOR, " "))
+                if len(self.tail) >= self.chunk_entries:
+                    self._seal_tail()
+            self.count += len(entries)
+    def _seal_tail(self):
+        self.chunks.append(SEPARATOR.join(self.tail))
+        self.tail = []
+        self.memory_chunks += 1
+        if self.memory_chunks > self.max_memory_chunks:
+            self._spill_oldest()
+    def _spill_oldest(self):
+        if self.spill_file is None:
+            self.spill_file = tempfile.TemporaryFile()
+        for index, chunk in enumerate(self.chunks):
+            if isinstance(chunk, str):
+                data = chunk.encode('utf-8')
+                self.spill_file.seek(0, 2)
+                self.chunks[index] = (self.spill_file.tell(), len(data))
+                self.spill_file.write(data)
+                self.memory_chunks -= 1
+                return
+    def _load_chunk(self, chunk):
+        if isinstance(chunk, str):
+            return chunk.split(SEPARATOR)
+        offset, length = chunk
+        self.spill_file.seek(offset)
+        return self.spill_file.read(length).decode('utf-8').split(SEPARATOR)
+    def __len__(self):
+        return self.count
+    def get_entries(self, start, end):
+        with self.lock:
+            start = max(0, start)
+            end = min(self.count, end)
+            entries = []
+            first_chunk = start // self.chunk_entries
+            last_chunk = min((end - 1) // self.chunk_entries, len(self.chunks) - 1)
+            for index in range(first_chunk, last_chunk + 1):
+                base = index * self.chunk_entries
+                chunk = self._load_chunk(self.chunks[index])
+                entries.extend(chunk[max(0, start - base):end - base])
+            tail_base = len(self.chunks) * self.chunk_entries
+            if end > tail_base:
+                entries.extend(self.tail[max(0, start - tail_base):end - tail_base])
+            return entries
+    def get_text(self):
+        return "".join(self.get_entries(0, self.count))
+    @property
+    def spilled_chunks(self):
+        return len(self.chunks) - self.memory_chunks
@@ -0,0 +1,64 @@
+try:
+    import numpy as np
+except ImportError:
+    np = None
+class VoiceActivityDetector:
+    def __init__(self, sample_rate=16000, frame_ms=20, threshold_db=-40.0, hangover_ms=300):
+        self.sample_rate = sample_rate
+        self.frame_size = int(sample_rate * frame_ms / 1000)
+        self.threshold_db = threshold_db
+        self.hangover_frames = max(1, int(hangover_ms / frame_ms))
+        self.reset()
+    @staticmethod
+    def is_available():
+        return np is not None
+    @staticmethod
+    def frame_levels(samples, frame_size):
+        count = len(samples) // frame_size
+        frames = samples[:count * frame_size].reshape(count, frame_size)
+        energy = np.mean(frames.astype(np.float32) ** 2, axis=1) / (32768.0 ** 2)
+        return 10.0 * np.log10(energy + 1e-12)
+    def reset(self):
+        self.pending = np.zeros(0, dtype=np.int16) if np is not None else None
+        self.frame_index = 0
+        self.last_speech_frame = -self.hangover_frames - 1
+        self.in_speech = False
+        self.total_frames = 0
+        self.dropped_frames = 0
+        self.utterances = 0
+    def process(self, data):
+        samples = np.frombuffer(data, dtype=np.int16)
+        if len(self.pending):
+            samples = np.concatenate((self.pending, samples))
+        count = len(samples) // self.frame_size
+        self.pending = samples[count * self.frame_size:].copy()
+        if count == 0:
+            return b"", False
+        frames = samples[:count * self.frame_size].reshape(count, self.frame_size)
+        speech = self.frame_levels(samples, self.frame_size) > self.threshold_db
+        index = np.arange(self.frame_index, self.frame_index + count)
+        last_speech = np.maximum.accumulate(np.where(speech, index, self.last_speech_frame))
+        active = index - last_speech <= self.hangover_frames
+        self.frame_index += count
+        self.last_speech_frame = int(last_speech[-1])
+        self.total_frames += count
+        kept = int(np.count_nonzero(active))
+        self.dropped_frames += count - kept
+        was_in_speech = self.in_speech
+        self.in_speech = bool(active[-1])
+        utterance_end = (was_in_speech or kept > 0) and not self.in_speech
+        if utterance_end:
+            self.utterances += 1
+        if kept == count:
+            return frames.tobytes(), False
+        return frames[active].tobytes(), utterance_end
+    def get_stats(self):
+        frame_seconds = self.frame_size / self.sample_rate
+        total = self.total_frames * frame_seconds
+        dropped = self.dropped_frames * frame_seconds
+        return {
+            'total_seconds': total,
+            'dropped_seconds': dropped,
+            'dropped_ratio': dropped / total if total else 0.0,
+            'utterances': self.utterances,
+        }
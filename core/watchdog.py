@@ -0,0 +1,73 @@
+import time
+from .metrics import registry
+class RecognitionWatchdog:
+    STAGE_NO_PARTIALS = 'no_partials'
+    STAGE_VAD = 'vad'
+    STAGE_SMALL_MODEL = 'small_model'
+    STAGES = (STAGE_NO_PARTIALS, STAGE_VAD, STAGE_SMALL_MODEL)
+    def __init__(self, high_load=0.9, low_load=0.5, high_backlog=0.5, low_backlog=0.1,
+                 degrade_after=2.0, recover_after=10.0, smoothing=0.2):
+        self.high_load = high_load
+        self.low_load = low_load
+        self.high_backlog = high_backlog
+        self.low_backlog = low_backlog
+        self.degrade_after = degrade_after
+        self.recover_after = recover_after
+        self.smoothing = smoothing
+        self.counts = {'degraded': 0, 'restored': 0}
+        self.reset()
+    def reset(self, stages=STAGES, labels=None):
+        self.stages = list(stages)
+        self.labels = labels or {}
+        self.stage_gauge = registry.gauge('stt_watchdog_stage', "Ступень упрощения распознавания (0 — полный режим)",
+                                          **self.labels)
+        self.load_gauge = registry.gauge('stt_realtime_load', "Время обработки на секунду входного аудио (сглаженное)",
+                                         **self.labels)
+        self.transitions = []
+        self.level = 0
+        self.load = None
+        self.backlog = 0.0
+        self.pressure_since = None
+        self.calm_since = None
+        self.stage_gauge.set(0)
+    @property
+    def active_stages(self):
+        return self.stages[:self.level]
+    def observe(self, processing_seconds, audio_seconds, backlog_ratio, now=None):
+        if audio_seconds <= 0:
+            return None
+        now = time.monotonic() if now is None else now
+        load = processing_seconds / audio_seconds
+        self.load = load if self.load is None else self.load + self.smoothing * (load - self.load)
+        self.backlog = backlog_ratio
+        self.load_gauge.set(round(self.load, 3))
+        pressure = self.load > self.high_load or backlog_ratio > self.high_backlog
+        calm = self.load < self.low_load and backlog_ratio < self.low_backlog
+        if not pressure:
+            self.pressure_since = None
+        elif self.pressure_since is None:
+            self.pressure_since = now
+        if not calm:
+            self.calm_since = None
+        elif self.calm_since is None:
+            self.calm_since = now
+        if pressure and self.level < len(self.stages) and now - self.pressure_since >= self.degrade_after:
+            return self._transition(self.level + 1, now)
+        if calm and self.level > 0 and now - self.calm_since >= self.recover_after:
+            return self._transition(self.level - 1, now)
+        return None
+    def _transition(self, level, now):
+        degraded = level > self.level
+        stage = self.stages[level - 1] if degraded else self.stages[level]
+        direction = 'degraded' if degraded else 'restored'
+        self.level = level
+        self.pressure_since = None
+        self.calm_since = None
+        self.counts[direction] += 1
+        self.stage_gauge.set(level)
+        registry.counter('stt_watchdog_transitions_total', "Переключения ступеней упрощения",
+                         direction=direction, stage=stage, **self.labels).inc()
+        transition = {'time': now, 'stage': stage, 'degraded': degraded, 'level': level,
+                      'load': round(self.load, 3), 'backlog': round(self.backlog, 3)}
+        self.transitions.append(transition)
+        return transition
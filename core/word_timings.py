@@ -0,0 +1,44 @@
+from array import array
+class WordTimings:
+    __slots__ = ('words', 'starts', 'ends', 'confidences')
+    def __init__(self):
+        self.words = []
+        self.starts = array('f')
+        self.ends = array('f')
+        self.confidences = array('f')
+    @classmethod
+    def from_result(cls, items):
+        timings = cls()
+        for item in items or ():
+            timings.append(item.get('word', ''), item.get('start', 0.0), item.get('end', 0.0),
+                           item.get('conf', 1.0))
+        return timings
+    def append(self, word, start, end, confidence=1.0):
+        self.words.append(word)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.confidences.append(confidence)
+    def extend(self, other, offset=0.0):
+        self.words.extend(other.words)
+        if offset:
+            self.starts.extend(start + offset for start in other.starts)
+            self.ends.extend(end + offset for end in other.ends)
+        else:
+            self.starts.extend(other.starts)
+            self.ends.extend(other.ends)
+        self.confidences.extend(other.confidences)
+    def __len__(self):
+        return len(self.words)
+    def __iter__(self):
+        return zip(self.words, self.starts, self.ends, self.confidences)
+    def to_dict(self):
+        return {'word': self.words, 'start': [round(value, 3) for value in self.starts],
+                'end': [round(value, 3) for value in self.ends],
+                'conf': [round(value, 3) for value in self.confidences]}
+class RecognitionResult:
+    __slots__ = ('kind', 'text', 'words', 'parse_seconds')
+    def __init__(self, kind, text, words=None, parse_seconds=0.0):
+        self.kind = kind
+        self.text = text
+        self.words = words
+        self.parse_seconds = parse_seconds
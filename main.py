@@ -1,6 +1,28 @@
-import tkinter as tk
-from app import SpeechToTextApp
-def main():
+import argparse
+import json
+import sys
+from core.startup_profile import profiler
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Распознавание речи в реальном времени")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="Вывести в stderr JSON с временем импорта и запуска")
+    parser.add_argument('--exit-after-startup', action='store_true',
+                        help="Закрыть окно сразу после готовности (для замеров)")
+    parser.add_argument('--startup-budget', action='append', default=[], metavar='ЭТАП=МС',
+                        help="Допустимое время этапа, например first_paint=500; при превышении код возврата 1")
+    return parser.parse_args(argv)
+def parse_budgets(items):
+    budgets = {}
+    for item in items:
+        name, _, limit = item.partition('=')
+        budgets[name] = float(limit)
+    return budgets
+def main(argv=None):
+    args = parse_args(argv)
+    import tkinter as tk
+    profiler.mark('tk_imported')
+    from app import SpeechToTextApp
+    profiler.mark('app_imported')
     root = tk.Tk()
     def on_closing():
         try:
@@ -14,6 +36,15 @@ def main():
     root.protocol("WM_DELETE_WINDOW", on_closing)
     app = SpeechToTextApp(root)
     root.app_instance = app
+    if args.exit_after_startup:
+        root.after_idle(lambda: root.after(0, on_closing))
     root.mainloop()
+    budgets = parse_budgets(args.startup_budget)
+    violations = profiler.check_budgets(budgets)
+    if args.profile_startup or budgets:
+        report = profiler.report()
+        report['budget_violations'] = violations
+        print(json.dumps(report, ensure_ascii=False, indent=2), file=sys.stderr)
+    return 1 if violations else 0
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
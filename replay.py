@@ -0,0 +1,97 @@
+import argparse
+import json
+import sys
+from contextlib import redirect_stdout
+from core.model_manager import ModelManager
+from core.replay_harness import ReplayHarness, load_corpus, compare_runs, format_comparison
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Прогон корпуса с эталонными текстами: точность и скорость")
+    commands = parser.add_subparsers(dest='command', required=True)
+    run = commands.add_parser('run', help="Распознать корпус и сохранить отчёт прогона")
+    run.add_argument('inputs', nargs='+',
+                     help="Папки с аудио и эталонами <имя>.txt рядом, файлы или манифест .jsonl "
+                          "со строками {\"audio\": ..., \"reference\": ...}")
+    run.add_argument('-m', '--model', required=True, help="Путь к папке с моделью Vosk")
+    run.add_argument('-o', '--output', required=True, help="Файл JSON для отчёта прогона")
+    run.add_argument('--label', help="Название прогона в сравнении (по умолчанию имя модели)")
+    run.add_argument('--chunk', type=int, default=8192, help="Размер чанка в фреймах")
+    run.add_argument('--queue-size', type=int, default=10, help="Размер audio_queue")
+    run.add_argument('--policy', default='drop_oldest', choices=['queue', 'block', 'drop_oldest', 'drop_newest'],
+                     help="Буфер аудио: queue.Queue или кольцевой буфер с политикой переполнения")
+    run.add_argument('--paced', action='store_true', help="Выдавать аудио в реальном времени")
+    run.add_argument('--vad', action='store_true', help="Пропускать тишину детектором речи")
+    run.add_argument('--words', action='store_true', help="Включить тайминги слов (SetWords)")
+    run.add_argument('--partial-interval', type=float, default=0.2,
+                     help="Минимальный интервал между частичными результатами, сек")
+    run.add_argument('--no-partials', action='store_true', help="Не запрашивать частичные результаты")
+    run.add_argument('--compare-with', metavar='BASELINE', help="Сразу сравнить с сохранённым прогоном")
+    add_threshold_args(run)
+    compare = commands.add_parser('compare', help="Сравнить два сохранённых прогона")
+    compare.add_argument('baseline', help="Отчёт базового прогона")
+    compare.add_argument('candidate', help="Отчёт нового прогона")
+    add_threshold_args(compare)
+    compare.add_argument('-o', '--output', help="Файл для сравнения (.json или Markdown, по умолчанию stdout)")
+    return parser.parse_args(argv)
+def add_threshold_args(parser):
+    parser.add_argument('--max-wer-increase', type=float, default=0.005,
+                        help="Допустимый рост WER в абсолютных долях")
+    parser.add_argument('--max-rtf-increase', type=float, default=0.10,
+                        help="Допустимый относительный рост RTF")
+def run_corpus(args):
+    entries = load_corpus(args.inputs)
+    if not entries:
+        print("В корпусе нет аудиофайлов", file=sys.stderr)
+        return None
+    with redirect_stdout(sys.stderr):
+        model_manager = ModelManager()
+        model_manager.model_path = args.model
+        loaded = model_manager.load_model()
+    if not loaded:
+        print("Модель не создана", file=sys.stderr)
+        return None
+    harness = ReplayHarness(model_manager, label=args.label, chunk=args.chunk, queue_size=args.queue_size,
+                            policy=args.policy, paced=args.paced, vad=args.vad, words=args.words,
+                            partials=not args.no_partials, partial_interval=args.partial_interval)
+    for entry in entries:
+        if entry['reference'] is None:
+            print(f"Нет эталона для {entry['audio']}: WER не считается", file=sys.stderr)
+    run = harness.run(entries)
+    write_json(run, args.output)
+    summary = run['summary']
+    wer = f"{summary['wer']:.2%}" if summary['wer'] is not None else "–"
+    print(f"Файлов: {summary['files']}, WER: {wer}, аудио: {summary['audio_seconds']:.1f} сек, "
+          f"время: {summary['wall_seconds']:.1f} сек, RTF: {summary['rtf'] or 0:.3f}", file=sys.stderr)
+    return run
+def load_run(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+def write_json(data, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+def write_comparison(comparison, path):
+    if path and path.lower().endswith(".json"):
+        write_json(comparison, path)
+        return
+    text = format_comparison(comparison)
+    if path:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text)
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == 'run':
+        candidate = run_corpus(args)
+        if candidate is None:
+            return 1
+        if not args.compare_with:
+            return 0
+        baseline, path = load_run(args.compare_with), None
+    else:
+        baseline, candidate, path = load_run(args.baseline), load_run(args.candidate), args.output
+    comparison = compare_runs(baseline, candidate, max_wer_increase=args.max_wer_increase,
+                              max_rtf_increase=args.max_rtf_increase)
+    write_comparison(comparison, path)
+    return 1 if comparison['regressions'] else 0
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+import argparse
+import os
+import stat
+import sys
+from core.model_manager import ModelManager
+from core.recognition_server import TCPRecognitionServer, UnixRecognitionServer
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Сервер распознавания речи с общей моделью")
+    parser.add_argument('-m', '--model', required=True, help="Путь к папке с моделью Vosk")
+    parser.add_argument('--host', default='127.0.0.1', help="Адрес TCP")
+    parser.add_argument('--port', type=int, default=2700, help="Порт TCP")
+    parser.add_argument('--unix', help="Путь к Unix-сокету вместо TCP")
+    parser.add_argument('--rate', type=int, default=16000, help="Частота дискретизации потоков")
+    parser.add_argument('--max-sessions', type=int, default=16, help="Максимум одновременных сессий")
+    parser.add_argument('--session-wait', type=float, default=0.0,
+                        help="Сколько секунд ждать свободную сессию перед отказом")
+    parser.add_argument('--idle-timeout', type=float, default=30.0,
+                        help="Закрывать сессию, если клиент не присылает данные столько секунд (0 — без ограничения)")
+    parser.add_argument('--read-size', type=int, default=8192, help="Размер чтения из сокета в байтах")
+    parser.add_argument('--recv-buffer', type=int, default=65536, help="Размер буфера приёма сокета")
+    parser.add_argument('--no-partials', action='store_true', help="Не отправлять частичные результаты")
+    return parser.parse_args(argv)
+def main(argv=None):
+    args = parse_args(argv)
+    model_manager = ModelManager()
+    is_valid, message = model_manager.validate_model_path(args.model)
+    if not is_valid:
+        print(f"Некорректная модель: {message}", file=sys.stderr)
+        return 1
+    model_manager.model_path = args.model
+    print("Загрузка модели...")
+    if not model_manager.load_model():
+        print("Модель не создана", file=sys.stderr)
+        return 1
+    options = dict(sample_rate=args.rate, max_sessions=args.max_sessions,
+                   session_wait=args.session_wait, idle_timeout=args.idle_timeout, read_size=args.read_size,
+                   recv_buffer=args.recv_buffer, partials=not args.no_partials)
+    if args.unix:
+        if UnixRecognitionServer is None:
+            print("Unix-сокеты не поддерживаются в этой системе", file=sys.stderr)
+            return 1
+        if os.path.lexists(args.unix):
+            if not stat.S_ISSOCK(os.lstat(args.unix).st_mode):
+                print(f"{args.unix} существует и не является сокетом", file=sys.stderr)
+                return 1
+            os.unlink(args.unix)
+        server = UnixRecognitionServer(args.unix, model_manager, **options)
+        address = args.unix
+    else:
+        server = TCPRecognitionServer((args.host, args.port), model_manager, **options)
+        address = f"{args.host}:{server.server_address[1]}"
+    print(f"Сервер запущен: {address}, модель: {model_manager.get_model_name()}, "
+          f"лимит сессий: {args.max_sessions}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Сервер остановлен: {server.stats}")
+    return 0
+if __name__ == "__main__":
+    sys.exit(main())
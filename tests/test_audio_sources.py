@@ -0,0 +1,57 @@
+import io
+import wave
+from core.audio_sources import (ReplaySource, PcmStreamSource, RawFileSource, WavFileSource, SyntheticSource,
+                                create_audio_source)
+def read_all(source):
+    chunks = []
+    source.open()
+    while True:
+        data = source.read_chunk()
+        if data is None:
+            break
+        chunks.append(data)
+    source.close()
+    return chunks
+def test_replay_source_splits_into_chunks_and_tracks_duration():
+    data = bytes(range(256)) * 10
+    source = ReplaySource(data, sample_rate=16000, chunk=300)
+    chunks = read_all(source)
+    assert b"".join(chunks) == data
+    assert [len(chunk) for chunk in chunks] == [600, 600, 600, 600, 160]
+    assert source.duration == len(data) / 2 / 16000
+def test_replay_source_loops_and_seeks():
+    source = ReplaySource(b"\x01\x00" * 10, chunk=10, loops=3)
+    assert len(b"".join(read_all(source))) == 60
+    source = ReplaySource(b"".join(bytes([i, 0]) for i in range(10)), chunk=4)
+    source.open()
+    source.seek(6)
+    assert source.read_chunk() == b"\x06\x00\x07\x00\x08\x00\x09\x00"
+def test_pcm_stream_source_keeps_frames_aligned_across_short_reads():
+    class Trickle(io.BytesIO):
+        def read(self, size=-1):
+            return super().read(min(size, 3))
+    data = bytes(range(100))
+    chunks = read_all(PcmStreamSource(Trickle(data), chunk=8))
+    assert all(len(chunk) % 2 == 0 for chunk in chunks)
+    assert b"".join(chunks) == data
+def test_raw_and_wav_file_sources_read_the_same_samples(tmp_path):
+    samples = bytes(range(200)) * 4
+    raw_path = tmp_path / "audio.raw"
+    raw_path.write_bytes(samples)
+    wav_path = tmp_path / "audio.wav"
+    with wave.open(str(wav_path), 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(8000)
+        wav.writeframes(samples)
+    wav_source = create_audio_source(str(wav_path), chunk=64)
+    raw_source = create_audio_source(str(raw_path), chunk=64, sample_rate=8000)
+    assert isinstance(wav_source, WavFileSource) and isinstance(raw_source, RawFileSource)
+    assert wav_source.sample_rate == 8000
+    assert b"".join(read_all(wav_source)) == b"".join(read_all(raw_source)) == samples
+def test_synthetic_source_alternates_speech_and_silence():
+    source = create_audio_source("synthetic:3", chunk=16000)
+    assert isinstance(source, SyntheticSource)
+    chunks = read_all(source)
+    assert len(chunks) == 3
+    assert any(chunks[0]) and any(chunks[1]) and not any(chunks[2])
@@ -0,0 +1,29 @@
+import json
+import pytest
+from core.grammar import PhraseGrammar
+from utils.helpers import Utils
+def test_word_error_rate_counts_substitutions_insertions_and_deletions():
+    assert Utils.word_error_rate("включи свет", "включи свет")['wer'] == 0
+    result = Utils.word_error_rate("включи свет в комнате", "выключи свет комнате сейчас")
+    assert result['errors'] == 3
+    assert result['wer'] == pytest.approx(0.75)
+    assert result['reference_words'] == 4 and result['hypothesis_words'] == 4
+def test_word_error_rate_normalizes_case_punctuation_yo_and_unknown():
+    assert Utils.word_error_rate("Ещё раз, пожалуйста!", "еще раз [unk] пожалуйста")['wer'] == 0
+def test_word_error_rate_with_empty_reference():
+    assert Utils.word_error_rate("", "")['wer'] == 0
+    assert Utils.word_error_rate("", "шум")['wer'] == 1.0
+def test_grammar_normalizes_and_deduplicates_phrases():
+    grammar = PhraseGrammar(["Включи  свет", "включи свет", "", "[unk]", "стоп"])
+    assert grammar.phrases == ["включи свет", "стоп"]
+    assert json.loads(grammar.to_json()) == ["включи свет", "стоп", "[unk]"]
+    assert json.loads(PhraseGrammar(["стоп"], allow_unknown=False).to_json()) == ["стоп"]
+def test_grammar_from_text_and_json_files(tmp_path):
+    text_file = tmp_path / "команды.txt"
+    text_file.write_text("# комментарий\nвперёд\nназад\n", encoding='utf-8')
+    json_file = tmp_path / "команды.json"
+    json_file.write_text('["вперёд", "назад"]', encoding='utf-8')
+    assert PhraseGrammar.from_file(str(text_file)).phrases == ["вперёд", "назад"]
+    assert PhraseGrammar.from_file(str(json_file)).name == "команды.json"
+    with pytest.raises(ValueError):
+        PhraseGrammar(["", "  "])
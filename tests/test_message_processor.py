@@ -0,0 +1,54 @@
+import queue
+import pytest
+pytest.importorskip('tkinter')
+from components.message_processor import MessageProcessor
+class Pane:
+    def __init__(self):
+        self.appends = []
+        self.options = {}
+    def append(self, entries):
+        self.appends.append(list(entries))
+    def config(self, **kwargs):
+        self.options.update(kwargs)
+class Root:
+    def __init__(self):
+        self.scheduled = []
+    def after(self, interval, callback):
+        self.scheduled.append(interval)
+class App:
+    def __init__(self):
+        self.ui_queue = queue.Queue()
+        self.root = Root()
+        self.ui_elements = {'log_view': Pane(), 'text_view': Pane(), 'status_label': Pane()}
+def test_tick_batches_messages_into_one_append_per_pane():
+    app = App()
+    processor = MessageProcessor(app)
+    for n in range(50):
+        processor.queue_message("log", "", f"строка {n}")
+    processor.queue_message("text", "", "привет")
+    processor.queue_message("status", "", "готово", fg="black")
+    processor._process_queue()
+    log_view, text_view = app.ui_elements['log_view'], app.ui_elements['text_view']
+    assert len(log_view.appends) == 1 and len(log_view.appends[0]) == 50
+    assert len(text_view.appends) == 1 and text_view.appends[0][0].endswith("привет\n")
+    assert app.ui_elements['status_label'].options == {'text': "готово", 'fg': "black"}
+    assert app.root.scheduled == [processor.base_interval]
+def test_backlog_shortens_the_next_tick():
+    app = App()
+    processor = MessageProcessor(app)
+    processor.max_messages_per_tick = 10
+    for n in range(25):
+        processor.queue_message("log", "", f"строка {n}")
+    processor._process_queue()
+    assert app.root.scheduled == [processor.min_interval]
+    assert processor.get_metrics()['max_backlog'] == 15
+def test_partials_are_merged_by_prefix_and_flushed_before_the_final():
+    app = App()
+    processor = MessageProcessor(app)
+    processor.queue_message("partial", "", "при", prefix=0)
+    processor.queue_message("partial", "", "вет", prefix=3)
+    processor.queue_message("text", "", "привет")
+    processor._process_queue()
+    entries = app.ui_elements['log_view'].appends[0]
+    assert len(entries) == 1 and entries[0].endswith("ЧАСТИЧНО: 'привет'\n")
+    assert processor.partial_texts == {}
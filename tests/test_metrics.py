@@ -0,0 +1,52 @@
+import json
+import pytest
+from core.metrics import MetricsRegistry, Histogram
+def test_histogram_buckets_and_quantiles():
+    histogram = Histogram(buckets=(0.01, 0.1, 1.0))
+    assert histogram.quantile(0.5) is None
+    for value in (0.005, 0.05, 0.05, 0.5, 5.0):
+        histogram.observe(value)
+    assert histogram.quantile(0.5) == 0.1
+    assert histogram.quantile(0.99) == float('inf')
+    snapshot = histogram.snapshot()
+    assert snapshot['count'] == 5 and snapshot['sum'] == pytest.approx(5.605)
+    assert snapshot['buckets'] == {'0.01': 1, '0.1': 3, '1.0': 4, '+Inf': 5}
+def test_registry_reuses_metrics_per_label_set_and_totals_families():
+    registry = MetricsRegistry()
+    registry.counter('chunks_total', source='a').inc()
+    registry.counter('chunks_total', source='a').inc(2)
+    registry.counter('chunks_total', source='b').inc()
+    assert registry.value('chunks_total', source='a') == 3
+    assert registry.total('chunks_total') == 4
+    assert registry.value('missing', default=None) is None
+def test_merged_quantile_across_labels():
+    registry = MetricsRegistry()
+    registry.histogram('decode_seconds', buckets=(0.1, 1.0), source='a').observe(0.05)
+    for _ in range(3):
+        registry.histogram('decode_seconds', buckets=(0.1, 1.0), source='b').observe(0.5)
+    assert registry.quantile('decode_seconds', 0.5) == 1.0
+    assert registry.quantile('decode_seconds', 0.25) == 0.1
+def test_prometheus_text_format():
+    registry = MetricsRegistry()
+    registry.counter('stt_results_total', "Результатов", kind='final').inc(2)
+    registry.gauge('stt_queue_depth', source='Mic "1"\n').set(3)
+    registry.histogram('stt_decode_seconds', "Время", buckets=(0.1,)).observe(0.05)
+    lines = registry.to_prometheus().splitlines()
+    assert "# HELP stt_results_total Результатов" in lines
+    assert "# TYPE stt_results_total counter" in lines
+    assert 'stt_results_total{kind="final"} 2' in lines
+    assert "# TYPE stt_queue_depth gauge" in lines
+    assert 'stt_queue_depth{source="Mic \\"1\\"\\n"} 3' in lines
+    assert lines.count("# TYPE stt_decode_seconds histogram") == 1
+    assert 'stt_decode_seconds_bucket{le="0.1"} 1' in lines
+    assert 'stt_decode_seconds_bucket{le="+Inf"} 1' in lines
+    assert "stt_decode_seconds_sum 0.05" in lines and "stt_decode_seconds_count 1" in lines
+def test_export_writes_prometheus_or_json(tmp_path):
+    registry = MetricsRegistry()
+    registry.counter('stt_results_total').inc()
+    prom = registry.export(str(tmp_path / "metrics.prom"))
+    with open(prom, encoding='utf-8') as f:
+        assert "stt_results_total 1" in f.read()
+    with open(registry.export(str(tmp_path / "metrics.json")), encoding='utf-8') as f:
+        assert json.load(f)['metrics']['stt_results_total'] == [{'labels': {}, 'value': 1}]
+    assert not list(tmp_path.glob("*.tmp"))
@@ -0,0 +1,33 @@
+from core.multi_device import DeviceSession, MultiDeviceRecorder
+DEVICE = {'index': 3, 'name': 'USB Mic'}
+def make_session(messages):
+    return DeviceSession(DEVICE, None, lambda *args, **kwargs: messages.append((args, kwargs)),
+                         audio_settings={'chunk': 1024})
+def test_messages_and_results_are_labeled_with_the_device():
+    messages = []
+    session = make_session(messages)
+    assert session.audio_manager.input_device_index == 3
+    assert session.audio_manager.chunk == 1024
+    session.queue_message("text", "", "привет")
+    session.queue_message("status", "", "готово")
+    assert messages[0] == (("text", "", "[USB Mic] привет"), {'source': "[USB Mic]"})
+    assert messages[1] == (("status", "", "готово"), {})
+    received = []
+    def listener(kind, text, result, source=None):
+        received.append((kind, text, source))
+    session.add_result_listener(listener)
+    session.recording_manager._notify_result('final', "привет", None)
+    session.remove_result_listener(listener)
+    session.recording_manager._notify_result('final', "ещё", None)
+    assert received == [('final', "привет", "[USB Mic]")]
+def test_stop_drains_by_default():
+    session = make_session([])
+    session.begin()
+    session.stop()
+    assert session.stop_flags['recording'].is_set()
+    assert not session.stop_flags['processing'].is_set()
+    session.stop(drain=False)
+    assert session.stop_flags['processing'].is_set()
+def test_worker_count_scales_with_devices():
+    assert MultiDeviceRecorder.worker_count(0) == MultiDeviceRecorder.THREADS_PER_DEVICE
+    assert MultiDeviceRecorder.worker_count(3) == 3 * MultiDeviceRecorder.THREADS_PER_DEVICE
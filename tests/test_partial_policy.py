@@ -0,0 +1,28 @@
+from core.partial_policy import PartialResultPolicy
+def test_unchanged_and_throttled_partials_are_coalesced():
+    policy = PartialResultPolicy(min_interval=0.2)
+    assert policy.update("при", now=1.0) == (0, "при")
+    assert policy.update("при", now=2.0) is None
+    assert policy.update("прив", now=2.1) == (3, "в")
+    assert policy.update("привет", now=2.2) is None
+    assert policy.update("привет мир", now=2.4) == (4, "ет мир")
+    stats = policy.stats
+    assert stats['emitted'] == 3 and stats['unchanged'] == 1 and stats['throttled'] == 1
+    assert stats['chars_saved'] == 7
+def test_without_diff_the_whole_text_is_sent():
+    policy = PartialResultPolicy(min_interval=0, diff=False)
+    policy.update("раз", now=0)
+    assert policy.update("раз два", now=0) == (0, "раз два")
+def test_polling_requires_consumers_and_enabled_policy():
+    policy = PartialResultPolicy()
+    assert policy.should_poll(True)
+    assert not policy.should_poll(False)
+    assert not PartialResultPolicy(enabled=False).should_poll(True)
+    assert policy.stats['polls'] == 1 and policy.stats['skipped_polls'] == 1
+def test_reset_after_final_starts_a_new_phrase():
+    policy = PartialResultPolicy(min_interval=0)
+    policy.update("раз", now=0)
+    assert policy.is_active
+    policy.reset()
+    assert not policy.is_active
+    assert policy.update("раз", now=1) == (0, "раз")
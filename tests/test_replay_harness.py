@@ -0,0 +1,54 @@
+import json
+import pytest
+from core.replay_harness import ReplayHarness, load_corpus, compare_runs, format_comparison
+def make_run(label, files, latencies=(0.2, 0.3), **config):
+    return {'label': label, 'config': dict(ReplayHarness.DEFAULT_CONFIG, **config),
+            'summary': ReplayHarness.summarize(files, {'final': list(latencies), 'partial': []}),
+            'files': files}
+def record(name, text, errors, wall, reference_words=4, audio=10.0):
+    return {'file': name, 'text': text, 'audio_seconds': audio, 'wall_seconds': wall,
+            'dropped_chunks': 0, 'wer': errors / reference_words, 'errors': errors,
+            'reference_words': reference_words}
+def test_summary_uses_corpus_level_wer_and_throughput():
+    files = [record('a.wav', "раз", 1, 2.0, reference_words=2), record('b.wav', "два", 1, 3.0, reference_words=8),
+             dict(record('c.wav', "три", 0, 5.0), wer=None, errors=None, reference_words=None)]
+    summary = make_run('base', files)['summary']
+    assert summary['wer'] == pytest.approx(0.2)
+    assert summary['scored_files'] == 2
+    assert summary['rtf'] == pytest.approx(1 / 3)
+    assert summary['throughput'] == pytest.approx(3.0)
+    assert summary['final_latency']['p50'] == 0.2
+def test_compare_flags_wer_and_rtf_regressions_and_changed_texts():
+    base = make_run('base', [record('a.wav', "включи свет", 0, 1.0), record('b.wav', "стоп", 1, 1.0)])
+    cand = make_run('vad', [record('a.wav', "включи свет", 0, 1.5), record('b.wav', "стоп стоп", 2, 1.5)],
+                    vad=True)
+    comparison = compare_runs(base, cand, max_wer_increase=0.01, max_rtf_increase=0.10)
+    assert comparison['metrics']['wer']['delta'] == pytest.approx(0.125)
+    assert comparison['metrics']['rtf']['relative'] == pytest.approx(0.5)
+    assert len(comparison['regressions']) == 2
+    assert [item['file'] for item in comparison['changed_files']] == ['b.wav']
+    assert comparison['changed_files'][0]['difference'] == pytest.approx(1.0)
+    report = format_comparison(comparison)
+    assert "# base → vad" in report
+    assert "vad: False → True" in report
+    assert "| wer | 0.1250 | 0.2500 | +0.1250 ⚠ |" in report
+def test_compare_without_regressions():
+    base = make_run('base', [record('a.wav', "раз", 1, 2.0)])
+    cand = make_run('fast', [record('a.wav', "раз", 1, 1.0)], latencies=(0.1,))
+    comparison = compare_runs(base, cand)
+    assert comparison['regressions'] == [] and comparison['changed_files'] == []
+    assert "| rtf | 0.2000 | 0.1000 | -0.1000 ✅ |" in format_comparison(comparison)
+    assert "Регрессии: нет" in format_comparison(comparison)
+def test_load_corpus_from_directory_and_manifest(tmp_path):
+    (tmp_path / "a.wav").write_bytes(b"")
+    (tmp_path / "a.txt").write_text("привет мир", encoding='utf-8')
+    (tmp_path / "b.raw").write_bytes(b"")
+    (tmp_path / "notes.md").write_text("", encoding='utf-8')
+    entries = load_corpus([str(tmp_path)])
+    assert [(entry['audio'].split('/')[-1], entry['reference']) for entry in entries] == [
+        ("a.wav", "привет мир"), ("b.raw", None)]
+    manifest = tmp_path / "corpus.jsonl"
+    manifest.write_text(json.dumps({'audio': "b.raw", 'reference': "тест"}) + "\n\n", encoding='utf-8')
+    assert load_corpus([str(manifest)]) == [{'audio': str(tmp_path / "b.raw"), 'reference': "тест"}]
+    with pytest.raises(FileNotFoundError):
+        load_corpus([str(tmp_path / "missing.wav")])
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from core.resampler import AudioResampler
+def tone(rate, seconds=1.0, channels=1, frequency=440):
+    t = np.arange(int(rate * seconds)) / rate
+    samples = (8000 * np.sin(2 * np.pi * frequency * t)).astype(np.int16)
+    return np.repeat(samples, channels).tobytes()
+def run(resampler, data, step):
+    return b"".join(resampler.process(data[offset:offset + step]) for offset in range(0, len(data), step))
+@pytest.mark.parametrize('quality', AudioResampler.QUALITIES)
+@pytest.mark.parametrize('rate,channels', [(48000, 1), (44100, 2), (8000, 1)])
+def test_output_does_not_depend_on_chunk_boundaries(quality, rate, channels):
+    data = tone(rate, channels=channels)
+    whole = AudioResampler(rate, 16000, channels, quality).process(data)
+    for step in (4096, 1234 * 2 * channels + 2, 999):
+        assert run(AudioResampler(rate, 16000, channels, quality), data, step) == whole
+@pytest.mark.parametrize('quality', AudioResampler.QUALITIES)
+def test_output_length_matches_the_rate_ratio(quality):
+    output = AudioResampler(48000, 16000, 1, quality).process(tone(48000, seconds=2))
+    assert abs(len(output) // 2 - 32000) <= 2
+def test_stereo_is_downmixed_by_averaging():
+    left = np.full(100, 1000, dtype=np.int16)
+    right = np.full(100, 3000, dtype=np.int16)
+    data = np.column_stack((left, right)).tobytes()
+    output = np.frombuffer(AudioResampler(16000, 16000, 2).process(data), dtype=np.int16)
+    assert len(output) == 100 and np.all(output == 2000)
+def test_passthrough_returns_input_unchanged():
+    resampler = AudioResampler(16000, 16000, 1)
+    data = tone(16000, 0.1)
+    assert resampler.is_passthrough and resampler.process(data) is data
+def test_high_quality_attenuates_frequencies_above_the_new_nyquist():
+    data = tone(48000, frequency=12000)
+    linear = np.frombuffer(AudioResampler(48000, 16000, 1, 'linear').process(data), dtype=np.int16)
+    high = np.frombuffer(AudioResampler(48000, 16000, 1, 'high').process(data), dtype=np.int16)
+    assert np.abs(high[100:]).mean() < np.abs(linear[100:]).mean() / 10
+def test_unknown_quality_is_rejected():
+    with pytest.raises(ValueError):
+        AudioResampler(48000, quality='best')
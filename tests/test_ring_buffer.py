@@ -0,0 +1,57 @@
+import queue
+import threading
+import pytest
+from core.ring_buffer import AudioRingBuffer
+def chunk(value, size=4):
+    return bytes([value]) * size
+def test_fifo_order_and_stats():
+    buffer = AudioRingBuffer(slots=4, slot_size=4)
+    for value in range(3):
+        buffer.put(chunk(value))
+    assert buffer.qsize() == 3
+    assert [buffer.get_nowait() for _ in range(3)] == [chunk(0), chunk(1), chunk(2)]
+    assert buffer.empty()
+    with pytest.raises(queue.Empty):
+        buffer.get_nowait()
+    assert buffer.get_stats()['written'] == buffer.get_stats()['read'] == 3
+def test_large_put_is_split_into_slots():
+    buffer = AudioRingBuffer(slots=4, slot_size=4)
+    buffer.put(b"abcdefghij")
+    assert [buffer.get_nowait() for _ in range(3)] == [b"abcd", b"efgh", b"ij"]
+def test_drop_oldest_keeps_the_newest_chunks():
+    buffer = AudioRingBuffer(slots=3, slot_size=4, policy=AudioRingBuffer.POLICY_DROP_OLDEST)
+    for value in range(5):
+        buffer.put_nowait(chunk(value))
+    assert buffer.full()
+    assert [buffer.get_nowait() for _ in range(3)] == [chunk(2), chunk(3), chunk(4)]
+    stats = buffer.get_stats()
+    assert stats['overruns'] == 2 and stats['dropped_oldest'] == 2
+def test_drop_newest_keeps_the_oldest_chunks():
+    buffer = AudioRingBuffer(slots=3, slot_size=4, policy=AudioRingBuffer.POLICY_DROP_NEWEST)
+    for value in range(5):
+        buffer.put_nowait(chunk(value))
+    assert [buffer.get_nowait() for _ in range(3)] == [chunk(0), chunk(1), chunk(2)]
+    assert buffer.get_stats()['dropped_newest'] == 2
+def test_block_policy_raises_full_or_waits_for_the_reader():
+    buffer = AudioRingBuffer(slots=2, slot_size=4, policy=AudioRingBuffer.POLICY_BLOCK)
+    buffer.put(chunk(0))
+    buffer.put(chunk(1))
+    with pytest.raises(queue.Full):
+        buffer.put_nowait(chunk(2))
+    with pytest.raises(queue.Full):
+        buffer.put(chunk(2), timeout=0.01)
+    threading.Timer(0.05, buffer.get).start()
+    buffer.put(chunk(3), timeout=2)
+    assert [buffer.get_nowait() for _ in range(2)] == [chunk(1), chunk(3)]
+def test_reader_skips_to_the_newest_chunk_after_bounded_retries():
+    buffer = AudioRingBuffer(slots=4, slot_size=4)
+    for value in range(4):
+        buffer.put(chunk(value))
+    buffer.sequence[0] = 0
+    assert buffer.get_nowait() == chunk(3)
+    stats = buffer.get_stats()
+    assert stats['read_retries'] == buffer.max_read_retries + 1
+    assert stats['skipped'] == 3
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        AudioRingBuffer(policy='unknown')
@@ -0,0 +1,48 @@
+import os
+from core.transcript_journal import TranscriptJournal, JournalReader, INDEX_RECORD
+from core.word_timings import WordTimings, RecognitionResult
+def write_session(directory, texts, **kwargs):
+    journal = TranscriptJournal(str(directory), fsync_interval=60, **kwargs).open()
+    for text in texts:
+        journal.write('final', text)
+        journal.flush()
+    journal.close()
+    return journal
+def test_round_trip_with_words_and_partials(tmp_path):
+    journal = TranscriptJournal(str(tmp_path), include_partials=False, fsync_interval=60).open()
+    words = WordTimings.from_result([{'word': 'привет', 'start': 0.5, 'end': 0.9, 'conf': 0.8}])
+    journal.write('partial', "при")
+    journal.write('final', "привет", RecognitionResult('final', "привет", words), source="[Mic]")
+    journal.close()
+    records = list(JournalReader(str(tmp_path), journal.session_id).read())
+    assert len(records) == 1
+    assert records[0]['text'] == "привет" and records[0]['source'] == "[Mic]"
+    assert records[0]['words'] == {'word': ['привет'], 'start': [0.5], 'end': [0.9], 'conf': [0.8]}
+def test_segments_roll_over_and_are_read_as_one_sequence(tmp_path):
+    texts = [f"фраза {n}" for n in range(20)]
+    journal = write_session(tmp_path, texts, segment_max_bytes=200)
+    assert os.path.exists(os.path.join(tmp_path, f"{journal.session_id}.0001.jsonl"))
+    reader = JournalReader(str(tmp_path), journal.session_id)
+    assert len(reader.segments) > 1
+    assert len(reader) == 20
+    assert [record['text'] for record in reader.read()] == texts
+    assert [record['n'] for record in reader.read(7, 5)] == [7, 8, 9, 10, 11]
+def test_index_lookup_by_time_and_search(tmp_path):
+    journal = write_session(tmp_path, ["один", "два", "три"], segment_max_bytes=40)
+    reader = JournalReader(str(tmp_path), journal.session_id)
+    records = list(reader.read())
+    assert reader.find_time(records[1]['t']) == 1
+    assert [record['text'] for record in reader.read_since(records[2]['t'])] == ["три"]
+    assert [record['text'] for record in reader.search("ДВА")] == ["два"]
+def test_torn_index_tail_is_ignored(tmp_path):
+    journal = write_session(tmp_path, ["один", "два"])
+    index_path = os.path.join(tmp_path, f"{journal.session_id}.0000.idx")
+    with open(index_path, 'ab') as f:
+        f.write(b"\x00" * (INDEX_RECORD.size // 2))
+    assert [record['text'] for record in JournalReader(str(tmp_path), journal.session_id).read()] == ["один", "два"]
+def test_sessions_started_in_the_same_second_do_not_share_files(tmp_path):
+    first = write_session(tmp_path, ["первая"])
+    second = write_session(tmp_path, ["вторая"])
+    assert first.session_id != second.session_id
+    assert JournalReader.list_sessions(str(tmp_path)) == sorted([first.session_id, second.session_id])
+    assert [record['text'] for record in JournalReader(str(tmp_path), second.session_id).read()] == ["вторая"]
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+from core.vad import VoiceActivityDetector
+RATE = 16000
+def tone(seconds, amplitude=8000):
+    t = np.arange(int(RATE * seconds)) / RATE
+    return (amplitude * np.sin(2 * np.pi * 440 * t)).astype(np.int16).tobytes()
+def silence(seconds):
+    return bytes(int(RATE * seconds) * 2)
+def test_silence_is_dropped():
+    vad = VoiceActivityDetector(RATE)
+    data, utterance_end = vad.process(silence(1.0))
+    assert data == b"" and not utterance_end
+    assert vad.get_stats()['dropped_ratio'] == pytest.approx(1.0)
+def test_speech_is_kept_with_hangover_then_utterance_ends():
+    vad = VoiceActivityDetector(RATE, frame_ms=20, hangover_ms=100)
+    data, utterance_end = vad.process(tone(0.5))
+    assert len(data) == len(tone(0.5)) and not utterance_end
+    data, utterance_end = vad.process(silence(0.5))
+    assert utterance_end
+    assert len(data) == 5 * vad.frame_size * 2
+    assert vad.get_stats()['utterances'] == 1
+    data, utterance_end = vad.process(silence(0.5))
+    assert data == b"" and not utterance_end
+def test_utterance_end_is_reported_once_across_chunks():
+    vad = VoiceActivityDetector(RATE, hangover_ms=200)
+    vad.process(tone(0.3))
+    ends = [vad.process(silence(0.05))[1] for _ in range(10)]
+    assert ends.count(True) == 1
+def test_partial_frames_are_carried_to_the_next_chunk():
+    vad = VoiceActivityDetector(RATE)
+    audio = tone(0.2)
+    odd = vad.frame_size * 2 + 100
+    first, _ = vad.process(audio[:odd])
+    second, _ = vad.process(audio[odd:])
+    assert first + second == audio[:len(first) + len(second)]
+    assert len(first) + len(second) == len(audio)
@@ -0,0 +1,46 @@
+from core.watchdog import RecognitionWatchdog
+def make_watchdog(**kwargs):
+    watchdog = RecognitionWatchdog(smoothing=1.0, degrade_after=2, recover_after=5, **kwargs)
+    watchdog.reset(labels={'source': 'test-watchdog'})
+    return watchdog
+def feed(watchdog, load, seconds, start, backlog=0.0):
+    transitions = []
+    for now in range(start, start + seconds + 1):
+        transition = watchdog.observe(load, 1.0, backlog, now=now)
+        if transition:
+            transitions.append(transition)
+    return transitions
+def test_sustained_overload_degrades_one_stage_at_a_time():
+    watchdog = make_watchdog()
+    transitions = feed(watchdog, 1.5, 8, start=100)
+    assert [t['stage'] for t in transitions] == list(RecognitionWatchdog.STAGES)
+    assert all(t['degraded'] for t in transitions)
+    assert watchdog.active_stages == list(RecognitionWatchdog.STAGES)
+    assert feed(watchdog, 1.5, 5, start=109) == []
+def test_short_spike_does_not_degrade():
+    watchdog = make_watchdog()
+    assert watchdog.observe(1.5, 1.0, 0.0, now=100) is None
+    assert watchdog.observe(1.5, 1.0, 0.0, now=101) is None
+    assert watchdog.observe(0.7, 1.0, 0.0, now=101.5) is None
+    assert watchdog.observe(1.5, 1.0, 0.0, now=103) is None
+    assert watchdog.level == 0
+def test_backlog_alone_triggers_degradation():
+    watchdog = make_watchdog()
+    transitions = feed(watchdog, 0.2, 2, start=0, backlog=0.8)
+    assert [t['stage'] for t in transitions] == [RecognitionWatchdog.STAGE_NO_PARTIALS]
+def test_calm_restores_stages_in_reverse_order_with_hysteresis():
+    watchdog = make_watchdog()
+    feed(watchdog, 1.5, 5, start=100)
+    assert watchdog.level == 2
+    assert feed(watchdog, 0.7, 10, start=106) == []
+    transitions = feed(watchdog, 0.2, 12, start=120)
+    assert [(t['stage'], t['degraded']) for t in transitions] == [
+        (RecognitionWatchdog.STAGE_VAD, False), (RecognitionWatchdog.STAGE_NO_PARTIALS, False)]
+    assert watchdog.level == 0
+    assert watchdog.counts == {'degraded': 2, 'restored': 2}
+def test_reset_limits_stages_and_ignores_empty_audio():
+    watchdog = make_watchdog()
+    watchdog.reset([RecognitionWatchdog.STAGE_NO_PARTIALS], labels={'source': 'test-watchdog'})
+    assert watchdog.observe(1.0, 0.0, 0.0, now=100) is None
+    transitions = feed(watchdog, 2.0, 10, start=100)
+    assert len(transitions) == 1 and watchdog.level == 1
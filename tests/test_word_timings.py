@@ -0,0 +1,30 @@
+import json
+import pytest
+from core.word_timings import WordTimings
+from core.recording_manager import RecordingManager
+RESULT = [{'word': 'раз', 'start': 0.1, 'end': 0.4, 'conf': 0.9},
+          {'word': 'два', 'start': 0.5, 'end': 0.8}]
+def test_from_result_fills_parallel_arrays_with_default_confidence():
+    timings = WordTimings.from_result(RESULT)
+    assert len(timings) == 2
+    words = list(timings)
+    assert words[0][0] == 'раз' and words[0][1] == pytest.approx(0.1)
+    assert words[1][3] == 1.0
+    assert timings.to_dict() == {'word': ['раз', 'два'], 'start': [0.1, 0.5], 'end': [0.4, 0.8],
+                                 'conf': [0.9, 1.0]}
+def test_extend_shifts_times_by_offset():
+    session = WordTimings.from_result(RESULT)
+    session.extend(WordTimings.from_result(RESULT), offset=10.0)
+    assert session.to_dict()['start'] == [0.1, 0.5, 10.1, 10.5]
+    assert session.words == ['раз', 'два', 'раз', 'два']
+def test_parse_final_and_partial_results():
+    manager = RecordingManager(None, None)
+    final = manager._parse_result('final', json.dumps({'text': ' раз два ', 'result': RESULT}))
+    assert final.kind == 'final' and final.text == 'раз два'
+    assert final.words.words == ['раз', 'два']
+    partial = manager._parse_result('partial', json.dumps({'partial': 'раз',
+                                                           'partial_result': RESULT[:1]}))
+    assert partial.text == 'раз' and len(partial.words) == 1
+    plain = manager._parse_result('final', json.dumps({'text': 'раз'}))
+    assert plain.words is None
+    assert len(manager.parse_times) == 3
@@ -1,3 +1,5 @@
+import re
+import math
 import datetime
 class Utils:
     @staticmethod
@@ -35,7 +37,38 @@ class Utils:
             hours = seconds / 3600
             return f"{hours:.1f} ч"
     @staticmethod
+    def format_timestamp(seconds):
+        seconds = int(seconds)
+        return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+    @staticmethod
     def truncate_text(text, max_length=100):
         if len(text) <= max_length:
             return text
-        return text[:max_length-3] + "..."
\ No newline at end of file
+        return text[:max_length-3] + "..."
+    @staticmethod
+    def normalize_words(text):
+        return re.findall(r"[\w']+", text.lower().replace("[unk]", " ").replace("ё", "е"))
+    @staticmethod
+    def word_error_rate(reference, hypothesis):
+        ref = Utils.normalize_words(reference)
+        hyp = Utils.normalize_words(hypothesis)
+        previous = list(range(len(hyp) + 1))
+        for i, ref_word in enumerate(ref, 1):
+            current = [i] + [0] * len(hyp)
+            for j, hyp_word in enumerate(hyp, 1):
+                current[j] = min(previous[j] + 1, current[j - 1] + 1,
+                                 previous[j - 1] + (ref_word != hyp_word))
+            previous = current
+        errors = previous[-1]
+        return {'wer': errors / len(ref) if ref else float(bool(hyp)), 'errors': errors,
+                'reference_words': len(ref), 'hypothesis_words': len(hyp)}
+    @staticmethod
+    def summarize(values, percentiles=(50, 95, 99)):
+        if not values:
+            return {'count': 0}
+        ordered = sorted(values)
+        summary = {'count': len(ordered), 'mean': sum(ordered) / len(ordered), 'max': ordered[-1]}
+        for p in percentiles:
+            index = max(0, math.ceil(p / 100 * len(ordered)) - 1)
+            summary[f'p{p}'] = ordered[index]
+        return summary
\ No newline at end of file